@@ -0,0 +1,39 @@
+#include "FreeRTOS.h"
+#include "FreeRTOSConfig.h"
+#include "task.h"
+#include "queue.h"
+
+QueueHandle_t queue;
+int value;
+
+// three call paths from task1 lead to the same xQueueSend
+void send() {
+  xQueueSend(queue, &value, portMAX_DELAY);
+}
+void left() {
+  send();
+}
+void right() {
+  send();
+}
+
+void task1(void *param) {
+  for (;;) {
+    left();
+    right();
+    send();
+  }
+}
+void task2(void *param) {
+  int received;
+  for (;;) {
+    xQueueReceive(queue, &received, portMAX_DELAY);
+  }
+}
+
+int main() {
+  queue = xQueueCreate(4, sizeof(int));
+  xTaskCreate(task1, "Task1", 100, NULL, 2, NULL);
+  xTaskCreate(task2, "Task2", 100, NULL, 1, NULL);
+  vTaskStartScheduler();
+}
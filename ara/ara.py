@@ -71,9 +71,25 @@ class Main:
                             help="Choose whether emit the data in a human readable"
                             " format or in machine readable JSON.",
                             default='human')
+        parser.add_argument('--step-profile', action='store_true', default=False,
+                            help="additionally record CPU time, peak RSS"
+                            " delta, allocated Python memory blocks and the"
+                            " graph sizes per step execution (implies"
+                            " --runtime-stats).")
+        parser.add_argument('--step-cprofile', action='store_true',
+                            default=False,
+                            help="with --step-profile, dump a cProfile pstats"
+                            " file per step execution with the dump prefix.")
         parser.add_argument('--step-data', default=False, const='dump', nargs='?',
                             help="Emit step data into dumps folder or optionally"
                             " given file", metavar="FILE")
+        parser.add_argument('--cache-dir', metavar="DIR",
+                            default=os.environ.get('ARA_CACHE_DIR', None),
+                            help="Directory for the persistent artifact cache."
+                            " Cacheable steps that only modify the CFG and"
+                            " the callgraph are restored from it, if their"
+                            " config and the graph state before them are"
+                            " unchanged.")
         parser.add_argument('--entry-point', '-e', help="system entry point",
                             default='main')
         parser.add_argument('--isr', '-i', action='append',
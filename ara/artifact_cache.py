@@ -0,0 +1,317 @@
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Persistent cache for steps that only modify the CFG and the callgraph.
+
+The front-end steps (IRReader, SVFAnalyses, LLVMMap, ...) keep their results
+in the native LLVM module and the SVF data structures that cannot be
+serialized from Python. However, many of the following pure Python steps
+(e.g. ICFG, Syscall, MarkLoopHead) are deterministic functions of the CFG,
+the callgraph, the OS and their config.
+
+The key of such a step execution is built from:
+- the step name, its resolved config and its source file,
+- the OS, and
+- the graph state before the step, i.e. the vertex count, the edges (with
+  their index) and all plain properties of the CFG and the callgraph.
+
+The cache entry contains the difference of the graph state after the step
+(new edges and changed property values), which is replayed on a hit.
+
+Properties that contain raw pointers (see POINTER_PROPERTIES) or Python
+objects differ between runs and are neither part of the key nor restorable.
+Steps that modify them, that add or remove vertices or that remove edges
+cannot be cached. See Step.is_cacheable for the step side.
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+from .util import get_logger
+
+# Options that do not influence the result of a step.
+NEUTRAL_OPTIONS = frozenset({"log_level", "dump_prefix", "trace_algorithm"})
+
+# Properties that store pointers into the LLVM module or SVF.
+POINTER_PROPERTIES = frozenset({"llvm_link", "svf_vlink", "svf_elink"})
+
+# the cached subgraphs of Graph
+GRAPHS = ("cfg", "callgraph")
+
+
+def _is_plain(name, prop):
+    return (name not in POINTER_PROPERTIES and
+            prop.value_type() != "python::object")
+
+
+def _is_scalar(prop):
+    value_type = prop.value_type()
+    return value_type != "string" and not value_type.startswith("vector")
+
+
+class GraphState:
+    """Snapshot of the plain state of a graph_tool graph."""
+
+    def __init__(self, graph):
+        self.num_vertices = graph.num_vertices()
+        # rows of source, target and edge index, ordered by the edge index
+        edges = graph.get_edges([graph.edge_index])
+        self.edges = edges[np.argsort(edges[:, 2], kind="stable")]
+        self.vprops = {}
+        self.eprops = {}
+        self.pointers = {}
+        edge_objs = None
+        for props, store, index in ((graph.vp, self.vprops, None),
+                                    (graph.ep, self.eprops, self.edges[:, 2])):
+            for name, prop in props.items():
+                if name in POINTER_PROPERTIES:
+                    values = prop.a
+                    if index is not None:
+                        values = values[index]
+                    self.pointers[name] = values.copy()
+                if not _is_plain(name, prop):
+                    continue
+                if _is_scalar(prop):
+                    values = prop.a
+                    if index is not None:
+                        values = values[index]
+                    store[name] = values.copy()
+                elif index is None:
+                    store[name] = [_to_plain(prop[v])
+                                   for v in graph.vertices()]
+                else:
+                    if edge_objs is None:
+                        edge_objs = sorted(graph.edges(),
+                                           key=lambda e: graph.edge_index[e])
+                    store[name] = [_to_plain(prop[e]) for e in edge_objs]
+
+    def get_hash(self):
+        """Return a SHA-256 hash of the snapshot."""
+        sha = hashlib.sha256()
+        sha.update(str(self.num_vertices).encode())
+        _update_hash(sha, "edges", self.edges)
+        for kind, props in (("v", self.vprops), ("e", self.eprops)):
+            for name in sorted(props):
+                _update_hash(sha, kind + name, props[name])
+        return sha.hexdigest()
+
+
+def _to_plain(value):
+    if isinstance(value, str):
+        return value
+    return list(value)
+
+
+def _update_hash(sha, name, values):
+    sha.update(name.encode())
+    if isinstance(values, np.ndarray):
+        sha.update(str(values.dtype).encode())
+        sha.update(np.ascontiguousarray(values).tobytes())
+    else:
+        sha.update(json.dumps(values).encode())
+
+
+def get_graph_delta(before, after):
+    """Return the difference between two GraphStates of the same graph.
+
+    Return None, if the difference cannot be replayed with apply_graph_delta,
+    i.e. vertices are added or removed, edges are removed or pointer
+    properties are changed.
+    """
+    if before.num_vertices != after.num_vertices:
+        return None
+    if (before.vprops.keys() != after.vprops.keys() or
+            before.eprops.keys() != after.eprops.keys()):
+        return None
+    num_old = len(before.edges)
+    if not np.array_equal(before.edges, after.edges[:num_old]):
+        return None
+    for name, values in before.pointers.items():
+        if not np.array_equal(values, after.pointers[name][:len(values)]):
+            return None
+
+    vprops = {}
+    for name, old in before.vprops.items():
+        changed = _get_changed(old, after.vprops[name])
+        if changed is not None:
+            vprops[name] = changed
+    eprops = {}
+    new_eprops = {}
+    for name, old in before.eprops.items():
+        new = after.eprops[name]
+        changed = _get_changed(old, new[:num_old])
+        if changed is not None:
+            eprops[name] = changed
+        if len(new) > num_old:
+            new_eprops[name] = new[num_old:]
+    return {"new_edges": after.edges[num_old:, :2],
+            "vprops": vprops,
+            "eprops": eprops,
+            "new_eprops": new_eprops}
+
+
+def _get_changed(old, new):
+    """Return the positions and values that differ between old and new."""
+    if isinstance(old, np.ndarray):
+        positions = np.nonzero(old != new)[0]
+        if len(positions) == 0:
+            return None
+        return positions, new[positions]
+    positions = [i for i, (a, b) in enumerate(zip(old, new)) if a != b]
+    if not positions:
+        return None
+    return positions, [new[i] for i in positions]
+
+
+def apply_graph_delta(graph, state, delta):
+    """Replay a delta of get_graph_delta on graph.
+
+    state must be the GraphState of graph that the delta is based on.
+    """
+    new_edges = [graph.add_edge(src, tgt) for src, tgt in delta["new_edges"]]
+
+    for name, (positions, values) in delta["vprops"].items():
+        prop = graph.vp[name]
+        if _is_scalar(prop):
+            prop.a[positions] = values
+        else:
+            for pos, value in zip(positions, values):
+                prop[graph.vertex(pos)] = value
+
+    for name, (positions, values) in delta["eprops"].items():
+        prop = graph.ep[name]
+        if _is_scalar(prop):
+            prop.a[state.edges[positions, 2]] = values
+            continue
+        for (src, tgt, idx), value in zip(state.edges[positions], values):
+            edge = next(e for e in graph.edge(src, tgt, all_edges=True)
+                        if graph.edge_index[e] == idx)
+            prop[edge] = value
+
+    for name, values in delta["new_eprops"].items():
+        prop = graph.ep[name]
+        if _is_scalar(prop):
+            prop.a[[graph.edge_index[e] for e in new_edges]] = values
+        else:
+            for edge, value in zip(new_edges, values):
+                prop[edge] = value
+
+
+class ArtifactCache:
+    """Store and load step executions in a cache directory."""
+
+    # increase, if the key or file format changes
+    FORMAT_VERSION = 2
+
+    def __init__(self, cache_dir):
+        """Create a cache that stores its entries in cache_dir."""
+        self._cache_dir = cache_dir
+        self._log = get_logger(self.__class__.__name__)
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def _strip_config(config):
+        return {k: v for k, v in (config or {}).items()
+                if k not in NEUTRAL_OPTIONS}
+
+    def get_key(self, step_cls, config, os_name, states):
+        """Return the cache key of a step execution.
+
+        Arguments:
+        step_cls -- the class of the step
+        config   -- the resolved config of the step
+        os_name  -- the name of the OS or None
+        states   -- the GraphStates before the step (see get_graph_states)
+        """
+        with open(inspect.getfile(step_cls), 'rb') as f:
+            code = hashlib.sha256(f.read()).hexdigest()
+        data = {
+            "version": self.FORMAT_VERSION,
+            "step": [step_cls.get_name(), self._strip_config(config), code],
+            "os": os_name,
+            "graphs": {name: state.get_hash()
+                       for name, state in states.items()},
+        }
+        data = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _get_path(self, key):
+        return os.path.join(self._cache_dir, key[:2], key + '.pickle')
+
+    def load(self, key):
+        """Return the artifacts stored for key or None if there are none."""
+        path = self._get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                artifacts = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            self._log.warning("Ignoring broken cache entry %s: %s", path, e)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return artifacts
+
+    def store(self, key, artifacts):
+        """Store artifacts for key.
+
+        The file is written atomically, so concurrent ARA runs can share the
+        same cache directory.
+        """
+        path = self._get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+                                        suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(artifacts, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            os.unlink(tmp_path)
+            self._log.warning("Cannot store cache entry %s: %s", path, e)
+            return
+        self.stores += 1
+
+
+def get_graph_states(graph):
+    """Return the GraphStates of all cached subgraphs of graph."""
+    return {name: GraphState(getattr(graph, name)) for name in GRAPHS}
+
+
+def get_artifacts(graph, step_name, states):
+    """Return the artifacts of a step execution or None if it cannot be
+    cached.
+
+    states are the GraphStates before the execution.
+    """
+    deltas = {}
+    for name, before in states.items():
+        delta = get_graph_delta(before, GraphState(getattr(graph, name)))
+        if delta is None:
+            return None
+        deltas[name] = delta
+    return {"graphs": deltas,
+            "step_data": graph.step_data.get(step_name, None)}
+
+
+def restore_artifacts(graph, step_name, states, artifacts):
+    """Replay the artifacts of get_artifacts on graph.
+
+    states are the current GraphStates of graph.
+    """
+    for name, delta in artifacts["graphs"].items():
+        apply_graph_delta(getattr(graph, name), states[name], delta)
+    if artifacts["step_data"] is not None:
+        graph.step_data[step_name] = artifacts["step_data"]
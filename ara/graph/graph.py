@@ -9,9 +9,11 @@
 import graph_tool
 import graph_tool.util
 import math
+import numpy as np
 
 from graph_tool.search import bfs_iterator
-from graph_tool.topology import label_out_component
+from graph_tool.topology import (label_out_component, label_components,
+                                 dominator_tree)
 
 from .graph_data import PyGraphData, _get_llvm_obj
 from .mix import ABBType, CFType, SyscallCategory, NodeLevel, StateType, MSTType
@@ -82,10 +84,309 @@ def edge_types(graph, prop, *types):
     return graph_tool.GraphView(graph, efilt=(prop.fa & sum(types) != 0))
 
 
+class _LookupIndex:
+    """Map keys to all vertices or edges of a graph with this key.
+
+    The index is built lazily and rebuilt if it is invalidated, the size of
+    the graph changes or a lookup returns stale elements. A lookup that
+    misses does not rebuild the index, so a missing key costs constant time.
+    Therefore, code that changes the key property of existing elements must
+    call invalidate() (via invalidate_indexes() of the graph) before the
+    next lookup.
+
+    Lookups return a tuple of the matching elements in iteration order.
+    """
+    def __init__(self, elements, get_key, get_size):
+        """Create an index.
+
+        Arguments:
+        elements -- function that returns an iterator over all elements
+        get_key  -- function that maps an element to its key
+        get_size -- function that returns the current number of elements
+        """
+        self._elements = elements
+        self._get_key = get_key
+        self._get_size = get_size
+        self._index = None
+        self._size = None
+
+    def invalidate(self):
+        """Drop the index, it is rebuilt with the next lookup."""
+        self._index = None
+
+    def _build(self, size):
+        index = {}
+        for elem in self._elements():
+            index.setdefault(self._get_key(elem), []).append(elem)
+        self._index = {k: tuple(v) for k, v in index.items()}
+        self._size = size
+
+    def _is_current(self, elems, key):
+        return all(e.is_valid() and self._get_key(e) == key for e in elems)
+
+    def lookup(self, key):
+        """Return a tuple of all elements with key."""
+        size = self._get_size()
+        fresh = False
+        if self._index is None or self._size != size:
+            self._build(size)
+            fresh = True
+        elems = self._index.get(key, ())
+        if fresh or not elems or self._is_current(elems, key):
+            return elems
+        self._build(size)
+        return self._index.get(key, ())
+
+
+class _IDTrieNode:
+    __slots__ = ("children", "count", "vertices")
+
+    def __init__(self):
+        # ID component -> _IDTrieNode
+        self.children = {}
+        # number of IDs that start with the path to this node
+        self.count = 0
+        # indices of the vertices whose ID ends here
+        self.vertices = set()
+
+
+class IDTrie:
+    """Trie over the dot separated IDs of the vertices of an InstanceGraph.
+
+    See os_util.assign_id for its usage. Vertices that are added to the
+    graph are inserted lazily with the next sync. IDs must be changed with
+    set_id. Otherwise, InstanceGraph.invalidate_indexes must be called.
+    """
+    def __init__(self, graph):
+        self._graph = graph
+        self._root = _IDTrieNode()
+        # vertex index -> ID components
+        self._ids = {}
+        # all vertices below this index are inserted
+        self._synced = 0
+
+    def _insert(self, idx, components):
+        self._ids[idx] = components
+        node = self._root
+        node.count += 1
+        for comp in components:
+            node = node.children.setdefault(comp, _IDTrieNode())
+            node.count += 1
+        node.vertices.add(idx)
+
+    def _remove(self, idx):
+        components = self._ids.pop(idx, None)
+        if components is None:
+            return
+        node = self._root
+        node.count -= 1
+        for comp in components:
+            child = node.children[comp]
+            child.count -= 1
+            if child.count == 0:
+                del node.children[comp]
+                return
+            node = child
+        node.vertices.discard(idx)
+
+    def _rebuild(self):
+        self._root = _IDTrieNode()
+        self._ids = {}
+        self._synced = 0
+        self.sync()
+
+    def sync(self):
+        """Insert all vertices that are added since the last sync."""
+        size = self._graph.num_vertices()
+        for idx in range(self._synced, size):
+            v = self._graph.vertex(idx)
+            self._insert(idx, self._graph.vp.id[v].split('.'))
+        self._synced = size
+
+    def get_id(self, vertex):
+        """Return the ID components of vertex (or None)."""
+        return self._ids.get(int(vertex))
+
+    def set_id(self, vertex, components):
+        """Set the ID of vertex (given as components) in the trie and graph."""
+        idx = int(vertex)
+        self._remove(idx)
+        self._insert(idx, components)
+        self._graph.vp.id[vertex] = '.'.join(components)
+
+    def find_prefixes(self, components, exclude=None):
+        """Compare components with all IDs in the trie.
+
+        Return a tuple of the length of the longest common prefix with any ID
+        and all vertices whose ID is a prefix of components.
+
+        If exclude is given, this vertex is removed from the trie until it
+        gets a new ID with set_id.
+        """
+        if exclude is not None:
+            self._remove(int(exclude))
+        node = self._root
+        depth = 0
+        prefixes = []
+        for comp in components:
+            node = node.children.get(comp)
+            if node is None:
+                break
+            depth += 1
+            prefixes.extend(node.vertices)
+        # the graph IDs are the ground truth, check the returned vertices
+        for idx in prefixes:
+            current = self._graph.vp.id[self._graph.vertex(idx)]
+            if current.split('.') != self._ids[idx]:
+                self._rebuild()
+                return self.find_prefixes(components, exclude=exclude)
+        return depth, prefixes
+
+
+class ReachabilityIndex:
+    """Reachability and recursion information of a directed graph.
+
+    The strongly connected components (SCCs) are computed once. A vertex is
+    recursive, if its SCC contains more than one vertex or if it has a self
+    loop. For the DAG of the SCCs, every SCC stores a bitset of all reachable
+    SCCs, so has_path is answered in constant time.
+
+    The index is a snapshot and must be rebuilt when the graph changes.
+    """
+    def __init__(self, graph):
+        self.size = (graph.num_vertices(), graph.num_edges())
+        comp, _ = label_components(graph, directed=True)
+        comp = comp.a.astype(np.int64)
+        num_comps = int(comp.max()) + 1 if len(comp) else 0
+
+        edges = graph.get_edges()
+        src_comp = comp[edges[:, 0]]
+        tgt_comp = comp[edges[:, 1]]
+
+        # recursion
+        comp_size = np.bincount(comp, minlength=num_comps)
+        recursive_comp = comp_size > 1
+        self_loops = edges[:, 0] == edges[:, 1]
+        recursive_comp[src_comp[self_loops]] = True
+        self._recursive = recursive_comp[comp]
+
+        # condensed DAG in topological order (Kahn)
+        inter = src_comp != tgt_comp
+        dag_edges = set(zip(src_comp[inter].tolist(), tgt_comp[inter].tolist()))
+        succs = [[] for _ in range(num_comps)]
+        in_degree = [0] * num_comps
+        for src, tgt in dag_edges:
+            succs[src].append(tgt)
+            in_degree[tgt] += 1
+        order = [c for c in range(num_comps) if in_degree[c] == 0]
+        for c in order:
+            for succ in succs[c]:
+                in_degree[succ] -= 1
+                if in_degree[succ] == 0:
+                    order.append(succ)
+        assert len(order) == num_comps, "Condensed graph is not a DAG."
+
+        # reachable SCCs as bitsets, successors first
+        reach = [0] * num_comps
+        for c in reversed(order):
+            bits = 1 << c
+            for succ in succs[c]:
+                bits |= reach[succ]
+            reach[c] = bits
+        self._reach = reach
+        self._comp = comp
+
+    def has_path(self, source, target):
+        """Is there a path from source to target?"""
+        comp = self._comp
+        return bool((self._reach[comp[int(source)]] >> int(comp[int(target)]))
+                    & 1)
+
+    def is_recursive(self, vertex):
+        """Is the vertex part of a cycle?"""
+        return bool(self._recursive[int(vertex)])
+
+    def get_recursive(self):
+        """Return a boolean array that marks all recursive vertices."""
+        return self._recursive.copy()
+
+
 class CFGError(Exception):
     """Some error with a CFG function."""
 
 
+class CFGTopology:
+    """Frozen snapshot of the CFG topology as dense arrays.
+
+    All arrays are indexed with a vertex index and contain a vertex index,
+    NONE if there is no such vertex or AMBIGUOUS if there are multiple.
+
+    function  -- ABB -> function (via f2a edges)
+    entry_abb -- function -> entry ABB
+    exit_abb  -- function/ABB -> exit ABB (out neighbor that is an exit ABB)
+    exit_bb   -- ABB/BB -> exit BB (out neighbor that is an exit BB)
+    abb       -- BB -> ABB (via a2b edges)
+
+    Additionally, syscall_name_id maps a syscall ABB to an index into
+    syscall_names. It is NONE for all other vertices and AMBIGUOUS for
+    syscall ABBs without a unique syscall.
+
+    The snapshot is only valid as long as the CFG is not modified. CFG checks
+    this with its version, see CFG.freeze_topology and CFG.get_version.
+    """
+    NONE = -1
+    AMBIGUOUS = -2
+
+    def __init__(self, cfg):
+        n = cfg.num_vertices()
+        self.size = (n, cfg.num_edges())
+
+        edges = cfg.get_edges([cfg.ep.type, cfg.ep.is_entry])
+        src, tgt, etype, is_entry = (edges[:, i].astype(np.int64)
+                                     for i in range(4))
+        level = cfg.vp.level.a
+        is_exit = cfg.vp.is_exit.a.astype(bool)
+
+        f2a = etype == CFType.f2a
+        self.function = self._map(n, tgt[f2a], src[f2a])
+        entry = f2a & (is_entry != 0)
+        self.entry_abb = self._map(n, src[entry], tgt[entry])
+        to_exit = is_exit[tgt]
+        exit_abb = to_exit & (level[tgt] == NodeLevel.abb)
+        self.exit_abb = self._map(n, src[exit_abb], tgt[exit_abb])
+        exit_bb = to_exit & (level[tgt] == NodeLevel.bb)
+        self.exit_bb = self._map(n, src[exit_bb], tgt[exit_bb])
+        a2b = etype == CFType.a2b
+        self.abb = self._map(n, tgt[a2b], src[a2b])
+
+        # syscall ABB -> called syscall function
+        icf = (etype == CFType.icf) & (cfg.vp.type.a[src] == ABBType.syscall)
+        callee = self._map(n, src[icf], tgt[icf])
+        syscall_func = callee.copy()
+        found = callee >= 0
+        syscall_func[found] = self.function[callee[found]]
+        found = syscall_func >= 0
+        funcs, name_ids = np.unique(syscall_func[found], return_inverse=True)
+        self.syscall_names = tuple(cfg.vp.name[cfg.vertex(f)] for f in funcs)
+        self.syscall_name_id = syscall_func
+        self.syscall_name_id[found] = name_ids
+        is_syscall = cfg.vp.type.a == ABBType.syscall
+        self.syscall_name_id[is_syscall & ~found] = self.AMBIGUOUS
+        self.syscall_name_id[~is_syscall] = self.NONE
+
+    @classmethod
+    def _map(cls, n, keys, values):
+        """Return an array that maps keys to values.
+
+        Keys without value are mapped to NONE, keys with multiple values to
+        AMBIGUOUS.
+        """
+        mapping = np.full(n, cls.NONE, dtype=np.int64)
+        mapping[keys] = values
+        mapping[np.bincount(keys, minlength=n) > 1] = cls.AMBIGUOUS
+        return mapping
+
+
 class CFG(graph_tool.Graph):
     """Describe the local, interprocedural and global control flow.
 
@@ -108,6 +409,18 @@ class CFG(graph_tool.Graph):
     def __init__(self, graph=None):
         super().__init__(graph)
 
+        # name -> vertices
+        self._name_index = _LookupIndex(self.vertices,
+                                        lambda v: self.vp.name[v],
+                                        self.num_vertices)
+        # see freeze_topology
+        self._topology = None
+        self._topology_version = None
+        # see get_condition_flags
+        self._condition_flags_version = None
+        # see get_version
+        self._version = 0
+
         # If a graph is used to initialize the values, everthing
         # is copied from it. If we do not return from here
         # we will just overwrite the copied values with new empty
@@ -145,8 +458,81 @@ class CFG(graph_tool.Graph):
         # icf, lcf edges
         self.edge_properties["back_edge"] = self.new_ep("bool")
 
+    def invalidate_indexes(self):
+        """Invalidate all lookup indexes and the topology snapshot.
+
+        Must be called, if the names of vertices are modified without
+        changing the number of vertices. Bumps the version, too.
+        """
+        self._name_index.invalidate()
+        self.bump_version()
+
+    def bump_version(self):
+        """Mark the structure of the CFG as modified.
+
+        Call this after modifying the level of vertices or the type of
+        edges without adding vertices or edges. See get_version.
+        Drops the topology snapshot and the condition flags.
+        """
+        self._version += 1
+        self._topology = None
+        self._condition_flags_version = None
+
+    def remove_vertex(self, *args, **kwargs):
+        """See graph_tool.Graph.remove_vertex. Bumps the version."""
+        self.bump_version()
+        return super().remove_vertex(*args, **kwargs)
+
+    def remove_edge(self, *args, **kwargs):
+        """See graph_tool.Graph.remove_edge. Bumps the version."""
+        self.bump_version()
+        return super().remove_edge(*args, **kwargs)
+
+    def clear_edges(self, *args, **kwargs):
+        """See graph_tool.Graph.clear_edges. Bumps the version."""
+        self.bump_version()
+        return super().clear_edges(*args, **kwargs)
+
+    def get_version(self):
+        """Return a version of the CFG structure.
+
+        The version changes, if vertices or edges are added or removed or
+        bump_version is called. Caches of derived data (e.g. the views of
+        Graph) can compare it to detect outdated data.
+        """
+        return (self._version, self.num_vertices(), self.num_edges())
+
+    def freeze_topology(self):
+        """Build a CFGTopology snapshot and return it.
+
+        As long as the snapshot is valid, get_function, get_abb,
+        get_entry_abb, get_exit_abb, get_exit_bb and get_syscall_name use it
+        instead of iterating the edges.
+
+        Call this, when the CFG is complete (e.g. at the beginning of an
+        analysis). The snapshot is dropped with invalidate_indexes,
+        bump_version or if the version changes otherwise (see get_version).
+        """
+        topology = self.get_topology()
+        if topology is None:
+            topology = CFGTopology(self)
+            self._topology = topology
+            self._topology_version = self.get_version()
+        return topology
+
+    def get_topology(self):
+        """Return the valid CFGTopology snapshot or None."""
+        topology = self._topology
+        if topology is not None and \
+                self._topology_version != self.get_version():
+            topology = self._topology = None
+        return topology
+
     def contains_function_by_name(self, name: str):
-        func = graph_tool.util.find_vertex(self, self.vp["name"], name)
+        func = self._name_index.lookup(name)
+        if len(func) != 1:
+            # the index misses renamings without invalidation, search again
+            func = graph_tool.util.find_vertex(self, self.vp["name"], name)
         return len(func) == 1 and self.vp.level[func[0]] == NodeLevel.function
 
     def set_bcet(self, node, time):
@@ -177,7 +563,10 @@ class CFG(graph_tool.Graph):
 
     def get_function_by_name(self, name: str):
         """Find a specific function."""
-        func = graph_tool.util.find_vertex(self, self.vp["name"], name)
+        func = self._name_index.lookup(name)
+        if len(func) != 1:
+            # the index misses renamings without invalidation, search again
+            func = graph_tool.util.find_vertex(self, self.vp["name"], name)
         assert len(func) == 1, f'function {name} not unambiguous: {func}'
         assert self.vp.level[func[0]] == NodeLevel.function
         return func[0]
@@ -192,6 +581,13 @@ class CFG(graph_tool.Graph):
 
     def get_function(self, abb):
         """Get the function node for an ABB or BB."""
+        topology = self.get_topology()
+        if topology is not None:
+            func = topology.function[int(abb)]
+            if func >= 0:
+                return self.vertex(int(func))
+            if func == CFGTopology.NONE:
+                return None
         abb = self.vertex(abb)
 
         def is_func(abb):
@@ -225,6 +621,13 @@ class CFG(graph_tool.Graph):
 
     def get_abb(self, bb):
         """Get the ABB node for a BB."""
+        topology = self.get_topology()
+        if topology is not None:
+            abb = topology.abb[int(bb)]
+            if abb >= 0:
+                return self.vertex(int(abb))
+            if abb == CFGTopology.NONE:
+                return None
         bb = self.vertex(bb)
 
         def is_abb(bb):
@@ -269,6 +672,11 @@ class CFG(graph_tool.Graph):
 
     def get_entry_abb(self, function):
         """Return the entry abb of the given function."""
+        topology = self.get_topology()
+        if topology is not None:
+            abb = topology.entry_abb[int(function)]
+            if abb >= 0:
+                return self.vertex(int(abb))
         return self._get_entry(function, edge_type=CFType.f2a)
 
     def get_function_entry_bb(self, function):
@@ -280,6 +688,16 @@ class CFG(graph_tool.Graph):
         return self._get_entry(function, edge_type=CFType.a2b)
 
     def _get_exit(self, block, level):
+        topology = self.get_topology()
+        if topology is not None:
+            exits = {NodeLevel.abb: topology.exit_abb,
+                     NodeLevel.bb: topology.exit_bb}.get(level, None)
+            if exits is not None:
+                exit_block = exits[int(block)]
+                if exit_block >= 0:
+                    return self.vertex(int(exit_block))
+                if exit_block == CFGTopology.NONE:
+                    return None
         block = self.vertex(block)
 
         def is_exit(block):
@@ -311,6 +729,13 @@ class CFG(graph_tool.Graph):
 
     def get_syscall_name(self, abb):
         """Return the called syscall name for a given abb."""
+        topology = self.get_topology()
+        if topology is not None:
+            name_id = topology.syscall_name_id[int(abb)]
+            if name_id >= 0:
+                return topology.syscall_names[name_id]
+            if name_id == CFGTopology.NONE:
+                return ''
         abb = self.vertex(abb)
         if not self.vp.type[abb] == ABBType.syscall:
             return ''
@@ -322,6 +747,125 @@ class CFG(graph_tool.Graph):
         assert len(syscall_func) == 1
         return self.vp.name[syscall_func[0]]
 
+    @staticmethod
+    def _get_dominating_exits(dom, exits, root):
+        """Return the set of blocks that dominate all exits.
+
+        exits is a list of vertex indices, dom the dominator tree as array.
+        The tree is walked until 0 (unreachable or root) or root is found,
+        see ara.util.dominates.
+        """
+        common = None
+        for x in exits:
+            chain = set()
+            y = x
+            while True:
+                chain.add(y)
+                y = dom[y]
+                if y == 0 or y == root or y in chain:
+                    break
+            common = chain if common is None else common & chain
+        return common
+
+    def _compute_condition_flags(self):
+        n = self.num_vertices()
+        edges = self.get_edges([self.ep.type, self.ep.is_entry])
+        edges = edges.astype(np.int64)
+        etype = edges[:, 2]
+        f2a = edges[etype == CFType.f2a]
+        lcf = edges[etype == CFType.lcf][:, :2]
+        entries = f2a[f2a[:, 3] != 0][:, 1]
+        function = np.full(n, -1, dtype=np.int64)
+        function[f2a[:, 1]] = f2a[:, 0]
+
+        # All functions are analyzed at once. Local control flow never
+        # crosses functions, so a virtual root vertex that is connected to
+        # all entry ABBs leads to the same dominator trees as one tree per
+        # function.
+        root = n
+        root_edges = np.stack([np.full(len(entries), root), entries], axis=1)
+
+        def dom_tree_of(edge_list):
+            g = graph_tool.Graph(directed=True)
+            g.add_vertex(n + 1)
+            g.add_edge_list(np.concatenate([edge_list, root_edges]))
+            return g, dominator_tree(g, g.vertex(root)).a
+
+        g, dom_ignore = dom_tree_of(lcf)
+        reachable = label_out_component(g, g.vertex(root)).a.astype(bool)[:n]
+        is_exit = self.vp.is_exit.a.astype(bool) & reachable
+
+        # Endless loops are considered as possible exits. Therefore, all
+        # edges back to the loop head are removed and their sources are
+        # marked as exits.
+        keep = np.ones(len(lcf), dtype=bool)
+        loop_exit = is_exit.copy()
+        loop_heads = self.vp.is_exit_loop_head.a.astype(bool) & reachable
+        for head in np.flatnonzero(loop_heads):
+            from_head = label_out_component(g, g.vertex(head)).a
+            back = (lcf[:, 1] == head) & reachable[lcf[:, 0]]
+            back &= from_head[lcf[:, 0]].astype(bool)
+            keep &= ~back
+            loop_exit[lcf[back, 0]] = True
+        _, dom_respect = dom_tree_of(lcf[keep])
+
+        def in_condition(dom, exit_map):
+            exits = {}
+            for x in np.flatnonzero(exit_map):
+                if function[x] >= 0:
+                    exits.setdefault(function[x], []).append(x)
+            result = np.zeros(n, dtype=bool)
+            for func, abbs in self._group_by_function(function).items():
+                func_exits = exits.get(func)
+                if not func_exits:
+                    continue
+                common = self._get_dominating_exits(dom, func_exits, root)
+                result[abbs] = [abb not in common for abb in abbs]
+            return result
+
+        in_cond = in_condition(dom_respect, loop_exit)
+        in_cond_ignore = in_condition(dom_ignore, is_exit)
+        return in_cond, in_cond & ~in_cond_ignore
+
+    @staticmethod
+    def _group_by_function(function):
+        """Map function vertex -> list of ABBs for an ABB -> function array."""
+        groups = {}
+        for abb in np.flatnonzero(function >= 0):
+            groups.setdefault(int(function[abb]), []).append(int(abb))
+        return groups
+
+    def get_condition_flags(self):
+        """Return the "in_condition" and "usually_taken" vertex properties.
+
+        in_condition is set for every ABB that does not dominate all exits
+        of its function, where endless loops count as exits.
+        usually_taken is set for every ABB that is part of a branch, where all
+        sibling branches end in an endless loop:
+         1o
+          |`--.
+          |   v
+         2o  3o <.
+              |  |
+              v  |
+             4o--´
+        The node 2 is usually taken.
+
+        Both are calculated for all functions at once (with only two
+        dominator tree calculations) and recalculated only if the version of
+        the CFG changes (see get_version).
+        """
+        version = self.get_version()
+        if self._condition_flags_version != version:
+            in_cond, usually_taken = self._compute_condition_flags()
+            for name, values in [("in_condition", in_cond),
+                                 ("usually_taken", usually_taken)]:
+                if name not in self.vp:
+                    self.vertex_properties[name] = self.new_vp("bool")
+                self.vp[name].a = values
+            self._condition_flags_version = version
+        return self.vp.in_condition, self.vp.usually_taken
+
     def _reachable_nodes(self, func, callgraph, node_level,
                          only_system_relevant=True):
         """Return the reachable nodes starting from func.
@@ -420,6 +964,19 @@ class Callgraph(graph_tool.Graph):
     def __init__(self, cfg, graph=None):
         super().__init__(graph)
 
+        # callsite -> edges, callsite name -> edges, function name -> vertices
+        self._callsite_index = _LookupIndex(self.edges,
+                                            lambda e: self.ep.callsite[e],
+                                            self.num_edges)
+        self._callsite_name_index = _LookupIndex(
+            self.edges, lambda e: self.ep.callsite_name[e], self.num_edges
+        )
+        self._name_index = _LookupIndex(self.vertices,
+                                        lambda v: self.vp.function_name[v],
+                                        self.num_vertices)
+        # see get_reachability
+        self._reachability = None
+
         # If a graph is used to initialize the values, everthing
         # is copied from it. If we do not return from here
         # we will just overwrite the copied values with new empty
@@ -445,21 +1002,47 @@ class Callgraph(graph_tool.Graph):
             property_name = "syscall_category_" + syscat.name
             self.vertex_properties[property_name] = self.new_vp("bool")
 
+    def invalidate_indexes(self):
+        """Invalidate all lookup indexes.
+
+        Must be called, if callsites or function names are modified without
+        changing the number of edges or vertices.
+        """
+        self._callsite_index.invalidate()
+        self._callsite_name_index.invalidate()
+        self._name_index.invalidate()
+        self._reachability = None
+
+    def get_reachability(self):
+        """Return the ReachabilityIndex of the callgraph.
+
+        The index is built on demand and rebuilt, if the number of vertices or
+        edges changes or invalidate_indexes is called.
+        """
+        index = self._reachability
+        if index is None or \
+                index.size != (self.num_vertices(), self.num_edges()):
+            index = self._reachability = ReachabilityIndex(self)
+        return index
+
+    def has_path(self, source, target):
+        """Is there a path from the function source to target?"""
+        return self.get_reachability().has_path(source, target)
+
+    def is_recursive(self, function):
+        """Is the function (a callgraph vertex) part of a recursion?"""
+        return self.get_reachability().is_recursive(function)
+
     def get_edge_for_callsite_name(self, callsite_name):
-        for edge in self.edges():
-            if self.ep.callsite_name[edge] == callsite_name:
-                return edge
-        return None
+        return next(iter(self._callsite_name_index.lookup(callsite_name)),
+                    None)
 
     def get_edge_for_callsite(self, callsite):
-        for edge in self.edges():
-            if self.ep.callsite[edge] == callsite:
-                return edge
-        return None
+        return next(iter(self._callsite_index.lookup(int(callsite))), None)
 
     def get_node_with_name(self, name):
         """Find a node specified by its name."""
-        node = graph_tool.util.find_vertex(self, self.vp["function_name"], name)
+        node = self._name_index.lookup(name)
         if len(node) == 0:
             return None
         assert len(node) == 1
@@ -510,6 +1093,7 @@ class MSTGraph(graph_tool.Graph):
         super().__init__()
         # vertex properties
         self.vertex_properties["state"] = self.new_vp("object")
+        self.vertex_properties["state_id"] = self.new_vp("int64_t", val=-1)  # for StateType.state
         self.vertex_properties["type"] = self.new_vp("int")  # StateType
         self.vertex_properties["cpu_id"] = self.new_vp("int")  # for StateType.metastate and StateType.state
         self.vertex_properties["bcet"] = self.new_vp("int64_t", val=-1)
@@ -519,6 +1103,10 @@ class MSTGraph(graph_tool.Graph):
         self.edge_properties["irq"] = self.new_ep("int", val=-1)  # IRQ that leads to that transition
         self.edge_properties["bcet"] = self.new_ep("int64_t", val=-1)
         self.edge_properties["wcet"] = self.new_ep("int64_t", val=-1)
+        # vertex index -> out/in edges, see get_out_edges
+        self._out_adj = []
+        self._in_adj = []
+        self._adj_edges = 0
         # dominator_tree has 0 as default value. We are creating a fake node 0
         # here that captures this value.
         self.add_vertex()
@@ -526,8 +1114,68 @@ class MSTGraph(graph_tool.Graph):
     def add_edge(self, *args, **kwargs):
         e = super().add_edge(*args, **kwargs)
         self.ep.irq[e] = -1
+        # edges that are added otherwise (e.g. via a GraphView) are detected
+        # in _sync_adjacency
+        if self._adj_edges == self.num_edges() - 1:
+            self._index_edge(e)
         return e
 
+    def _index_edge(self, e):
+        src, tgt = int(e.source()), int(e.target())
+        missing = max(src, tgt) + 1 - len(self._out_adj)
+        if missing > 0:
+            self._out_adj.extend([] for _ in range(missing))
+            self._in_adj.extend([] for _ in range(missing))
+        self._out_adj[src].append(e)
+        self._in_adj[tgt].append(e)
+        self._adj_edges += 1
+
+    def _sync_adjacency(self):
+        """Rebuild the adjacency index, if edges were added bypassing it.
+
+        Removing edges is not supported by the index.
+        """
+        if self._adj_edges == self.num_edges():
+            return
+        self._out_adj = []
+        self._in_adj = []
+        self._adj_edges = 0
+        for e in self.edges():
+            self._index_edge(e)
+
+    def _get_adjacent_edges(self, adjacency, v, msttypes):
+        self._sync_adjacency()
+        idx = int(v)
+        if idx >= len(adjacency):
+            return []
+        mask = sum(msttypes)
+        etype = self.ep.type
+        return [e for e in adjacency[idx] if etype[e] & mask]
+
+    def get_out_edges(self, v, *msttypes):
+        """Return the out edges of v that have any of the given MSTTypes.
+
+        In contrast to edge_type, this needs O(degree) and does not create a
+        GraphView. The edge types are evaluated with every call, so they can
+        be changed after the edge is added.
+        """
+        return self._get_adjacent_edges(self._out_adj, v, msttypes)
+
+    def get_in_edges(self, v, *msttypes):
+        """Return the in edges of v that have any of the given MSTTypes.
+
+        See get_out_edges.
+        """
+        return self._get_adjacent_edges(self._in_adj, v, msttypes)
+
+    def get_out_neighbors(self, v, *msttypes):
+        """Return the targets of get_out_edges."""
+        return [e.target() for e in self.get_out_edges(v, *msttypes)]
+
+    def get_in_neighbors(self, v, *msttypes):
+        """Return the sources of get_in_edges."""
+        return [e.source() for e in self.get_in_edges(v, *msttypes)]
+
     def get_metastates(self):
         return graph_tool.GraphView(self, vfilt=self.vp.type.fa == StateType.metastate)
 
@@ -546,13 +1194,13 @@ class MSTGraph(graph_tool.Graph):
 
     def get_metastate(self, state):
         """Return the metastate that belongs to a state."""
-        m2s = self.edge_type(MSTType.m2s)
-        return self.vertex(single_check(m2s.vertex(state).in_neighbors()))
+        return self.vertex(single_check(self.get_in_neighbors(state,
+                                                              MSTType.m2s)))
 
     def get_entry_sp(self, exit_sp):
         """Return the entry SP that belongs to an exit SP."""
-        fu = self.edge_type(MSTType.en2ex)
-        return self.vertex(single_check(fu.vertex(exit_sp).in_neighbors()))
+        return self.vertex(single_check(self.get_in_neighbors(exit_sp,
+                                                              MSTType.en2ex)))
 
     def get_syscall_name(self, state):
         """Return the syscall name, if state belongs to one.
@@ -576,8 +1224,7 @@ class MSTGraph(graph_tool.Graph):
         The third element contains the IRQ number or -1, if the SP is not IRQ
         triggered.
         """
-        st2sy = self.edge_type(MSTType.st2sy)
-        for e in st2sy.vertex(entry_sp).in_edges():
+        for e in self.get_in_edges(entry_sp, MSTType.st2sy):
             irq = self.ep.irq[e]
             core = self.ep.cpu_id[e]
             if irq >= 0:
@@ -595,32 +1242,34 @@ class MSTGraph(graph_tool.Graph):
         obj = self.vp.state[state]
         return obj.cpus.one().exec_state
 
-    def _get_cpu_bound_state(self, graph_v, in_v, cpu_id):
-        return self.vertex(single_check([e.target()
-                                         for e in graph_v.vertex(in_v).out_edges()
-                                         if graph_v.ep.cpu_id[e] == cpu_id]))
+    def _get_cpu_bound_state(self, vertices, cpu_id):
+        """Return the single vertex of (edge, vertex) pairs for cpu_id."""
+        return self.vertex(single_check([v for e, v in vertices
+                                         if self.ep.cpu_id[e] == cpu_id]))
 
     def get_entry_state(self, entry_cp, cpu_id):
         """Return the entry state that belongs to an exit SP for a cpu_id."""
-        st2sy = self.edge_type(MSTType.st2sy)
-        return self._get_cpu_bound_state(st2sy, entry_cp, cpu_id)
+        return self._get_cpu_bound_state(
+            ((e, e.target())
+             for e in self.get_out_edges(entry_cp, MSTType.st2sy)), cpu_id)
 
     def get_exit_state(self, exit_cp, cpu_id):
         """Return the exit state that belongs to an entry SP for a cpu_id."""
-        st2sy = graph_tool.GraphView(self.edge_type(MSTType.st2sy),
-                                     reversed=True)
-        return self._get_cpu_bound_state(st2sy, exit_cp, cpu_id)
+        return self._get_cpu_bound_state(
+            ((e, e.source())
+             for e in self.get_in_edges(exit_cp, MSTType.st2sy)), cpu_id)
 
     def get_out_metastate(self, entry_cp, cpu_id):
         """Return the metastate that belongs to an entry SP for a cpu_id."""
-        m2sy = self.edge_type(MSTType.m2sy)
-        return self._get_cpu_bound_state(m2sy, entry_cp, cpu_id)
+        return self._get_cpu_bound_state(
+            ((e, e.target())
+             for e in self.get_out_edges(entry_cp, MSTType.m2sy)), cpu_id)
 
     def get_in_metastate(self, exit_cp, cpu_id):
         """Return the metastate that belongs to an exit SP for a cpu_id."""
-        m2sy = graph_tool.GraphView(self.edge_type(MSTType.m2sy),
-                                    reversed=True)
-        return self._get_cpu_bound_state(m2sy, exit_cp, cpu_id)
+        return self._get_cpu_bound_state(
+            ((e, e.source())
+             for e in self.get_in_edges(exit_cp, MSTType.m2sy)), cpu_id)
 
 
 class InstanceGraph(graph_tool.Graph):
@@ -629,6 +1278,15 @@ class InstanceGraph(graph_tool.Graph):
     """
     def __init__(self, graph=None):
         super().__init__(graph)
+
+        # id(instance object) -> vertices
+        self._obj_index = _LookupIndex(self.vertices,
+                                       lambda v: id(self.vp.obj[v]),
+                                       self.num_vertices)
+        # name -> (graph size, derived data), see get_derived
+        self._derived = {}
+        self._id_trie = None
+
         # vertex properties
 
         # If a graph is used to initialize the values, everthing
@@ -675,8 +1333,46 @@ class InstanceGraph(graph_tool.Graph):
             if isinstance(obj, instance_type):
                 yield inst, obj
 
+    def invalidate_indexes(self):
+        """Invalidate all lookup indexes.
+
+        Must be called, if instance objects are replaced without changing the
+        number of vertices.
+        """
+        self._obj_index.invalidate()
+        self._derived = {}
+        self._id_trie = None
+
+    def get_id_trie(self):
+        """Return the (synced) IDTrie of all vertex IDs."""
+        if self._id_trie is None:
+            self._id_trie = IDTrie(self)
+        self._id_trie.sync()
+        return self._id_trie
+
+    def get_derived(self, name, create):
+        """Return data that is derived from the graph with create(self).
+
+        The data is cached with the given name and recreated, if the number
+        of vertices or edges changes or invalidate_indexes is called.
+        """
+        size = (self.num_vertices(), self.num_edges())
+        cached = self._derived.get(name)
+        if cached is None or cached[0] != size:
+            cached = (size, create(self))
+            self._derived[name] = cached
+        return cached[1]
+
+    def get_node_by_obj(self, instance):
+        """Get the vertex that holds exactly the instance object or None."""
+        return next(iter(self._obj_index.lookup(id(instance))), None)
+
     def get_node(self, instance):
         """Get the vertex belonging to a specific instance."""
+        inst = self.get_node_by_obj(instance)
+        if inst is not None:
+            return inst
+        # instance may be only equal to the stored object
         for inst in self.vertices():
             if instance == self.vp.obj[inst]:
                 return inst
@@ -729,34 +1425,59 @@ class Graph:
     def _init_cfg(self):
         self.cfg = CFG()
 
-    # the following needs to be properties, since they must be reevaluated with
-    # every invocation
-    # WARNING: When you are using this properties you must create a locale
-    # reference, see https://git.skewed.de/count0/graph-tool/-/issues/685
+    # name -> (NodeLevel of the vertices, CFType of the edges or None)
+    _VIEWS = {"functs": (NodeLevel.function, None),
+              "abbs": (NodeLevel.abb, None),
+              "bbs": (NodeLevel.bb, None),
+              "icfg": (NodeLevel.abb, CFType.icf),
+              "lcfg": (NodeLevel.abb, CFType.lcf)}
+
+    def _get_view(self, name):
+        """Return the cached view name (see _VIEWS) of the CFG.
+
+        The view is rebuilt only if the CFG version has changed. Since the
+        view is referenced by the cache, it is not necessary to create a
+        local reference of it (see
+        https://git.skewed.de/count0/graph-tool/-/issues/685).
+        """
+        cfg = self.cfg
+        version = cfg.get_version()
+        cached = self._views.get(name)
+        if cached is not None and cached[0] is cfg and cached[1] == version:
+            return cached[2]
+        level, edge_type = self._VIEWS[name]
+        filters = {"vfilt": cfg.vp.level.fa == level}
+        if edge_type is not None:
+            filters["efilt"] = cfg.ep.type.fa == edge_type
+        view = CFGView(cfg, **filters)
+        self._views[name] = (cfg, version, view)
+        return view
+
     @property
     def functs(self):
-        return CFGView(self.cfg,
-                       vfilt=self.cfg.vp.level.fa == NodeLevel.function)
+        return self._get_view("functs")
 
     @property
     def abbs(self):
-        return CFGView(self.cfg, vfilt=self.cfg.vp.level.fa == NodeLevel.abb)
+        return self._get_view("abbs")
 
     @property
     def bbs(self):
-        return CFGView(self.cfg, vfilt=self.cfg.vp.level.fa == NodeLevel.bb)
+        return self._get_view("bbs")
 
     @property
     def icfg(self):
-        return CFGView(self.abbs, efilt=self.cfg.ep.type.fa == CFType.icf)
+        return self._get_view("icfg")
 
     @property
     def lcfg(self):
-        return CFGView(self.abbs, efilt=self.cfg.ep.type.fa == CFType.lcf)
+        return self._get_view("lcfg")
 
     def __init__(self):
         # should be used only from C++, see graph.h
         self._graph_data = PyGraphData()
+        # name -> (cfg, cfg version, view), see _get_view
+        self._views = {}
         # persitent data for of the value analyzer
         self._va_system_objects = {}
         self._init_cfg()
@@ -766,3 +1487,14 @@ class Graph:
         self.svfg = SVFG()
         self.step_data = {}
         self.file_cache = {}
+
+    def invalidate_indexes(self):
+        """Invalidate the lookup indexes of all subgraphs.
+
+        The indexes detect additions and removals of vertices and edges
+        themselves, but not all modifications of properties. The step manager
+        calls this after every step.
+        """
+        self.cfg.invalidate_indexes()
+        self.callgraph.invalidate_indexes()
+        self.instances.invalidate_indexes()
@@ -8,21 +8,20 @@
 
 import html
 
-from collections import defaultdict
 from copy import copy
 from dataclasses import dataclass, field
 from enum import IntEnum
 from itertools import chain
-from typing import Any, List, Tuple
+from typing import Any, Dict, FrozenSet, List, Tuple
 from graph_tool import GraphView
 from graph_tool.search import dfs_iterator
 
 import pyllco
 
-from ara.util import get_logger, has_path
+from ara.util import get_logger, has_path, is_debug, slotted
 from ara.graph import CallPath, SyscallCategory, SigType, single_check, edge_types
 
-from .os_util import syscall, Arg, set_next_abb, connect_from_here, find_instance_node
+from .os_util import syscall, Arg, set_next_abb, connect_from_here, find_instance_node, get_ready_queue
 from .os_base import OSBase, OSState, CPUList, CPU, ControlInstance, TaskStatus, ControlContext, CrossCoreAction, ExecState, CPUBounded, IRQ
 from .interrupts import fake_interrupt_function
 
@@ -112,6 +111,7 @@ class Task(AUTOSARInstance, ControlInstance):
         }
 
 
+@slotted
 @dataclass
 class TaskContext(ControlContext):
     received_events: int = 0
@@ -139,6 +139,7 @@ class Spinlock:
     name: str
 
 
+@slotted
 @dataclass
 class SpinlockContext:
     on_hold: bool = False
@@ -172,6 +173,7 @@ class Alarm(AUTOSARInstance):
     alarmtime: int = 0
 
 
+@slotted
 @dataclass(unsafe_hash=True)
 class AlarmContext:
     increment: int
@@ -188,6 +190,7 @@ class ISR(AUTOSARInstance, ControlInstance):
         return AUTOSARInstance.__hash__(self)
 
 
+@slotted
 @dataclass
 class ISRContext(ControlContext):
     def __hash__(self):
@@ -204,6 +207,24 @@ class Resource(AUTOSARInstance):
     pass
 
 
+@dataclass
+class IRQDispatchTable:
+    """State independent part of the IRQ handling of AUTOSAR.
+
+    All vertices are stored as integers.
+    """
+    # IRQ vertex (alarm or ISR) -> its object
+    irqs: Dict[int, Any] = field(default_factory=dict)
+    # alarm vertex -> (vertex, object) of the activated tasks and events
+    alarm_targets: Dict[int, List[Tuple[int, Any]]] = field(default_factory=dict)
+    # event vertex -> all tasks that have the event
+    event_tasks: Dict[int, List[Any]] = field(default_factory=dict)
+    # task vertex -> its task groups
+    task_groups: Dict[int, List[int]] = field(default_factory=dict)
+    # task group vertex -> all task vertices of the group
+    group_members: Dict[int, FrozenSet[int]] = field(default_factory=dict)
+
+
 class AUTOSAR(OSBase):
     """AUTOSAR model.
 
@@ -361,26 +382,37 @@ class AUTOSAR(OSBase):
     def is_interaction(ty) -> bool:
         return ty != InstanceEdge.have
 
-    def _get_taskgroup_for_task(instances, task_v):
-        have = edge_types(instances, instances.ep.type, InstanceEdge.have)
-        return instances.vertex(single_check(have.vertex(task_v).in_neighbors()))
-
     @staticmethod
-    def _get_all_tasks_of_taskgroup(instances, task_group):
+    def create_irq_dispatch_table(instances):
+        table = IRQDispatchTable()
+        activates = edge_types(instances, instances.ep.type, InstanceEdge.activate)
         have = edge_types(instances, instances.ep.type, InstanceEdge.have)
-        return frozenset([instances.vertex(x) for x in have.vertex(task_group).out_neighbors()])
+        for v, obj in chain(instances.get(Alarm), instances.get(ISR)):
+            table.irqs[int(v)] = obj
+        for v, _ in instances.get(Alarm):
+            table.alarm_targets[int(v)] = [
+                (int(t), instances.vp.obj[t])
+                for t in activates.vertex(v).out_neighbors()]
+        for v, _ in instances.get(Event):
+            table.event_tasks[int(v)] = [
+                instances.vp.obj[t] for t in have.vertex(v).in_neighbors()]
+        for v, _ in instances.get(Task):
+            table.task_groups[int(v)] = [
+                int(g) for g in have.vertex(v).in_neighbors()]
+        for v, _ in instances.get(TaskGroup):
+            table.group_members[int(v)] = frozenset(
+                int(t) for t in have.vertex(v).out_neighbors())
+        return table
 
     @staticmethod
     def handle_irq(graph, state, cpu_id, irq):
         # we handle alarms and ISRs
-        instances = state.instances
         if isinstance(irq, IRQ):
             irq = irq.id
-        vertex = instances.vertex(irq)
-        obj = instances.vp.obj[vertex]
-
-        activates = edge_types(instances, instances.ep.type, InstanceEdge.activate)
-        event_tgt = edge_types(instances, instances.ep.type, InstanceEdge.have)
+        table = AUTOSAR.get_irq_dispatch_table(state.instances)
+        obj = table.irqs.get(int(irq))
+        if obj is None:
+            raise NotImplementedError
 
         if obj.cpu_id != cpu_id:
             # false CPU
@@ -392,18 +424,19 @@ class AUTOSAR(OSBase):
                 return
             # the current control instance must be a task
 
-            alarm_ctx = state.context.get(obj, False)
+            # read only, see schedule
+            alarm_ctx = state.context.peek(obj, False)
             # TODO interarrival times
             if alarm_ctx and alarm_ctx.active:
-                acty_vertex = single_check(activates.vertex(vertex).out_neighbors())
-                acty = instances.vp.obj[acty_vertex]
+                acty_vertex, acty = single_check(table.alarm_targets[int(irq)])
                 if isinstance(acty, Task):
                     # do not trigger alarms, if in handling task or taskgroup
                     if acty.cpu_id == cpu_id:
                         ctl_inst = state.cpus[cpu_id].control_instance
                         if ctl_inst is not None:
-                            all_tasks = AUTOSAR._get_all_tasks_of_taskgroup(instances, AUTOSAR._get_taskgroup_for_task(instances, ctl_inst))
-                            if acty_vertex in all_tasks:
+                            task_group = single_check(
+                                table.task_groups.get(int(ctl_inst), []))
+                            if acty_vertex in table.group_members[task_group]:
                                 return
                     logger.debug(f"Alarm {obj.name} activates {acty.name}.")
                     new_state = state.copy()
@@ -411,8 +444,7 @@ class AUTOSAR(OSBase):
                 elif isinstance(acty, Event):
                     logger.debug(f"Alarm {obj.name} sets {acty.name}.")
                     new_state = state.copy()
-                    for t in event_tgt.vertex(acty_vertex).in_neighbors():
-                        task = instances.vp.obj[instances.vertex(t)]
+                    for task in table.event_tasks[acty_vertex]:
                         new_state = AUTOSAR.SetEvent(new_state, cpu_id, task,
                                                      acty.index)
                     return new_state
@@ -444,7 +476,7 @@ class AUTOSAR(OSBase):
             new_state.context[isr] = ISRContext(status=TaskStatus.suspended,
                                                 abb=state.cfg.get_entry_abb(isr.function),
                                                 call_path=CallPath(),
-                                                dyn_prio=state.context[isr].dyn_prio)
+                                                dyn_prio=list(state.context.peek(isr).dyn_prio))
             return [new_state]
         return []
 
@@ -475,9 +507,10 @@ class AUTOSAR(OSBase):
         cfg = graph.cfg
         abb = state.cpus[cpu_id].abb
         syscall = cfg.get_syscall_name(abb)
-        logger.debug(f"Get syscall: {syscall}, CPU {cpu_id}, "
-                     f"ABB: {cfg.vp.name[abb]}"
-                     f" (in {cfg.vp.name[cfg.get_function(abb)]})")
+        if is_debug(logger):
+            logger.debug("Get syscall: %s, CPU %s, ABB: %s (in %s)",
+                         syscall, cpu_id, cfg.vp.name[abb],
+                         cfg.vp.name[cfg.get_function(abb)])
 
         syscall_function = getattr(AUTOSAR, syscall)
 
@@ -521,22 +554,26 @@ class AUTOSAR(OSBase):
 
         return False
 
+    @staticmethod
+    def _is_ready(ctx):
+        return ctx.status in (TaskStatus.running, TaskStatus.ready)
+
+    @staticmethod
+    def _get_prio(ctx):
+        return ctx.dyn_prio[-1]
+
     @staticmethod
     def schedule(state, cpus=None):
         if cpus is None:
             cpus = [cpu.id for cpu in state.cpus]
 
-        logger.debug(f"Scheduling state {state} on CPUs: {cpus}")
+        logger.debug("Scheduling state %s on CPUs: %s", state, cpus)
 
-        # get cpu mapping
-        cpu_map = defaultdict(list)
-        for v in state.instances.get_controls().vertices():
-            obj = state.instances.vp.obj[v]
-            if obj.cpu_id in cpus:
-                status = state.context[obj].status
-                if status in [TaskStatus.running, TaskStatus.ready]:
-                    cpu_map[obj.cpu_id].append((v, state.context[obj]))
-                logger.debug(f"Object {obj} is in status {str(status)}")
+        # The ready queue only tracks contexts that are accessed for writing
+        # with state.context[...] (__getitem__/__setitem__). All syscalls must
+        # modify contexts this way, contexts from peek() are read only.
+        ready_queue = get_ready_queue(state, AUTOSAR._is_ready,
+                                      AUTOSAR._get_prio)
 
         # update cpus
         for cpu in filter(lambda cpu: cpu.id in cpus, state.cpus):
@@ -544,35 +581,38 @@ class AUTOSAR(OSBase):
             if cpu.exec_state == ExecState.waiting:
                 continue
 
-            if not (cpu.id in cpu_map and len(cpu_map[cpu.id]) != 0):
+            new_vertex = ready_queue.get_highest(cpu.id)
+            if new_vertex is None:
                 # idle state
-                new_vertex = None
+                new_obj = None
                 new_ctx = None
-                new_label = "Idle state"
             else:
-                new_vertex, new_ctx = max(cpu_map[cpu.id],
-                                          key=lambda t: t[1].dyn_prio[-1])
                 new_vertex = state.instances.vertex(new_vertex)
-                new_label = state.instances.vp.label[new_vertex]
+                new_obj = state.instances.vp.obj[new_vertex]
+                # read only access, the context is cloned only if it changes
+                # (and must be written with state.context[new_obj])
+                new_ctx = state.context.peek(new_obj)
 
             # not coming from idle
             if cpu.control_instance:
                 old_vertex = state.instances.vertex(cpu.control_instance)
                 old_task = state.instances.vp.obj[old_vertex]
-                old_label = state.instances.vp.label[old_vertex]
             else:
                 old_vertex = None
                 old_task = None
-                old_label = "Idle state"
 
-            logger.debug(f"Schedule on CPU {cpu.id}: "
-                         f"From {old_label} "
-                         f"to {new_label}")
+            if is_debug(logger):
+                labels = state.instances.vp.label
+                logger.debug("Schedule on CPU %s: From %s to %s", cpu.id,
+                             "Idle state" if old_vertex is None
+                             else labels[old_vertex],
+                             "Idle state" if new_vertex is None
+                             else labels[new_vertex])
 
             # handle non preemptible tasks
             if (not isinstance(new_ctx, ISRContext)) and \
                isinstance(old_task, Task) and (not old_task.schedule) \
-               and state.context[old_task].status == TaskStatus.running:
+               and state.context.peek(old_task).status == TaskStatus.running:
                 # do not schedule on this CPU
                 logger.debug("CPU %s: Do not schedule: Non preemptible task",
                              cpu.id)
@@ -598,6 +638,7 @@ class AUTOSAR(OSBase):
 
             # load new values
             if new_vertex:
+                new_ctx = state.context[new_obj]
                 cpu.abb = state.cfg.vertex(new_ctx.abb)
                 cpu.call_path = new_ctx.call_path
                 new_ctx.status = TaskStatus.running
@@ -16,7 +16,7 @@ import html
 from graph_tool import Vertex
 from ara.graph import SyscallCategory, SigType, CFG, CallPath
 from dataclasses import dataclass, field
-from ara.util import get_logger
+from ara.util import get_logger, is_debug
 from ara.steps.util import current_step
 from ara.steps.instance_graph_stats import MissingInteractions
 
@@ -306,8 +306,9 @@ class FreeRTOS(OSBase):
         cfg = graph.cfg
         abb = state.cpus[cpu_id].abb
         syscall = cfg.get_syscall_name(abb)
-        logger.debug(f"Get syscall: {syscall}, ABB: {cfg.vp.name[abb]}"
-                     f" (in {cfg.vp.name[cfg.get_function(abb)]})")
+        if is_debug(logger):
+            logger.debug("Get syscall: %s, ABB: %s (in %s)", syscall,
+                         cfg.vp.name[abb], cfg.vp.name[cfg.get_function(abb)])
 
         syscall_function = getattr(FreeRTOS, syscall)
 
@@ -319,7 +320,6 @@ class FreeRTOS(OSBase):
             if sys_cat | categories != sys_cat:
                 # do not interpret this syscall
                 state = state.copy()
-                state.next_abbs = []
                 set_next_abb(state, 0)
                 return state
         # TODO: place MissingInteractions.activate() in working initializer function
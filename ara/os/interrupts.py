@@ -52,4 +52,5 @@ def fake_interrupt_function(cfg, name, iit=0):
     si_i = cfg.add_edge(sc_v, iit_v)
     cfg.ep.type[si_i] = CFType.icf
 
+    cfg.bump_version()
     return func_v
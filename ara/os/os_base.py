@@ -14,6 +14,7 @@ from typing import Any, List
 import graph_tool
 
 from ara.graph import SyscallCategory, CallPath, CFG, ABBType
+from ara.util import slotted
 
 # from ara.util import get_logger
 # logger = get_logger("OS_BASE")
@@ -21,6 +22,7 @@ from ara.graph import SyscallCategory, CallPath, CFG, ABBType
 
 class CPUList:
     """Container for storing CPUs."""
+    __slots__ = ("_cpus",)
 
     def __init__(self, cpus):
         self._cpus = dict([(cpu.id, cpu) for cpu in cpus])
@@ -38,6 +40,11 @@ class CPUList:
     def __copy__(self):
         return CPUList([x.copy() for x in self._cpus.values()])
 
+    def __eq__(self, other):
+        if not isinstance(other, CPUList):
+            return NotImplemented
+        return self._cpus == other._cpus
+
     def __hash__(self):
         hush = hash(tuple(sorted(self._cpus.values(),
                                  key=lambda x: x.id)))
@@ -62,6 +69,175 @@ class CPUList:
         self._cpus[idx] = cpu
 
 
+class ContextMap:
+    """Copy-on-write container for the contexts of an OSState.
+
+    A copy of a ContextMap shares all context objects with the original.
+    A context is cloned (with copy.copy) when it is accessed for writing
+    the first time (with `context[inst]` or `get`). Afterwards, it is owned
+    by this map and can be modified freely. Use `peek` for read only access,
+    it never clones.
+
+    The hash is order independent and calculated incrementally. The hashes
+    of shared contexts are cached (they cannot change anymore), only the
+    owned contexts are rehashed.
+
+    An OS model can attach a derived structure (e.g. os_util.ReadyQueue)
+    as `ready_queue`. It is copied together with the map. As long as it is
+    attached, the map records all keys that are accessed for writing, see
+    `pop_changed`.
+
+    ATTENTION: Contexts retrieved with `peek`, `values` or `items` must not
+    be modified.
+    """
+    __slots__ = ("_data", "_owned", "_hashes", "_shared_sum", "_changed",
+                 "ready_queue")
+    _MASK = (1 << 64) - 1
+
+    def __init__(self, data=None):
+        # all given contexts are shared
+        self._data = dict(data) if data else {}
+        # keys whose context belongs exclusively to this map
+        self._owned = set()
+        # key -> hash of entry, only for shared entries
+        self._hashes = {}
+        # sum of the hashes of all shared entries (None, if unknown)
+        self._shared_sum = None
+        # keys accessed for writing since the last pop_changed
+        self._changed = set()
+        self.ready_queue = None
+
+    def _entry_hash(self, key):
+        return hash((key, self._data[key]))
+
+    def _mark_changed(self, key):
+        if self.ready_queue is not None:
+            self._changed.add(key)
+
+    def pop_changed(self):
+        """Return all keys that are accessed for writing since the last call.
+
+        Only recorded if a ready_queue is attached.
+        """
+        changed = self._changed
+        self._changed = set()
+        return changed
+
+    def _own(self, key):
+        """Mark key as owned by this map (its context can change now)."""
+        self._owned.add(key)
+        # if the shared sum is known, all shared entries have a cached hash
+        e_hash = self._hashes.pop(key, None)
+        if e_hash is not None and self._shared_sum is not None:
+            self._shared_sum -= e_hash
+
+    def copy(self):
+        """Return a copy that shares all contexts with this map."""
+        # from now on, all owned contexts are shared between both maps
+        for key in self._owned:
+            e_hash = self._entry_hash(key)
+            self._hashes[key] = e_hash
+            if self._shared_sum is not None:
+                self._shared_sum += e_hash
+        self._owned = set()
+
+        new_map = ContextMap.__new__(ContextMap)
+        new_map._data = self._data.copy()
+        new_map._owned = set()
+        new_map._hashes = self._hashes.copy()
+        new_map._shared_sum = self._shared_sum
+        new_map._changed = set(self._changed)
+        if self.ready_queue is None:
+            new_map.ready_queue = None
+        else:
+            new_map.ready_queue = self.ready_queue.copy()
+        return new_map
+
+    def peek(self, key, default=None):
+        """Return the context of key without cloning it (read only)."""
+        return self._data.get(key, default)
+
+    def get(self, key, default=None):
+        """Return the (writable) context of key or default."""
+        if key not in self._data:
+            return default
+        return self[key]
+
+    def __getitem__(self, key):
+        """Return the context of key. The context can be modified."""
+        ctx = self._data[key]
+        self._mark_changed(key)
+        if key not in self._owned:
+            ctx = copy.copy(ctx)
+            self._data[key] = ctx
+            self._own(key)
+        return ctx
+
+    def __setitem__(self, key, ctx):
+        self._mark_changed(key)
+        if key not in self._owned:
+            self._own(key)
+        self._data[key] = ctx
+
+    def __delitem__(self, key):
+        self._mark_changed(key)
+        if key not in self._owned:
+            self._own(key)
+        del self._data[key]
+        self._owned.discard(key)
+
+    def update(self, other):
+        for key, ctx in other.items():
+            self[key] = ctx
+
+    def keys(self):
+        return self._data.keys()
+
+    def values(self):
+        """Return all contexts (read only)."""
+        return self._data.values()
+
+    def items(self):
+        """Return all (key, context) pairs (contexts are read only)."""
+        return self._data.items()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, ContextMap):
+            return self._data == other._data
+        if isinstance(other, dict):
+            return self._data == other
+        return NotImplemented
+
+    def __hash__(self):
+        if self._shared_sum is None:
+            shared_sum = 0
+            for key in self._data:
+                if key in self._owned:
+                    continue
+                e_hash = self._hashes.get(key, None)
+                if e_hash is None:
+                    e_hash = self._entry_hash(key)
+                    self._hashes[key] = e_hash
+                shared_sum += e_hash
+            self._shared_sum = shared_sum
+        total = self._shared_sum
+        for key in self._owned:
+            total += self._entry_hash(key)
+        return hash(total & ContextMap._MASK)
+
+    def __repr__(self):
+        return repr(self._data)
+
+
 class TaskStatus(enum.IntEnum):
     running = 1
     blocked = 2
@@ -109,6 +285,7 @@ class CrossCoreAction(Exception):
         self.cpu_ids = cpu_ids
 
 
+@slotted
 @dataclass()
 class ControlContext:
     """Changing context for a ControlInstance"""
@@ -169,6 +346,7 @@ class IRQ(ControlInstance):
         return hash((self.id, self.name))
 
 
+@slotted
 @dataclass
 class IRQContext(ControlContext):
     """The context that corresponds to an IRQ."""
@@ -177,6 +355,8 @@ class IRQContext(ControlContext):
         return super().__hash__()
 
 
+# call_path_id is set by the SSE, see cfg_traversal
+@slotted(extra=("call_path_id",))
 @dataclass
 class CPU:
     id: int
@@ -197,13 +377,18 @@ class CPU:
                    analysis_context=new_ac,
                    exec_state=self.exec_state)
 
+    def _key(self):
+        ci = self.control_instance and int(self.control_instance)
+        abb = self.abb and int(self.abb)
+        return (self.irq_on, ci, abb, self.call_path, self.exec_state)
+
     def __eq__(self, other):
-        return hash(self) == hash(other)
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
 
     def __hash__(self):
-        ci = self.control_instance and int(self.control_instance)
-        abb = self.abb and int(self.abb)
-        return hash((self.irq_on, ci, abb, self.call_path, self.exec_state))
+        return hash(self._key())
 
 
 _state_id = 0
@@ -213,6 +398,8 @@ def _get_id():
     return _state_id
 
 
+# analysis_context and recursive are set by the SSE, see cfg_traversal
+@slotted(extra=("_context", "analysis_context", "recursive"))
 @dataclass
 class OSState:
     id: int = field(init=False, default_factory=_get_id)
@@ -220,23 +407,41 @@ class OSState:
     instances: graph_tool.Graph
     cfg: CFG
 
-    # key: some instance, value: mutable context
-    context: dict = field(default_factory=dict, init=False)
+    def __post_init__(self):
+        # key: some instance, value: mutable context
+        self._context = ContextMap()
+
+    @property
+    def context(self):
+        """The contexts of all instances (a copy-on-write ContextMap)."""
+        return self._context
+
+    @context.setter
+    def context(self, context):
+        if not isinstance(context, ContextMap):
+            context = ContextMap(context)
+        self._context = context
 
     def __eq__(self, other):
-        return hash(self) == hash(other)
+        """Structural comparison of two states."""
+        if not isinstance(other, OSState):
+            return NotImplemented
+        return self.cpus == other.cpus and self._context == other._context
 
     def __hash__(self):
-        return hash((self.cpus, tuple([(hash(k), hash(v))
-                                       for k, v in self.context.items()])))
+        return hash((self.cpus, self._context))
+
+    def __repr__(self):
+        return (f"OSState(id={self.id}, cpus={self.cpus}, "
+                f"instances={self.instances}, cfg={self.cfg}, "
+                f"context={self._context})")
 
     def copy(self):
         new_state = OSState(cpus=copy.copy(self.cpus),
                             instances=self.instances,
                             cfg=self.cfg)
-        # new context for control instances
-        for inst, ctx in self.context.items():
-            new_state.context[inst] = copy.copy(ctx)
+        # the contexts are shared and only cloned when they are modified
+        new_state._context = self._context.copy()
         return new_state
 
     def cur_control_inst(self, cpu_id):
@@ -260,6 +465,7 @@ class OSCreator(type):
         x.syscalls = {f: getattr(x, f) for f in dir(x)
                       if hasattr(getattr(x, f), 'syscall')}
         for syscall in list(x.syscalls.values()):
+            syscall.prepare()
             for alias in syscall.aliases:
                 x.syscalls[alias] = syscall
                 setattr(x, alias, syscall)
@@ -345,6 +551,29 @@ class OSBase(metaclass=OSCreator):
         """
         raise NotImplementedError
 
+    @staticmethod
+    def create_irq_dispatch_table(instances):
+        """Compute the state independent part of the IRQ handling.
+
+        The table is OS specific (e.g. the instances an IRQ activates) and
+        is meant to be used by handle_irq via get_irq_dispatch_table.
+        Return None, if the OS model has no such table.
+
+        Arguments:
+        instances -- the instance graph
+        """
+        return None
+
+    @classmethod
+    def get_irq_dispatch_table(cls, instances):
+        """Return the IRQ dispatch table for instances.
+
+        It is created once with create_irq_dispatch_table and cached as long
+        as the instance graph does not change.
+        """
+        return instances.get_derived(f"{cls.get_name()}.irq_dispatch",
+                                     cls.create_irq_dispatch_table)
+
     @staticmethod
     def handle_exit(graph, state, cpu_id):
         """Handle an irregular exit.
@@ -5,7 +5,9 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import bisect
 import collections
+import copy
 import os.path
 import typing
 import dataclasses
@@ -182,6 +184,45 @@ Argument.hint = property(Argument.get_hint, Argument.set_hint)
 Arg = Argument
 
 
+_argument_classes = {}
+
+
+def _make_argument_class(names):
+    """Create a slotted record class with the fields given in names."""
+    def __init__(self, *values):
+        for name, value in zip(names, values):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        fields = ', '.join([f"{n}={getattr(self, n)!r}" for n in names])
+        return f"Arguments({fields})"
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all([getattr(self, n) == getattr(other, n) for n in names])
+
+    return type("Arguments", (), {"__slots__": names,
+                                  "__init__": __init__,
+                                  "__repr__": __repr__,
+                                  "__eq__": __eq__,
+                                  "__hash__": None})
+
+
+def get_argument_class(signature):
+    """Return the argument record class for a syscall signature.
+
+    There is exactly one class for every combination of argument names, so
+    all syscalls with the same argument names share their class.
+    """
+    names = tuple([arg.name for arg in signature])
+    cls = _argument_classes.get(names, None)
+    if cls is None:
+        cls = _make_argument_class(names)
+        _argument_classes[names] = cls
+    return cls
+
+
 def set_next_abb(state, cpu_id):
     """Set the CPU specified with cpu_id to the next abb.
 
@@ -197,6 +238,239 @@ def set_next_abb(state, cpu_id):
         cpu.exec_state = ExecState.from_abbtype(state.cfg.vp.type[next_abb])
 
 
+class ReadyQueue:
+    """Per-CPU priority ordered queue of the ready control instances of a state.
+
+    The queue is attached to the ContextMap of a state (see
+    get_ready_queue) and is copied with it. The per-CPU queues are shared
+    between copies and only cloned if they are modified. Only the contexts
+    that are accessed for writing since the last update are reevaluated, so
+    every syscall that modifies a context keeps the queue consistent.
+
+    If multiple instances have the same priority, the one with the lowest
+    vertex in the instance graph is the highest.
+
+    The control instances are fixed at creation. get_ready_queue creates a
+    new queue, if the number of instances in the instance graph changes.
+    """
+    __slots__ = ("_controls", "_queues", "_owned", "_keys", "_keys_owned",
+                 "num_instances")
+
+    def __init__(self, controls, num_instances):
+        """Create an empty queue.
+
+        Arguments:
+        controls      -- a dict that maps all control instances to a tuple
+                         of their vertex and cpu_id. It is shared between all
+                         copies.
+        num_instances -- the number of vertices of the instance graph, that
+                         controls is retrieved from
+        """
+        self._controls = controls
+        self.num_instances = num_instances
+        # cpu_id -> sorted list of (-prio, vertex)
+        self._queues = {}
+        # cpu_ids whose queue belongs exclusively to this object
+        self._owned = set()
+        # instance -> its element in the queues
+        self._keys = {}
+        self._keys_owned = True
+
+    def copy(self):
+        """Return a copy that shares all queues with this one."""
+        new_queue = ReadyQueue.__new__(ReadyQueue)
+        new_queue._controls = self._controls
+        new_queue.num_instances = self.num_instances
+        new_queue._queues = self._queues.copy()
+        new_queue._owned = set()
+        new_queue._keys = self._keys
+        new_queue._keys_owned = False
+        self._owned = set()
+        self._keys_owned = False
+        return new_queue
+
+    def _get_queue(self, cpu_id):
+        queue = self._queues.get(cpu_id)
+        if queue is None:
+            queue = []
+        elif cpu_id not in self._owned:
+            queue = list(queue)
+        else:
+            return queue
+        self._queues[cpu_id] = queue
+        self._owned.add(cpu_id)
+        return queue
+
+    def update(self, inst, ctx, is_ready, get_prio):
+        """Reevaluate the position of inst with its (new) context ctx.
+
+        Arguments:
+        inst     -- the instance, non control instances are ignored
+        ctx      -- the context of inst or None, if it does not exist
+        is_ready -- function that returns if a context is ready
+        get_prio -- function that returns the priority of a context
+        """
+        control = self._controls.get(inst)
+        if control is None:
+            return
+        vertex, cpu_id = control
+        key = None
+        if ctx is not None and is_ready(ctx):
+            key = (-get_prio(ctx), vertex)
+        old_key = self._keys.get(inst)
+        if key == old_key:
+            return
+
+        queue = self._get_queue(cpu_id)
+        if old_key is not None:
+            del queue[bisect.bisect_left(queue, old_key)]
+        if key is not None:
+            bisect.insort(queue, key)
+
+        if not self._keys_owned:
+            self._keys = self._keys.copy()
+            self._keys_owned = True
+        if key is None:
+            del self._keys[inst]
+        else:
+            self._keys[inst] = key
+
+    def get_highest(self, cpu_id):
+        """Return the vertex of the ready instance with the highest priority.
+
+        Return None, if no instance is ready on cpu_id.
+        """
+        queue = self._queues.get(cpu_id)
+        if not queue:
+            return None
+        return queue[0][1]
+
+
+def get_ready_queue(state, is_ready, get_prio):
+    """Return the up to date ReadyQueue of state.
+
+    The queue is created with the first call for a state (or a context map)
+    and updated incrementally afterwards. It is created again, if instances
+    are added to (or removed from) the instance graph in the meantime, since
+    they may be new control instances.
+
+    Only contexts that are accessed for writing (with `context[inst]`, `get`
+    or assignment) are reevaluated, see ContextMap. Contexts retrieved with
+    `peek` must not be modified.
+
+    Arguments:
+    state    -- the OSState
+    is_ready -- function that returns if a context is ready
+    get_prio -- function that returns the priority of a context (the
+                highest priority is scheduled first)
+    """
+    context = state.context
+    queue = context.ready_queue
+    num_instances = state.instances.num_vertices()
+    if queue is None or queue.num_instances != num_instances:
+        controls = {}
+        for v in state.instances.get_controls().vertices():
+            inst = state.instances.vp.obj[v]
+            controls[inst] = (int(v), inst.cpu_id)
+        queue = ReadyQueue(controls, num_instances)
+        context.ready_queue = queue
+        context.pop_changed()
+        changed = controls.keys()
+    else:
+        changed = context.pop_changed()
+    for inst in changed:
+        queue.update(inst, context.peek(inst), is_ready, get_prio)
+    return queue
+
+
+class ValueAnalyzerSession:
+    """Step scoped ValueAnalyzer that memoizes argument values.
+
+    The syscall interpretation retrieves the same arguments (same callsite,
+    same call path) over and over again. This class wraps a native
+    ValueAnalyzer and caches the results of get_argument_value (including
+    ValuesUnknown failures). The cache is invalidated with every call of
+    assign_system_object, since a new system object can change the result of
+    a value search.
+
+    All other functions are forwarded to the native ValueAnalyzer.
+    Use get_value_analyzer() to retrieve the session of the current step.
+    """
+    def __init__(self, graph, tracer=None):
+        from ara.steps import get_native_component
+        ValueAnalyzer = get_native_component("ValueAnalyzer")
+        self._va = ValueAnalyzer(graph, tracer)
+        self._values_unknown = get_native_component("ValuesUnknown")
+        self._cache = {}
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+
+    def get_argument_value(self, callsite, argument_nr, callpath=None,
+                           hint=_SigType.undefined, ty=None):
+        """See ValueAnalyzer.get_argument_value."""
+        if ty is not None:
+            return self._va.get_argument_value(callsite, argument_nr,
+                                               callpath=callpath, hint=hint,
+                                               ty=ty)
+        if callpath is None:
+            from ara.graph import CallPath
+            callpath = CallPath()
+        key = (int(callsite), argument_nr, callpath, int(hint))
+        is_exc, result = self._cache.get(key, (None, None))
+        if is_exc is None:
+            self.misses += 1
+            try:
+                result = self._va.get_argument_value(callsite, argument_nr,
+                                                     callpath=callpath,
+                                                     hint=hint)
+                is_exc = False
+            except self._values_unknown as e:
+                result = e
+                is_exc = True
+            # the call path is mutable, so store a copy in the key
+            key = (key[0], key[1], copy.copy(callpath), key[3])
+            self._cache[key] = (is_exc, result)
+        else:
+            self.hits += 1
+        if is_exc:
+            raise result
+        return result
+
+    def assign_system_object(self, *args, **kwargs):
+        """See ValueAnalyzer.assign_system_object."""
+        self._cache.clear()
+        return self._va.assign_system_object(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._va, attr)
+
+
+_va_session = None
+
+
+def get_value_analyzer(graph):
+    """Return the ValueAnalyzerSession of the current step.
+
+    The session is created on first use and lives until
+    reset_value_analyzer is called. The StepManager does this after every
+    step.
+    """
+    global _va_session
+    if _va_session is None:
+        step = current_step.get_wrappee()
+        tracer = getattr(step, "tracer", None) if step is not None else None
+        _va_session = ValueAnalyzerSession(graph, tracer)
+    return _va_session
+
+
+def reset_value_analyzer():
+    """Drop the ValueAnalyzerSession (including its cached values)."""
+    global _va_session
+    _va_session = None
+
+
 class SysCall:
     """Defines a system call.
 
@@ -219,11 +493,63 @@ class SysCall:
         self.name = name if name != None else func_body.__name__
         self.signal_safe = signal_safe
         self.is_stub = is_stub
+        self._arg_cls = None
+
+    def prepare(self):
+        """Create the argument record class of this system call.
+
+        This is done once at OS model creation time (see OSCreator), so the
+        interpretation only has to fill in the values.
+        """
+        if self._arg_cls is None:
+            self._arg_cls = get_argument_class(self._signature)
+        return self._arg_cls
+
+    def make_arguments(self, values):
+        """Pack the argument values into an argument record."""
+        arg_cls = self._arg_cls or self.prepare()
+        return arg_cls(*values)
 
     def get_name(self):
         """Returns the name of the syscall function."""
         return self.name
 
+    def get_argument_values(self, graph, state, cpu_id, sig_offset=0):
+        """Retrieve the argument values of the system call.
+
+        The value analysis is done for the ABB and call path of the given cpu.
+        Arguments that cannot be retrieved are returned as UnknownArgument.
+        See __call__ for the meaning of the arguments.
+        """
+        # avoid dependency conflicts, therefore import dynamically
+        from ara.steps import get_native_component
+        ValuesUnknown = get_native_component("ValuesUnknown")
+
+        va = get_value_analyzer(graph)
+
+        values = []
+
+        abb = state.cpus[cpu_id].abb
+        callpath = state.cpus[cpu_id].call_path
+
+        for idx, arg in enumerate(self._signature):
+            hint = arg.hint
+            if arg.hint == _SigType.instance:
+                hint = _SigType.symbol
+            try:
+                result = va.get_argument_value(abb, 
+                                               idx + sig_offset,
+                                               callpath=callpath,
+                                               hint=hint)
+            except ValuesUnknown as e:
+                values.append(UnknownArgument(exception=e, value=None))
+                continue
+            try:
+                values.append(get_argument(result, arg))
+            except (UnsuitableArgumentException, pyllco.InvalidValue) as e:
+                values.append(UnknownArgument(exception=e, value=result))
+        return values
+
     def __get__(self, obj, objtype=None):
         """Simulate bound descriptor access. However a systemcall acts like a
         static method so just return itself here."""
@@ -257,46 +583,17 @@ class SysCall:
         if _SyscallCategory.undefined in self.categories:
             raise NotImplementedError(f"{self._func.__name__} is only a stub.")
 
-        # avoid dependency conflicts, therefore import dynamically
-        from ara.steps import get_native_component
-        ValueAnalyzer = get_native_component("ValueAnalyzer")
-        ValuesUnknown = get_native_component("ValuesUnknown")
-
-        va = ValueAnalyzer(
-            graph,
-            current_step.tracer if hasattr(current_step, "tracer") else None)
+        va = get_value_analyzer(graph)
 
         # copy the original state
         new_state = state.copy()
 
-        fields = []
-        values = []
-
-        abb = new_state.cpus[cpu_id].abb
-        callpath = new_state.cpus[cpu_id].call_path
-
         # retrieve arguments
-        for idx, arg in enumerate(self._signature):
-            fields.append((arg.name, arg.ty))
-            hint = arg.hint
-            if arg.hint == _SigType.instance:
-                hint = _SigType.symbol
-            try:
-                result = va.get_argument_value(abb, 
-                                               idx + sig_offset,
-                                               callpath=callpath,
-                                               hint=hint)
-            except ValuesUnknown as e:
-                values.append(UnknownArgument(exception=e, value=None))
-                continue
-            try:
-                values.append(get_argument(result, arg))
-            except (UnsuitableArgumentException, pyllco.InvalidValue) as e:
-                values.append(UnknownArgument(exception=e, value=result))
+        values = self.get_argument_values(graph, new_state, cpu_id,
+                                          sig_offset=sig_offset)
 
-        # repack into dataclass
-        Arguments = dataclasses.make_dataclass('Arguments', fields)
-        args = Arguments(*values)
+        # repack into the argument record
+        args = self.make_arguments(values)
 
         # syscall specific handling
         new_states = self._func(graph, new_state, cpu_id, args, va)
@@ -389,30 +686,27 @@ def assign_id(instances, instance):
 
     Now Instance I4 with the maximal ID 1.3.1.1.1 should be added. The algorithm
     then assigns the ID 1.3.1.1 to I4 and 1.3.1.2 to I3.
-    """
-    other_ids = [(instances.vp.id[x].split('.'), x)
-                 for x in instances.vertices() if x != instance]
 
+    The IDs of all other instances are looked up in the IDTrie of the
+    instance graph, so the costs depend on the length of the ID only.
+    """
     target_id = instances.vp.obj[instance].get_maximal_id().split('.')
 
-    longest = 0
-    must_be_longer = None
-    for other_id, inst in other_ids:
-        prefix = os.path.commonprefix([target_id, other_id])
-        assert prefix != target_id, "Cannot find a unique id."
-        longest = max(longest, len(prefix))
-        if len(prefix) == len(other_id):
-            assert must_be_longer is None, "Something went wrong."
-            must_be_longer = inst
+    # the current ID of instance is not relevant
+    trie = instances.get_id_trie()
+    longest, prefixes = trie.find_prefixes(target_id, exclude=instance)
+    assert longest != len(target_id), "Cannot find a unique id."
+    assert len(prefixes) <= 1, "Something went wrong."
 
-    if must_be_longer:
+    if prefixes:
+        must_be_longer = instances.vertex(prefixes[0])
         other_id = instances.vp.obj[must_be_longer].get_maximal_id().split('.')
         prefix = os.path.commonprefix([target_id, other_id])
         assert prefix != target_id and prefix != other_id, "Cannot find a unique id."
         longest = len(prefix)
-        instances.vp.id[must_be_longer] = '.'.join(other_id[:longest + 1])
+        trie.set_id(must_be_longer, other_id[:longest + 1])
 
-    instances.vp.id[instance] = '.'.join(target_id[:longest + 1])
+    trie.set_id(instance, target_id[:longest + 1])
 
 
 def find_return_value(abb, callpath, va):
@@ -478,6 +772,11 @@ def add_self_edge(state, cpu_id, label, ty=None):
     connect_from_here(state, cpu_id, cpu.control_instance, label, ty)
 
 def find_instance_node(instances, obj):
+    if hasattr(instances, "get_node_by_obj"):
+        ins = instances.get_node_by_obj(obj)
+        if ins is not None:
+            return ins
+    # the index misses replaced objects without invalidation, search again
     for ins in instances.vertices():
         if instances.vp.obj[ins] is obj:
             return ins
@@ -6,11 +6,10 @@ import re
 from ara.graph.graph import Graph
 from ara.os.os_base import OSState
 from ara.steps.instance_graph_stats import MissingInteractions
-from ara.steps.util import current_step
 import pyllco
 from ara.graph import SyscallCategory, SigType
 
-from ..os_util import syscall, Arg
+from ..os_util import syscall, Arg, get_value_analyzer
 from .posix_utils import logger
 
 # All the Linux syscalls we want to detect with there ids.
@@ -49,8 +48,7 @@ def get_musl_syscall(syscall_wrapper_name: str, graph: Graph, state: OSState, cp
     this function returns None.
     """
     from ara.steps import get_native_component
-    ValueAnalyzer = get_native_component("ValueAnalyzer")
-    va = ValueAnalyzer(graph, current_step.tracer if hasattr(current_step, "tracer") else None)
+    va = get_value_analyzer(graph)
     ValuesUnknown = get_native_component("ValuesUnknown")
     new_state = state.copy()
     abb = new_state.cpus[cpu_id].abb
@@ -123,7 +123,6 @@ class POSIX(OSBase, _POSIXSyscalls, metaclass=_POSIXMetaClass):
     def _do_not_interpret(state: OSState, cpu_id: int):
         """Handling for the case that the current syscall should not be interpreted."""
         state = state.copy()
-        state.next_abbs = []
         set_next_abb(state, cpu_id)
         return state
 
@@ -524,7 +524,6 @@ class ZEPHYR(OSBase):
             return syscall(graph, state, cpu_id)
         else:
             state = state.copy()
-            state.next_abbs = []
             set_next_abb(state, cpu_id)
             return state
 
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Resource profiling of single step executions."""
+import cProfile
+import os
+import resource
+import sys
+import time
+
+# graphs of ara.graph.Graph whose sizes are recorded
+PROFILED_GRAPHS = ["cfg", "callgraph", "instances", "sstg", "mstg"]
+
+
+def get_graph_sizes(graph):
+    """Return the number of vertices and edges of all PROFILED_GRAPHS.
+
+    Graphs that do not exist (yet) are omitted.
+    """
+    sizes = {}
+    for name in PROFILED_GRAPHS:
+        g = getattr(graph, name, None)
+        if g is None:
+            continue
+        sizes[name] = {"vertices": g.num_vertices(), "edges": g.num_edges()}
+    return sizes
+
+
+def get_max_rss():
+    """Return the peak resident set size of the process in KiB."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        # macOS reports bytes
+        max_rss //= 1024
+    return max_rss
+
+
+class StepProfiler:
+    """Profile the resource usage of one step execution.
+
+    Usage:
+    profiler = StepProfiler(graph)
+    profiler.start()
+    step.run()
+    data = profiler.stop()
+
+    The returned dict is JSON serializable and contains:
+    cpu_time      -- consumed CPU time (user + system) in seconds
+    max_rss_delta -- growth of the peak RSS of the process in KiB
+    allocations   -- growth of the number of allocated Python memory blocks
+    graphs_before -- sizes of the graphs before the execution
+    graphs_after  -- sizes of the graphs after the execution
+    pstats        -- the pstats file (only if a cprofile_file is given)
+    """
+    def __init__(self, graph, cprofile_file=None):
+        """Create a profiler.
+
+        Arguments:
+        graph         -- the system graph
+        cprofile_file -- if given, additionally run cProfile and dump its
+                         statistics into this file
+        """
+        self._graph = graph
+        self._cprofile_file = cprofile_file
+        self._cprofile = None
+        self._data = None
+
+    def start(self):
+        """Start the profiling."""
+        self._data = {"graphs_before": get_graph_sizes(self._graph)}
+        self._max_rss = get_max_rss()
+        self._blocks = sys.getallocatedblocks()
+        if self._cprofile_file:
+            self._cprofile = cProfile.Profile()
+        self._cpu_time = time.process_time()
+        if self._cprofile:
+            self._cprofile.enable()
+
+    def stop(self):
+        """Stop the profiling and return the profile data."""
+        if self._cprofile:
+            self._cprofile.disable()
+        cpu_time = time.process_time() - self._cpu_time
+        data = self._data
+        data["cpu_time"] = cpu_time
+        data["max_rss_delta"] = get_max_rss() - self._max_rss
+        data["allocations"] = sys.getallocatedblocks() - self._blocks
+        data["graphs_after"] = get_graph_sizes(self._graph)
+        if self._cprofile:
+            os.makedirs(os.path.dirname(self._cprofile_file) or '.',
+                        exist_ok=True)
+            self._cprofile.dump_stats(self._cprofile_file)
+            data["pstats"] = self._cprofile_file
+            self._cprofile = None
+        self._data = None
+        return data
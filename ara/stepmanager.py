@@ -32,12 +32,16 @@ import traceback
 from ara.visualization.trace.trace_type import AlgorithmTrace
 from ara.visualization.trace.tracer_api.tracer import Tracer
 
+from .artifact_cache import (ArtifactCache, get_artifacts, get_graph_states,
+                             restore_artifacts)
+from .step_profiler import StepProfiler
 from .util import get_logger, get_logger_manager, LEVEL
 from .steps import provide_steps
 from .steps.step import Step
 from .graph import Graph
 
 from .steps.util import raise_and_error as rae, current_step
+from .os.os_util import reset_value_analyzer
 
 @dataclass
 class Config:
@@ -56,6 +60,7 @@ class StepEntry:
     runtime: float = None
     all_config: dict = None
     local_config: dict = None
+    profile: dict = None
 
 
 def get_uuid(step_name):
@@ -100,6 +105,7 @@ class StepManager:
         self._step_history = []
         self._chained_steps = defaultdict(set)
         self._last_step_trace = None
+        self._artifact_cache = None
 
     def clear_history(self):
         self._step_history = []
@@ -134,15 +140,25 @@ class StepManager:
     def _emit_runtime_stats(self, data, stats_format, stats_file, dump_prefix):
         """Output runtime statistics."""
         # formatting
-        data = [(x.name, str(x.uuid), x.runtime) for x in data]
+        # the profile is only appended, if it exists, so the format stays
+        # compatible to the plain runtime statistics
+        data = [(x.name, str(x.uuid), x.runtime) +
+                ((x.profile,) if x.profile is not None else ())
+                for x in data]
         if stats_format == 'json':
             stats_string = json.dumps(data)
         elif stats_format == 'human':
             sn = 'Step name'
             sn_len = max([len(x[0]) for x in data + [sn]])
             stats_string = f'{sn:<{sn_len}} UUID' + 33 * ' ' + 'Runtime\n'
-            for s_name, s_uuid, rtime in data:
-                stats_string += f'{s_name:<{sn_len}} {s_uuid} {rtime:0.2f}s\n'
+            for s_name, s_uuid, rtime, *profile in data:
+                stats_string += f'{s_name:<{sn_len}} {s_uuid} {rtime:0.2f}s'
+                if profile:
+                    prof = profile[0]
+                    stats_string += (f" (CPU {prof['cpu_time']:0.2f}s,"
+                                     f" peak RSS +{prof['max_rss_delta']}KiB,"
+                                     f" {prof['allocations']:+} blocks)")
+                stats_string += '\n'
         else:
             assert False, "This should be unreachable."
 
@@ -187,6 +203,49 @@ class StepManager:
                  "uuid": str(x.uuid),
                  "config": x.all_config} for x in step_history]
 
+    def _start_profiling(self, current):
+        """Return a started StepProfiler for the StepEntry current or None,
+        if step profiling is disabled."""
+        if not self._step_profile:
+            return None
+        cprofile_file = None
+        if self._step_cprofile:
+            dump_prefix = self._config.program['dump_prefix']
+            cprofile_file = dump_prefix.replace('{step_name}', current.name)
+            cprofile_file = cprofile_file.replace('{uuid}', str(current.uuid))
+            cprofile_file += 'pstats'
+        profiler = StepProfiler(self._graph, cprofile_file=cprofile_file)
+        profiler.start()
+        return profiler
+
+    def _run_or_restore(self, current):
+        """Run the step of a StepEntry or restore it from the artifact cache.
+
+        See ara.artifact_cache for the steps that can be cached.
+        """
+        cache = self._artifact_cache
+        if cache is None or not current.step.is_cacheable():
+            current.step.run()
+            return
+
+        os_name = None if self._graph.os is None else self._graph.os.get_name()
+        states = get_graph_states(self._graph)
+        key = cache.get_key(type(current.step), current.all_config, os_name,
+                            states)
+        artifacts = cache.load(key)
+        if artifacts is not None:
+            self._log.info(f"Restore {current.name} from the artifact cache.")
+            restore_artifacts(self._graph, current.name, states, artifacts)
+            return
+
+        current.step.run()
+        artifacts = get_artifacts(self._graph, current.name, states)
+        if artifacts is None:
+            self._log.warning(f"{current.name} is marked as cacheable but "
+                              "its graph modifications cannot be stored.")
+            return
+        cache.store(key, artifacts)
+
     def _execute_steps_with_deps(self, step_history):
         """
         Execute all steps from self._execute_chain including its dependencies.
@@ -228,13 +287,18 @@ class StepManager:
                     f"Execute {current.name} (UUID: {current.uuid})."
                 )
 
+                profiler = self._start_profiling(current)
                 if self._runtime_stats:
                     time_before = time.time()
 
-                current.step.run()
+                self._run_or_restore(current)
+                self._graph.invalidate_indexes()
+                reset_value_analyzer()
 
                 if self._runtime_stats:
                     time_after = time.time()
+                if profiler:
+                    current.profile = profiler.stop()
 
                 # runtime stats handling
                 if self._runtime_stats:
@@ -356,7 +420,15 @@ class StepManager:
         config = Config(program=program_config, extra=extra_config)
 
         # extract the step manager specific config
-        self._runtime_stats = program_config['runtime_stats']
+        self._step_profile = program_config.get('step_profile', False)
+        self._step_cprofile = program_config.get('step_cprofile', False)
+        self._runtime_stats = (program_config['runtime_stats'] or
+                               self._step_profile)
+        cache_dir = program_config.get('cache_dir', None)
+        if cache_dir:
+            self._artifact_cache = ArtifactCache(cache_dir)
+        else:
+            self._artifact_cache = None
 
         self._execute_chain = [self._make_step_entry(step, explicit=True)
                                for step in reversed(steps)]
@@ -374,6 +446,11 @@ class StepManager:
         self._config = None
         self._execute_chain = None
 
+        if self._artifact_cache is not None:
+            cache = self._artifact_cache
+            self._log.info(f"Artifact cache: {cache.hits} hits, "
+                           f"{cache.misses} misses, {cache.stores} stores.")
+
         if self._runtime_stats:
             self._emit_runtime_stats(self._step_history, runtime_stats_format,
                                      runtime_stats_file, dump_prefix)
@@ -436,13 +513,18 @@ class StepManager:
                     f"Execute {current.name} (UUID: {current.uuid})."
                 )
 
+                profiler = self._start_profiling(current)
                 if self._runtime_stats:
                     time_before = time.time()
 
                 current.step.run()
+                self._graph.invalidate_indexes()
+                reset_value_analyzer()
 
                 if self._runtime_stats:
                     time_after = time.time()
+                if profiler:
+                    current.profile = profiler.stop()
 
                 if current_traceable:
                     tracer = current.step.tracer
@@ -5,17 +5,17 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import copy
-import functools
 
-from collections import defaultdict
 from dataclasses import dataclass
 
-from graph_tool.topology import dominator_tree, label_out_component
+import numpy as np
 
-from ara.graph import SyscallCategory, CFGView, CFType
-from ara.util import get_null_logger, has_path, is_recursive
+from ara.graph import ABBType, NodeLevel, SyscallCategory
+from ara.util import get_null_logger, is_debug
 from ara.os.os_base import OSState, CrossCoreAction, ExecState
 
+from .worklist import create_worklist
+
 
 @dataclass
 class CFGContext:
@@ -38,6 +38,7 @@ class Visitor:
     HANDLE_INTERRUPTS = True
     SYSCALL_CATEGORIES = (SyscallCategory.every,)
     CFG_CONTEXT = CFGContext  # set to None if analysis should be deactivated
+    EXPLORATION = "bfs"  # exploration strategy, see worklist.STRATEGIES
 
     def get_initial_state(self):
         raise NotImplementedError
@@ -70,26 +71,99 @@ class Visitor:
         pass
 
 
+class CallPathTable:
+    """Intern call paths to small integer IDs.
+
+    The IDs are assigned with a trie over the call graph edges, so every
+    prefix of an interned call path gets an ID, too. ID 0 is the empty call
+    path. IDs are never reused, so they can index plain lists and bitsets.
+    """
+    ROOT = 0
+
+    def __init__(self, callgraph):
+        self._callgraph = callgraph
+        self._children = [{}]
+        self._parents = [-1]
+        self._ids = {}
+
+    def __len__(self):
+        return len(self._parents)
+
+    def extend(self, cp_id, edge):
+        """Return the ID of the call path cp_id extended with edge."""
+        key = self._callgraph.edge_index[edge]
+        children = self._children[cp_id]
+        child = children.get(key)
+        if child is None:
+            child = len(self._parents)
+            children[key] = child
+            self._children.append({})
+            self._parents.append(cp_id)
+        return child
+
+    def parent(self, cp_id):
+        """Return the ID of the call path without the last call site.
+
+        Returns -1 for the empty call path.
+        """
+        return self._parents[cp_id]
+
+    def get_id(self, call_path):
+        """Return the ID of a call path and intern it, if necessary."""
+        if not call_path:
+            return self.ROOT
+        cp_id = self._ids.get(call_path)
+        if cp_id is None:
+            cp_id = self.ROOT
+            for idx in range(len(call_path)):
+                cp_id = self.extend(cp_id, call_path[idx])
+            # call paths are mutable, so store an own copy
+            self._ids[copy.copy(call_path)] = cp_id
+        return cp_id
+
+
 class _SSERunner:
     def __init__(self, graph, os, logger, visitor):
         self._graph = graph
         self._cfg = graph.cfg
+        # the CFG is complete here, so speed up the topology queries
+        self._cfg.freeze_topology()
+        self._in_condition, self._usually_taken = \
+            self._cfg.get_condition_flags()
         self._icfg = graph.icfg
         self._lcfg = graph.lcfg
+        # the control flow is fixed during the traversal, so cache it per
+        # vertex index instead of querying the graph views in every step
+        num_vertices = self._cfg.num_vertices()
+        self._successors = [None] * num_vertices
+        self._return_abbs = [None] * num_vertices
+        self._is_exit = self._cfg.vp.is_exit.a.astype(bool).tolist()
+        self._abb_types = self._cfg.vp.type.a.tolist()
+        self._exec_states = {t: ExecState.from_abbtype(t)
+                             for t in (ABBType.computation, ABBType.call,
+                                       ABBType.syscall)}
         self._call_graph = graph.callgraph
         self._os = os
         self._log = logger
         self._visitor = visitor
-        # callpath aware counting of visits of an ABB
-        self._visited = defaultdict(lambda: defaultdict(lambda: 0))
+        # all call paths indexed by small IDs
+        self._call_paths = CallPathTable(self._call_graph)
+
+        # callpath aware tracking of visited ABBs, a bitset over dense ABB
+        # indices per call path ID
+        self._abb_index = [-1] * num_vertices
+        abbs = np.flatnonzero(self._cfg.vp.level.a == NodeLevel.abb)
+        for idx, abb in enumerate(abbs.tolist()):
+            self._abb_index[abb] = idx
+        self._visited = []
 
         # statistics
         self._max_call_depth = 0
 
-        # analysis flags
-        self._cond_func = {}
-        self._ut_func = {}
-        self._loop_func = {}
+        # analysis flags per call path ID
+        self._cond_func = bytearray()
+        self._ut_func = bytearray()
+        self._loop_func = bytearray()
 
         self._available_irqs = self._os.get_interrupts(graph.instances)
 
@@ -98,86 +172,77 @@ class _SSERunner:
         self._log.error(msg)
         raise error(msg)
 
-    def _extend_call_path(self, call_path, abb):
-        """Return a new call path extected with the current abb's callsite."""
+    def _reserve_call_path_ids(self):
+        """Make room for the data of all known call path IDs."""
+        missing = len(self._call_paths) - len(self._visited)
+        if missing > 0:
+            self._visited.extend([0] * missing)
+            self._cond_func.extend(bytes(missing))
+            self._ut_func.extend(bytes(missing))
+            self._loop_func.extend(bytes(missing))
+
+    def _get_call_path_id(self, cpu):
+        """Return the ID of the call path of cpu.
+
+        The ID is carried with the CPU for all states that the runner derives
+        itself. The states of the OS model do not have it, so their call path
+        is looked up once.
+        """
+        cp_id = getattr(cpu, "call_path_id", None)
+        if cp_id is None:
+            cp_id = self._call_paths.get_id(cpu.call_path)
+            self._reserve_call_path_ids()
+            cpu.call_path_id = cp_id
+        return cp_id
+
+    def _from_os(self, states):
+        """Drop the call path IDs of states that the OS model returns.
+
+        The OS model may switch or modify the call path of a CPU.
+        """
+        for state in states:
+            state.cpus.one().call_path_id = None
+        return states
+
+    def _extend_call_path(self, call_path, cp_id, abb):
+        """Return a new call path extected with the current abb's callsite
+        together with its ID."""
         edge = self._call_graph.get_edge_for_callsite(abb)
         if edge is None:
             abb_name = self._cfg.vp.name[abb]
             self._fail(f"Cannot find call path for ABB {abb_name}.")
         new_call_path = copy.copy(call_path)
         new_call_path.add_call_site(self._call_graph, edge)
-        return new_call_path
-
-    @functools.lru_cache(maxsize=32)
-    def _get_func_cfg(self, func):
-        """Get LCFG of function"""
-        abb = self._cfg.get_entry_abb(func)
-        lcfg = CFGView(self._cfg, efilt=self._cfg.ep.type.fa == CFType.lcf)
-        comp = label_out_component(lcfg, lcfg.vertex(abb))
-        return CFGView(lcfg, vfilt=comp)
-
-    @functools.lru_cache(maxsize=32)
-    def _create_dom_tree(self, func, ignore_endless_loops=False):
-        """Create a dominator tree of the local control flow for func."""
-        func_cfg = self._get_func_cfg(func)
-        entry = self._cfg.get_entry_abb(func)
-
-        # prepare LCFG, endless loops are filtered out and replaces by exit
-        # blocks
-        exit_map = func_cfg.vp.is_exit.copy(full=False)
-        keep_edge_map = func_cfg.new_ep("bool", val=True)
-
-        if not ignore_endless_loops:
-            loops = CFGView(func_cfg, vfilt=func_cfg.vp.is_exit_loop_head)
-            for v in loops.vertices():
-                v = func_cfg.vertex(v)
-                for e in v.in_edges():
-                    if has_path(func_cfg, v, e.source()):
-                        keep_edge_map[e] = False
-                        exit_map[e.source()] = True
-
-        patched_func_cfg = CFGView(func_cfg, efilt=keep_edge_map)
-
-        # dom tree creation
-        dom_tree = dominator_tree(patched_func_cfg,
-                                  patched_func_cfg.vertex(entry))
-        return dom_tree, CFGView(func_cfg, vfilt=exit_map)
-
-    def _dominates(self, dom_tree, abb_x, abb_y):
-        """Does abb_x dominate abb_y?"""
-        while abb_y:
-            if abb_x == abb_y:
-                return True
-            abb_y = dom_tree[abb_y]
-        return False
+        new_cp_id = self._call_paths.extend(cp_id, edge)
+        self._reserve_call_path_ids()
+        return new_call_path, new_cp_id
 
-    def _is_in_condition(self, abb, ignore_endless_loops=False):
+    def _is_in_condition(self, abb):
         """Is abb part of a condition?"""
-        func = self._graph.cfg.get_function(abb)
-        dom_tree, exit_abbs = self._create_dom_tree(func,
-                                                    ignore_endless_loops=ignore_endless_loops)
-        res = not all([self._dominates(dom_tree, abb, x)
-                      for x in exit_abbs.vertices()])
-        return res
+        return self._in_condition[abb]
 
     def _is_in_loop(self, abb):
         """Is abb part of a loop?"""
         return self._cfg.vp.part_of_loop[abb]
 
-    def _is_usually_taken(self, state, abb):
+    def _is_usually_taken(self, cp_id, abb):
         in_cond = self._is_in_condition(abb)
-        local_ut = (in_cond and not
-                    self._is_in_condition(abb, ignore_endless_loops=True))
-        extern_ut = self._ut_func.get(state.cpus.one().call_path, False)
+        local_ut = self._usually_taken[abb]
+        extern_ut = self._ut_func[cp_id]
         return local_ut or (extern_ut and not in_cond)
 
-    def _assign_context(self, state, new_state, abb):
+    def _assign_context(self, cp_id, new_state):
+        """Assign the analysis context to new_state.
+
+        cp_id is the call path ID of the state new_state is derived from.
+        """
         context = self._visitor.CFG_CONTEXT
         if context is not None:
             context = context()
 
-            abb = new_state.cpus.one().abb
-            call_path = new_state.cpus.one().call_path
+            new_cpu = new_state.cpus.one()
+            abb = new_cpu.abb
+            new_cp_id = new_cpu.call_path_id
 
             # check if in a recursive function and mark accordingly
             func = self._cfg.get_function(self._cfg.vertex(abb))
@@ -185,23 +250,41 @@ class _SSERunner:
             func_vert = self._call_graph.vertex(
                 self._cfg.vp.call_graph_link[func]
             )
-            context.recursive = is_recursive(self._call_graph, func_vert)
+            context.recursive = self._call_graph.is_recursive(func_vert)
 
-            context.branch = (self._cond_func.get(call_path, False) or
-                              self._is_in_condition(abb))
-            self._cond_func[call_path] = context.branch
+            context.branch = bool(self._cond_func[new_cp_id] or
+                                  self._is_in_condition(abb))
+            self._cond_func[new_cp_id] = context.branch
 
-            context.usually_taken = self._is_usually_taken(state, abb)
-            self._ut_func[call_path] = context.usually_taken
+            context.usually_taken = bool(self._is_usually_taken(cp_id, abb))
+            self._ut_func[new_cp_id] = context.usually_taken
 
-            context.loop = (self._loop_func.get(call_path, False) or
-                            self._is_in_loop(abb))
-            self._loop_func[call_path] = context.loop
+            context.loop = bool(self._loop_func[new_cp_id] or
+                                self._is_in_loop(abb))
+            self._loop_func[new_cp_id] = context.loop
 
             new_state.analysis_context = context
 
     def _get_exec(self, v):
-        return ExecState.from_abbtype(self._cfg.vp.type[v])
+        return self._exec_states[self._abb_types[int(v)]]
+
+    def _get_successors(self, abb):
+        """Return the ICFG successors of abb."""
+        idx = int(abb)
+        successors = self._successors[idx]
+        if successors is None:
+            successors = tuple(self._icfg.vertex(abb).out_neighbors())
+            self._successors[idx] = successors
+        return successors
+
+    def _get_return_abb(self, call):
+        """Return the ABB that follows the call ABB in the LCFG."""
+        idx = int(call)
+        return_abb = self._return_abbs[idx]
+        if return_abb is None:
+            return_abb = next(self._lcfg.vertex(call).out_neighbors())
+            self._return_abbs[idx] = return_abb
+        return return_abb
 
     def _trigger_irqs(self, state):
         # should we handle interrupts after all?
@@ -219,8 +302,8 @@ class _SSERunner:
                 if i_st is not None:
                     irq_states.append(i_st)
             except CrossCoreAction as cca:
-                self._log.debug(f"Cross core action for IRQ {irq} (CPUs: "
-                                f"{cca.cpu_ids}).")
+                self._log.debug("Cross core action for IRQ %s (CPUs: %s).",
+                                irq, cca.cpu_ids)
                 self._visitor.cross_core_action(state, cca.cpu_ids, irq=irq)
                 # end analysis on this path
                 return []
@@ -232,15 +315,19 @@ class _SSERunner:
 
         abb = cpu.abb
         call_path = cpu.call_path
+        cp_id = self._get_call_path_id(cpu)
 
         # check handling of already visited vertices
         if self._visitor.PREVENT_MULTIPLE_VISITS:
-            visit_count = self._visited[call_path][abb]
-            if visit_count > 0:
+            abb_bit = 1 << self._abb_index[int(abb)]
+            visited = self._visited[cp_id]
+            if visited & abb_bit:
                 return []
-            self._visited[call_path][abb] += 1
+            self._visited[cp_id] = visited | abb_bit
 
-        self._log.debug(f"Handle state {state}")
+        debug = is_debug(self._log)
+        if debug:
+            self._log.debug("Handle state %s", state)
 
         # statistics
         call_depth = len(call_path) if call_path else 0
@@ -251,66 +338,72 @@ class _SSERunner:
             # Trigger all interrupts. We are _not_ deciding over interarrival
             # times here. This should be done by the operation system model.
             self._log.debug("Handle idle. Trigger all interrupts.")
-            return self._trigger_irqs(state)
+            return self._from_os(self._trigger_irqs(state))
 
         elif cpu.exec_state == ExecState.syscall:
-            name = self._cfg.vp.name[abb]
-            syscall_name = self._cfg.get_syscall_name(abb)
-            self._log.debug(f"Handle syscall: {name} ({syscall_name})")
+            if debug:
+                self._log.debug("Handle syscall: %s (%s)",
+                                self._cfg.vp.name[abb],
+                                self._cfg.get_syscall_name(abb))
             try:
                 new_states = self._os.interpret(
                     self._graph, state, cpu.id,
                     categories=self._visitor.SYSCALL_CATEGORIES
                 )
-                return new_states
+                return self._from_os(new_states)
             except CrossCoreAction as cca:
-                self._log.debug(f"Got cross core action (CPUs: {cca.cpu_ids}).")
+                self._log.debug("Got cross core action (CPUs: %s).",
+                                cca.cpu_ids)
                 self._visitor.cross_core_action(state, cca.cpu_ids)
                 # end analysis on this path
                 return []
 
         elif cpu.exec_state == ExecState.call:
-            func = self._cfg.vp.name[self._cfg.get_function(abb)]
-            self._log.debug(f"Handle call: {self._icfg.vp.name[abb]} in {func}")
+            if debug:
+                self._log.debug("Handle call: %s in %s",
+                                self._cfg.vp.name[abb],
+                                self._cfg.vp.name[self._cfg.get_function(abb)])
             handled = False
             new_states = []
-            for n in self._icfg.vertex(abb).out_neighbors():
+            for n in self._get_successors(abb):
                 if self._visitor.is_bad_call_target(n):
                     continue
 
-                new_call_path = self._extend_call_path(call_path, abb)
+                new_call_path, new_cp_id = self._extend_call_path(call_path,
+                                                                  cp_id, abb)
 
                 # prevent recursion
                 if new_call_path.is_recursive():
                     self._log.debug("Reentry of recursive function. "
-                                    f"Callpath {new_call_path}")
+                                    "Callpath %s", new_call_path)
                     continue
 
                 new_state = state.copy()
                 new_state.cpus.one().abb = n
                 new_state.cpus.one().call_path = new_call_path
+                new_state.cpus.one().call_path_id = new_cp_id
                 new_state.cpus.one().exec_state = self._get_exec(n)
 
                 # SSE specific analysis context
-                self._assign_context(state, new_state, abb)
+                self._assign_context(cp_id, new_state)
                 new_states.append(new_state)
                 handled = True
             # if only recursive functions are found, handle the call like a
             # normal computation block
             if handled:
                 return new_states
-            self.log.debug("Found only edges that leads to recursion. "
+            self._log.debug("Found only edges that leads to recursion. "
                            "Handle as computation.")
 
         # exit handling
-        elif self._icfg.vp.is_exit[abb]:
-            self._log.debug(f"Handle exit: {self._icfg.vp.name[abb]}")
-            if self._icfg.vertex(abb).out_degree() > 0:
+        elif self._is_exit[int(abb)]:
+            if debug:
+                self._log.debug("Handle exit: %s", self._cfg.vp.name[abb])
+            if self._get_successors(abb):
                 new_state = state.copy()
                 callsite = new_state.cpus.one().call_path[-1]
                 call = self._call_graph.ep.callsite[callsite]
-                neighbors = self._lcfg.vertex(call).out_neighbors()
-                next_node = next(neighbors)
+                next_node = self._get_return_abb(call)
                 func = new_state.cfg.get_function(
                     new_state.cfg.vertex(next_node)
                 )
@@ -318,29 +411,36 @@ class _SSERunner:
                 func_vert = self._call_graph.vertex(
                     self._cfg.vp.call_graph_link[func]
                 )
-                new_state.recursive = is_recursive(self._call_graph, func_vert)
+                new_state.recursive = self._call_graph.is_recursive(func_vert)
 
                 new_state.cpus.one().abb = next_node
                 new_state.cpus.one().call_path.pop_back()
+                new_state.cpus.one().call_path_id = \
+                    self._call_paths.parent(cp_id)
                 new_state.cpus.one().exec_state = self._get_exec(next_node)
                 return [new_state]
             else:
                 # ISRs are able to exit, all other CFG not
-                return self._os.handle_exit(self._graph, state, cpu.id)
+                return self._from_os(
+                    self._os.handle_exit(self._graph, state, cpu.id)
+                )
 
         # computation block handling
         # all other paths before should have returned if necessary
-        self._log.debug(f"Handle computation: {self._icfg.vp.name[abb]}")
+        if debug:
+            self._log.debug("Handle computation: %s", self._cfg.vp.name[abb])
         new_states = []
-        for n in self._icfg.vertex(abb).out_neighbors():
-            self._log.debug(f"Neighbor {self._icfg.vp.name[n]}")
+        for n in self._get_successors(abb):
+            if debug:
+                self._log.debug("Neighbor %s", self._cfg.vp.name[n])
             new_state = state.copy()
             new_state.cpus.one().abb = n
+            new_state.cpus.one().call_path_id = cp_id
             new_state.cpus.one().exec_state = self._get_exec(n)
             new_states.append(new_state)
         # Trigger all interrupts. We are _not_ deciding over interarrival times
         # here. This should be done by the operation system model.
-        return new_states + self._trigger_irqs(state)
+        return new_states + self._from_os(self._trigger_irqs(state))
 
     def _system_semantic(self, state: OSState):
         # we can only handle a single core execution here
@@ -352,19 +452,20 @@ class _SSERunner:
         return new_states
 
     def run(self):
-        stack = [self._visitor.get_initial_state()]
+        stack = create_worklist(self._visitor.EXPLORATION)
+        stack.push(self._visitor.get_initial_state())
 
         counter = 0
         while stack:
-            self._log.debug(f"Local SSE: Round {counter:3d}, "
-                            f"Stack with {len(stack)} state(s)")
-            state = stack.pop(0)
+            self._log.debug("Local SSE: Round %3d, Stack with %d state(s)",
+                            counter, len(stack))
+            state = stack.pop()
             for new_state in self._system_semantic(state):
                 is_new = self._visitor.add_state(new_state)
                 self._visitor.add_transition(state, new_state)
 
                 if is_new:
-                    stack.append(new_state)
+                    stack.push(new_state)
 
             counter += 1
             self._visitor.next_step(counter)
@@ -278,6 +278,7 @@ class CreateABBs(Step):
             if abb is not None:
                 callgraph.ep.callsite[e] = abb
                 callgraph.ep.callsite_name[e] = name[abb]
+        callgraph.invalidate_indexes()
 
         if self.dump.get():
             self._step_manager.chain_step(
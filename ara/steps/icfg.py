@@ -28,6 +28,10 @@ class ICFG(Step):
         OUT = 1
         STD = 2
 
+    def is_cacheable(self):
+        # dumps are a side effect that cannot be restored
+        return not self.dump.get()
+
     def get_single_dependencies(self):
         return [{"name": "CallGraph", "entry_point": self.entry_point.get()},
                 "SystemRelevantFunctions"]
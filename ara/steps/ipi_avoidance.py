@@ -21,26 +21,26 @@ class IPIAvoidance(Step):
 
     def _is_ipi_needed(self, state):
         mstg = self._graph.mstg
-        st2sy = mstg.edge_type(MSTType.st2sy)
-        en2ex = mstg.edge_type(MSTType.en2ex)
         handled = set()
 
         ipi_needed = False
-        for sync in st2sy.vertex(state).out_neighbors():
+        for sync in mstg.get_out_neighbors(state, MSTType.st2sy):
             handled.add(sync)
-            exit_sync = single_check(en2ex.vertex(sync).out_neighbors())
+            exit_sync = single_check(mstg.get_out_neighbors(sync,
+                                                            MSTType.en2ex))
 
             cpu_id = None
             in_other = None
-            for e in st2sy.vertex(sync).in_edges():
+            for e in mstg.get_in_edges(sync, MSTType.st2sy):
                 in_other = e.source()
                 if in_other != state:
-                    cpu_id = st2sy.ep.cpu_id[e]
+                    cpu_id = mstg.ep.cpu_id[e]
                     break
 
             out_other = single_check([
-                e.target() for e in st2sy.vertex(exit_sync).out_edges()
-                if st2sy.ep.cpu_id[e] == cpu_id
+                e.target() for e in mstg.get_out_edges(exit_sync,
+                                                       MSTType.st2sy)
+                if mstg.ep.cpu_id[e] == cpu_id
             ])
 
             in_task = mstg.vp.state[in_other].cpus.one().control_instance
@@ -53,7 +53,6 @@ class IPIAvoidance(Step):
 
     def run(self):
         mstg = self._graph.mstg
-        st2sy = mstg.edge_type(MSTType.st2sy)
 
         if self._graph.os.get_name() != "AUTOSAR":
             self._fail("Currently this is only implemented for AUTOSAR")
@@ -66,8 +65,9 @@ class IPIAvoidance(Step):
             if sync in handled_sync:
                 continue
 
-            if st2sy.vertex(sync).in_degree() == 2:
-                for state in st2sy.vertex(sync).in_neighbors():
+            in_states = mstg.get_in_neighbors(sync, MSTType.st2sy)
+            if len(in_states) == 2:
+                for state in in_states:
                     syscall_name = mstg.get_syscall_name(state)
                     if syscall_name == "AUTOSAR_ActivateTask":
                         ipi_needed, handled = self._is_ipi_needed(state)
@@ -24,17 +24,15 @@ class LockElision(Step):
 
     def _may_spin(self, state, cpu_id):
         mstg = self._graph.mstg
-        st2sy = mstg.edge_type(MSTType.st2sy)
-        en2ex = mstg.edge_type(MSTType.en2ex)
         handled = set()
 
         may_spin = False
-        for sync in st2sy.vertex(state).out_neighbours():
+        for sync in mstg.get_out_neighbors(state, MSTType.st2sy):
             handled.add(sync)
 
-            for exit_sync in en2ex.vertex(sync).out_neighbors():
-                for e in st2sy.vertex(exit_sync).out_edges():
-                    if st2sy.ep.cpu_id[e] != cpu_id:
+            for exit_sync in mstg.get_out_neighbors(sync, MSTType.en2ex):
+                for e in mstg.get_out_edges(exit_sync, MSTType.st2sy):
+                    if mstg.ep.cpu_id[e] != cpu_id:
                         continue
                     dst = mstg.vertex(e.source())
                     spin = mstg.vp.state[dst].cpus[cpu_id].exec_state == ExecState.waiting
@@ -66,8 +64,8 @@ class LockElision(Step):
                             m2sy = mstg.edge_type(MSTType.m2sy)
                             for sync_point in m2sy.vertex(ms).in_neighbors():
                                 state = m2sy.vp.state[sync_point]
-                                if state and obj in state.context and get_status(state.context[obj]):
-                                    self._log.debug(f"Lock {name} spins in state {state_vert} ({state.context[obj]})")
+                                if state and obj in state.context and get_status(state.context.peek(obj)):
+                                    self._log.debug(f"Lock {name} spins in state {state_vert} ({state.context.peek(obj)})")
                                     lock_count[name] += 1
                             if len(list(m2sy.vertex(ms).out_neighbors())) == 0:
                                 deadlock[name] = deadlock.get(name, 0) + 1
@@ -18,6 +18,10 @@ class MarkLoopHead(Step):
                          help="system entry point",
                          ty=String())
 
+    def is_cacheable(self):
+        # dumps are a side effect that cannot be restored
+        return not self.dump.get()
+
     def get_single_dependencies(self):
         return [{"name": "CreateABBs", "entry_point": self.entry_point.get()}]
 
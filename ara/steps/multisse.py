@@ -9,7 +9,7 @@
 import copy
 import os.path
 
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from functools import reduce
 from itertools import chain, islice
@@ -21,20 +21,22 @@ from graph_tool.topology import all_paths, shortest_path
 
 from ara.graph import (MSTGraph, StateType, MSTType, CallPath, single_check,
                        edge_types)
-from ara.util import pairwise, has_path
+from ara.util import pairwise, has_path, is_debug, LazyStr, slotted
 from ara.os.os_base import (OSState, CPUList, CPU, IRQ, CrossCoreAction,
                             IRQContext, TaskStatus)
 from ara.os.os_util import set_next_abb
 
-from .option import Option, String, Bool
+from .option import Option, String, Bool, Choice
 from .step import Step
 from .util import open_with_dirs
 from .printer import mstg_to_dot, sp_mstg_to_dot
+from .state_table import StateTable
+from .worklist import STRATEGIES, create_worklist
 from .cfg_traversal import Visitor, run_sse
 from .multisse_helper.common import (CrossExecState, FakeEdge,
-                                     find_cross_syscalls)
+                                     ReachabilityCache, find_cross_syscalls)
 from .multisse_helper.constrained_sps import get_constrained_sps
-from .multisse_helper.equations import TimeRange
+from .multisse_helper.equations import TimeRange, SolverStats
 from .multisse_helper.pairing_partner_search import (
     search_for_pairing_partners, Range, TimeCandidateSet)
 from .multisse_helper.wcet_calculation import (TimingCalculator,
@@ -54,6 +56,7 @@ class NewEdgeReevaluation:
     root: graph_tool.Vertex  # the root sync point
 
 
+@slotted
 @dataclass
 class IRQCPU(CPU):
     irq: IRQ
@@ -160,6 +163,9 @@ class MSTG:
     # contains a vector[int]
     sync_point_map: graph_tool.VertexPropertyMap
 
+    # the reachable states of a metastate coming from an entry
+    reachability: ReachabilityCache = field(default_factory=ReachabilityCache)
+
 
 class MultiSSE(Step):
     """Run the MultiCore SSE."""
@@ -173,6 +179,13 @@ class MultiSSE(Step):
                         ty=Bool(),
                         default_value=False)
 
+    exploration = Option(name="exploration",
+                         help="Exploration strategy of the sync points and "
+                              "the local SSEs: breadth first, depth first, "
+                              "deepest call path first or lowest ABB first.",
+                         ty=Choice(*STRATEGIES.keys()),
+                         default_value="bfs")
+
     def get_single_dependencies(self):
         if self._graph.os is None:
             return ["SysFuncts"]
@@ -256,23 +269,23 @@ class MultiSSE(Step):
         to_assign_states = set()
         m_state = list()
         cross_syscalls = list()
+        mstg = self._mstg.g
 
         def _add_state(state):
-            h = hash(state)
-            v = self._state_map.get(h, None)
-            if v is not None:
-                return False, v
+            is_new, state_id = self._state_table.add(state)
+            if not is_new:
+                return False, self._state_table.get_value(state)
 
             cpu = state.cpus[cpu_id]
 
-            mstg = self._mstg.g
             v = mstg.add_vertex()
             mstg.vp.type[v] = StateType.state
             mstg.vp.state[v] = state
+            mstg.vp.state_id[v] = state_id
             mstg.vp.cpu_id[v] = cpu_id
-            self._log.debug(f"Add State {state.id} (node {int(v)})")
+            self._log.debug("Add State %s (node %s)", state_id, int(v))
 
-            self._state_map[h] = v
+            self._state_table.set_value(state_id, v)
 
             self._mstg.type_map[v] = cpu.exec_state
 
@@ -286,8 +299,7 @@ class MultiSSE(Step):
             return True, v
 
         def _get_m_state(v):
-            m2s = self._mstg.g.edge_type(MSTType.m2s)
-            for n in m2s.vertex(v).in_neighbors():
+            for n in mstg.get_in_neighbors(v, MSTType.m2s):
                 return n
             return None
 
@@ -295,6 +307,7 @@ class MultiSSE(Step):
             PREVENT_MULTIPLE_VISITS = False
             HANDLE_INTERRUPTS = False
             CFG_CONTEXT = None
+            EXPLORATION = self.exploration.get()
 
             @staticmethod
             def get_initial_state():
@@ -303,7 +316,7 @@ class MultiSSE(Step):
             @staticmethod
             def cross_core_action(state, cpu_ids, irq=None):
                 assert irq is None, "Wrong interrupt model."
-                v = self._state_map[hash(state)]
+                v = self._state_table[state]
                 self._mstg.cross_core_map[v] = cpu_ids
                 self._mstg.type_map[v] = CrossExecState.cross_syscall
                 cross_syscalls.append(v)
@@ -321,20 +334,25 @@ class MultiSSE(Step):
 
             @staticmethod
             def add_transition(source, target):
-                src = self._state_map[hash(source)]
-                tgt = self._state_map[hash(target)]
-                mstg = self._mstg.g
+                src = self._state_table[source]
+                tgt = self._state_table[target]
                 e = mstg.add_edge(src, tgt)
                 mstg.ep.type[e] = MSTType.s2s
                 mstg.ep.cpu_id[e] = cpu_id
+                # a new edge of an already assigned state changes the
+                # reachable states of its metastate
+                src_m_state = _get_m_state(src)
+                if src_m_state is not None:
+                    self._mstg.reachability.invalidate(src_m_state)
                 m_state_cand = _get_m_state(tgt)
                 if m_state_cand is None:
                     return
-                target = mstg.vp.state[tgt]
-                self._log.debug(
-                    "Found a transition to an already existing metastate "
-                    f"(State {source.id} (node {int(src)}) -> "
-                    f"State {target.id} (node {int(tgt)})).")
+                if is_debug(self._log):
+                    self._log.debug(
+                        "Found a transition to an already existing metastate "
+                        "(State %s (node %s) -> State %s (node %s)).",
+                        mstg.vp.state_id[src], int(src),
+                        mstg.vp.state_id[tgt], int(tgt))
                 if m_state and m_state[0] == m_state_cand:
                     return
                 assert (len(m_state) == 0
@@ -361,7 +379,7 @@ class MultiSSE(Step):
 
         # early return if state already evaluated
         if not is_new:
-            metastate = self._mstg.g.get_metastate(init_v)
+            metastate = mstg.get_metastate(init_v)
             return Metastate(
                 state=metastate,
                 cpu_id=cpu_id,
@@ -380,21 +398,20 @@ class MultiSSE(Step):
             # logger=self._log,
         )
 
-        mstg = self._mstg.g
-
         # create the metastate
         if len(m_state) == 0:
             is_new = True
             m_state = mstg.add_vertex()
             mstg.vp.type[m_state] = StateType.metastate
             mstg.vp.cpu_id[m_state] = cpu_id
-            self._log.debug(f"Add metastate {int(m_state)}")
+            self._log.debug("Add metastate %s", int(m_state))
         else:
             is_new = False
             m_state = m_state[0]
             cross_syscalls = find_cross_syscalls(self._mstg.g,
                                                  self._mstg.type_map,
-                                                 m_state, init_v)
+                                                 m_state, init_v,
+                                                 cache=self._mstg.reachability)
 
         for state in to_assign_states:
             e = mstg.add_edge(m_state, state)
@@ -464,7 +481,7 @@ class MultiSSE(Step):
 
         # calculate roots and the successors for each node
         root_sps = []
-        stack = [g.vertex(sp)]
+        stack = deque([g.vertex(sp)])
         succs = defaultdict(set)
         visited = g.new_vp("bool")
         # perform a BFS for the root cores.
@@ -473,7 +490,7 @@ class MultiSSE(Step):
         # branch but continue with other parts, see
         # https://archives.skewed.de/hyperkitty/list/graph-tool@skewed.de/thread/MDMNBV7XPQJKSHBTX2ARPKU6F7PQR4L2/
         while stack:
-            cur_sp = stack.pop(0)
+            cur_sp = stack.popleft()
             assert mstg.vp.type[cur_sp] == StateType.exit_sync
             if visited[cur_sp]:
                 continue
@@ -522,7 +539,8 @@ class MultiSSE(Step):
             paths = [[root]]
             i = 0
             while i < len(paths):
-                self._log.debug(f"Calculating root paths, index: {i}, paths: {len(paths)}")
+                self._log.debug("Calculating root paths, index: %s, paths: %s",
+                                i, len(paths))
                 assert len(paths) < 50000, "Too much"
                 path = paths[i]
                 last = path[-1]
@@ -715,8 +733,8 @@ class MultiSSE(Step):
         mstg.vp.type[new_sp] = StateType.entry_sync
         mstg.vp.state[new_sp] = multi_state
         self._log.debug(
-            f"Add new entry sync point {int(new_sp)} between "
-            f"{int(cross_state)} and {[int(x) for x in timed_states]}")
+            "Add new entry sync point %s between %s and %s", int(new_sp),
+            int(cross_state), LazyStr(lambda: [int(x) for x in timed_states]))
 
         # link SP with states
         cpu_ids = set()
@@ -773,7 +791,7 @@ class MultiSSE(Step):
         for new_state in new_states:
             exit_sp = mstg.add_vertex()
             mstg.vp.type[exit_sp] = StateType.exit_sync
-            self._log.debug(f"Add exit sync point {int(exit_sp)}")
+            self._log.debug("Add exit sync point %s", int(exit_sp))
 
             e = mstg.add_edge(sp, exit_sp)
             mstg.ep.type[e] = MSTType.en2ex
@@ -806,26 +824,23 @@ class MultiSSE(Step):
         mstg = self._mstg.g
 
         # mark as neighbor
-        e = mstg.edge(neighbor_sp, sp, add_missing=True)
+        e = mstg.edge(neighbor_sp, sp)
+        if e is None:
+            e = mstg.add_edge(neighbor_sp, sp)
         mstg.ep.type[e] = MSTType.sync_neighbor
 
         # sync edges
-        sy2sy = mstg.edge_type(MSTType.sy2sy)
-        for v in list(sy2sy.vertex(neighbor_sp).out_neighbors()):
-            self._log.debug(
-                f"Neighbor: Link sy2sy edge: {int(sp)} -> {int(v)}")
-            new_e = sy2sy.edge(mstg.vertex(sp),
-                               mstg.vertex(v),
-                               add_missing=True)
-            mstg.ep.type[new_e] = MSTType.sy2sy
-        follow_sync = mstg.edge_type(MSTType.follow_sync)
-        for v in list(follow_sync.vertex(neighbor_sp).out_neighbors()):
-            self._log.debug(
-                f"Neighbor: Link follow_sync edge: {int(sp)} -> {int(v)}")
-            new_e = follow_sync.edge(mstg.vertex(sp),
-                                     mstg.vertex(v),
-                                     add_missing=True)
-            mstg.ep.type[new_e] = MSTType.follow_sync
+        for msttype in (MSTType.sy2sy, MSTType.follow_sync):
+            existing = set(map(int, mstg.get_out_neighbors(sp, msttype)))
+            for v in mstg.get_out_neighbors(neighbor_sp, msttype):
+                if int(v) in existing:
+                    continue
+                self._log.debug("Neighbor: Link %s edge: %s -> %s",
+                                msttype.name, int(sp), int(v))
+                # add the edge via the MSTG, so its adjacency index stays
+                # valid
+                new_e = mstg.add_edge(sp, v)
+                mstg.ep.type[new_e] = msttype
 
     def _get_existing_sync_point(self, cross_state, timed_candidates):
         """Return an existing sync point.
@@ -863,18 +878,17 @@ class MultiSSE(Step):
                                "exists. While this does not lead to false "
                                "behavior it is probably unwanted.")
             else:
-                self._log.debug(
-                    f"Add sy2sy edge between {int(root)} and {int(sp)}.")
+                self._log.debug("Add sy2sy edge between %s and %s.",
+                                int(root), int(sp))
                 e = mstg.add_edge(root, sp)
                 mstg.ep.type[e] = MSTType.sy2sy
 
                 if exists:
                     # trigger a reevaluation
                     self._log.debug(
-                        f"New edge between {int(root_sp)} and {int(sp)}"
-                        " can lead to new syscall execution orders. "
-                        f"Trigger a reevaluation for {int(sp)}"
-                    )
+                        "New edge between %s and %s can lead to new syscall "
+                        "execution orders. Trigger a reevaluation for %s",
+                        int(root_sp), int(sp), int(sp))
                     en2ex = mstg.edge_type(MSTType.en2ex)
                     for exit_sp in en2ex.vertex(sp).out_neighbors():
                         reeval.add((exit_sp, NewEdgeReevaluation(root=root)))
@@ -882,9 +896,8 @@ class MultiSSE(Step):
         # link pred SPs
         follow_sync = mstg.edge_type(MSTType.follow_sync)
         for pred_sp in pred_sps:
-            self._log.debug(
-                f"Time link from {int(pred_sp.vertex)} to "
-                f"existing sync point {int(sp)}")
+            self._log.debug("Time link from %s to existing sync point %s",
+                            int(pred_sp.vertex), int(sp))
             if follow_sync.edge(pred_sp.vertex, sp):
                 self._log.warn("Analysis found an existing follow "
                                "sync relation.While this does not "
@@ -892,7 +905,7 @@ class MultiSSE(Step):
                                "probably unwanted.")
             else:
                 m2sy_edge = mstg.add_edge(pred_sp.vertex, sp)
-                self._log.debug(f"Add follow_sync edge: {str(m2sy_edge)}")
+                self._log.debug("Add follow_sync edge: %s", m2sy_edge)
                 mstg.ep.type[m2sy_edge] = MSTType.follow_sync
                 set_time(mstg.ep.bcet, m2sy_edge, pred_sp.range.up)
                 set_time(mstg.ep.wcet, m2sy_edge, pred_sp.range.to)
@@ -924,14 +937,18 @@ class MultiSSE(Step):
             cross_syscalls = find_cross_syscalls(self._mstg.g,
                                                  self._mstg.type_map,
                                                  metastate.state,
-                                                 metastate.entry)
+                                                 metastate.entry,
+                                                 cache=self._mstg.reachability)
         else:
             cross_syscalls = list(metastate.cross_syscalls)
 
-        sf = f", start from {int(start_from)}" if start_from else ''
         self._log.debug("Search for candidates for the cross syscalls: "
-                        f"{[int(x) for x in metastate.cross_syscalls]} "
-                        f"(last sync point {int(sp)}{sf})")
+                        "%s (last sync point %s%s)",
+                        LazyStr(lambda: [int(x)
+                                         for x in metastate.cross_syscalls]),
+                        int(sp),
+                        f", start from {int(start_from)}" if start_from
+                        else '')
         while cross_syscalls:
             cross_state = cross_syscalls.pop(0)
             it = self._find_pairing_partners(cross_state, sp,
@@ -941,15 +958,16 @@ class MultiSSE(Step):
             for cands in it:
                 root_sp = cands.root_sp
                 self._log.debug(
-                    f"Evaluating sync point between {int(cross_state)} and "
-                    f"{[int(x) for x in cands.candidates]}")
+                    "Evaluating sync point between %s and %s",
+                    int(cross_state),
+                    LazyStr(lambda: [int(x) for x in cands.candidates]))
                 existing_sp = self._get_existing_sync_point(
                     cross_state, cands.candidates)
                 if existing_sp:
                     self._log.debug(
-                        f"Link from {int(root_sp)} to existing sync point "
-                        f"{int(existing_sp)} ({int(cross_state)} with "
-                        f"{[int(x) for x in cands.candidates]}).")
+                        "Link from %s to existing sync point %s (%s with %s).",
+                        int(root_sp), int(existing_sp), int(cross_state),
+                        LazyStr(lambda: [int(x) for x in cands.candidates]))
                     reeval.update(self._link_sp_with_pred_sps(existing_sp, cands.root_sp, cands.pred_sps, exists=True))
                 else:
                     # first create the multicore state
@@ -1013,10 +1031,10 @@ class MultiSSE(Step):
                             on_stack[ran.range.start].append(core)
                         for i_sp, cores in on_stack.items():
                             self._log.debug(
-                                f"Current sync point {int(new_sp)} may add "
-                                "more pairing possibilities to the cross syscall "
-                                f"for CPUs {cores} (starting from {int(i_sp)})"
-                            )
+                                "Current sync point %s may add more pairing "
+                                "possibilities to the cross syscall for CPUs "
+                                "%s (starting from %s)", int(new_sp), cores,
+                                int(i_sp))
                             reeval.add((i_sp,
                                         NewNodeReevaluation(
                                             from_sp=new_sp,
@@ -1118,23 +1136,28 @@ class MultiSSE(Step):
             self._fail("Entry point must be given.")
         self._log.info(f"Analyzing entry point: '{entry_label}'")
 
+        # the CFG is complete here, so speed up the topology queries
+        self._graph.cfg.freeze_topology()
         self._mstg = self.create_mstg()
         mstg = self._mstg.g
 
+        SolverStats.reset()
         if self.with_times.get():
             self._timings = TimingCalculator(mstg, self._mstg.type_map,
                                              self._mstg.sync_point_map)
         else:
             self._timings = None
 
-        # map between a state (the hash of it) and the vertex in the MSTG
-        self._state_map = {}
+        # map between a state and the vertex in the MSTG
+        self._state_table = StateTable()
 
         # initialize stack
         sync_point = self._get_initial_state()
 
         # stack consisting of the current exit sync point
-        stack = [(sync_point, None)]
+        stack = create_worklist(self.exploration.get(),
+                                get_state=lambda x: mstg.vp.state[x[0]])
+        stack.push((sync_point, None))
         # store sync_point that need a reevaluation
         reevaluates = set()
 
@@ -1144,20 +1167,19 @@ class MultiSSE(Step):
             # sp: the current sync point
             # reeval_info: information if a reevaluation is needed, of type
             #              NewNodeReevaluation or NewEdgeReevaluation or None
-            sp, reeval_info = stack.pop(0)
+            sp, reeval_info = stack.pop()
             if (sp, reeval_info) in reevaluates:
                 # we don't need to analyse sync points that are reevaluated
                 # later on anyway.
-                self._log.debug(f"Skip {int(sp)}. It is already marked for "
-                                "reevaluation.")
+                self._log.debug("Skip %s. It is already marked for "
+                                "reevaluation.", int(sp))
                 continue
 
             # if counter == 8:
             #     self._fail("foo")
 
-            self._log.debug(
-                f"Round {counter:3d}, handle SP {int(sp)}. "
-                f"Stack with {len(stack)} state(s)")
+            self._log.debug("Round %3d, handle SP %s. Stack with %d state(s)",
+                            counter, int(sp), len(stack))
             if self.dump.get():
                 self._dump_mstg(extra=f"round.{counter:03d}")
             counter += 1
@@ -1193,8 +1215,7 @@ class MultiSSE(Step):
                             metastates.keys()):
                         self._log.debug(
                             "Metastate is not new. Found an equal common "
-                            f"sp {int(common_sp)}."
-                        )
+                            "sp %s.", int(common_sp))
                         self._link_neighbor_syncpoint(sp, common_sp)
                         neighbor_found_and_linked = True
 
@@ -1202,8 +1223,8 @@ class MultiSSE(Step):
             # metastates
             if not neighbor_found_and_linked:
                 for _, metastate in metastates.items():
-                    self._log.debug(
-                        f"Evaluate sync points of metastate {metastate}.")
+                    self._log.debug("Evaluate sync points of metastate %s.",
+                                    metastate)
                     to_stack, reeval = self._find_new_sps(sp, metastate)
                     stack.extend([(x, None) for x in to_stack])
                     reevaluates.update(reeval)
@@ -1241,5 +1262,11 @@ class MultiSSE(Step):
         step_data = {"rounds": counter,
                      "vertices": len(list(mstg.vertices())),
                      "edges": len(list(mstg.edges())),
+                     "equations_fast_path": SolverStats.fast_path,
+                     "equations_lp": SolverStats.lp,
+                     "equations_fast_path_rate": SolverStats.hit_rate(),
+                     "reachability_cache_hits": self._mstg.reachability.hits,
+                     "reachability_cache_misses":
+                         self._mstg.reachability.misses,
                      }
         self._set_step_data(step_data)
@@ -4,6 +4,9 @@
 
 import enum
 
+import numpy as np
+
+from collections import defaultdict
 from dataclasses import dataclass
 from itertools import product
 from graph_tool import Vertex, GraphView
@@ -133,45 +136,81 @@ def get_reachable_states(mstg, entry_state, exit_state=None):
     return GraphView(mstg, vfilt=outs)
 
 
-def _find_cross(mstg, type_map, metastate, entry, cross_type):
+class ReachabilityCache:
+    """Cache the states that are reachable from an entry in a metastate.
+
+    The cache is keyed by (metastate, entry) and stores the reachable states
+    only. The cross type filtering is done with every lookup, so changes of
+    the type map or new states of a metastate need no invalidation. If a
+    state of a metastate gets a new s2s edge, invalidate() must be called for
+    the metastate.
+
+    hits   -- lookups answered by the cache
+    misses -- lookups that needed a new reachability search
+    """
+    def __init__(self):
+        self._reachable = {}
+        self._keys = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, mstg, metastate, entry):
+        """Return the indices of all states reachable from entry."""
+        key = (int(metastate), int(entry))
+        reachable = self._reachable.get(key)
+        if reachable is not None:
+            self.hits += 1
+            return reachable
+        self.misses += 1
+        s2s = mstg.vertex_type(StateType.state)
+        oc = label_out_component(s2s, s2s.vertex(entry))
+        reachable = frozenset(np.flatnonzero(oc.a).tolist())
+        self._reachable[key] = reachable
+        self._keys[key[0]].add(key)
+        return reachable
+
+    def invalidate(self, metastate):
+        """Drop all entries of metastate."""
+        for key in self._keys.pop(int(metastate), ()):
+            del self._reachable[key]
+
+
+def _find_cross(mstg, type_map, metastate, entry, cross_type, cache=None):
     """Find all states of type cross_type coming for a given metastate
     coming from entry.
-    """
-    s2s = mstg.vertex_type(StateType.state)
 
+    If a ReachabilityCache is given, the reachable states are taken from
+    it.
+    """
     # the algorithm works a follows:
     # 1. Mark all reachable states coming from entry (within the same
     #    metastate).
     # 2. Filter this set for the given cross_type.
-    oc = label_out_component(s2s, s2s.vertex(entry))
-    oc[metastate] = True
-
-    type_filtered = GraphView(
-        mstg,
-        vfilt=(((mstg.vp.type.fa == StateType.metastate) +
-                (type_map.fa & cross_type) > 0)),
-    )
-    reachable_filtered = GraphView(type_filtered, vfilt=oc)
+    if cache is None:
+        cache = ReachabilityCache()
+    reachable = cache.get(mstg, metastate, entry)
 
-    return list(reachable_filtered.vertex(metastate).out_neighbors())
+    return [v for v in mstg.get_out_neighbors(metastate, MSTType.m2s)
+            if int(v) in reachable and type_map[v] & cross_type]
 
 
-def find_cross_syscalls(mstg, type_map, metastate, entry):
+def find_cross_syscalls(mstg, type_map, metastate, entry, cache=None):
     """Return all syscalls that possibly affect other cores."""
     return _find_cross(mstg, type_map, metastate, entry,
-                       CrossExecState.cross_syscall)
+                       CrossExecState.cross_syscall, cache=cache)
 
 
-def find_irqs(mstg, type_map, state, entry):
+def find_irqs(mstg, type_map, state, entry, cache=None):
     """Return all IRQs that possibly affect other cores."""
     ists = _find_cross(mstg, type_map, state, entry,
-                       CrossExecState.cross_irq | CrossExecState.irq)
-    st2sy = mstg.edge_type(MSTType.st2sy)
+                       CrossExecState.cross_irq | CrossExecState.irq,
+                       cache=cache)
     out = []
     for irq_state in ists:
         # every state must have be evaluated before
         # so check their irqs iterating the out edges
         irq = set([mstg.ep.irq[e]
-                   for e in st2sy.vertex(irq_state).out_edges()]) - {-1}
+                   for e in mstg.get_out_edges(irq_state,
+                                               MSTType.st2sy)]) - {-1}
         out.extend(product([irq_state], irq))
     return out
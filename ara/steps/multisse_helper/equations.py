@@ -10,8 +10,8 @@ import graph_tool
 import logging
 import math
 
-from copy import deepcopy
 from scipy.optimize import linprog
+from scipy.sparse import csr_matrix
 
 log = get_logger("MultiSSE.EQs", inherit=True)
 
@@ -34,6 +34,30 @@ def e_str(h_edge):
     return f"{h_edge}_hashed"
 
 
+class SolverStats:
+    """Statistics, how the queries to equation systems are answered.
+
+    fast_path -- queries answered by presolving or bound propagation (or by
+                 the cache)
+    lp        -- queries that needed to solve an LP
+    """
+    fast_path = 0
+    lp = 0
+
+    @staticmethod
+    def reset():
+        SolverStats.fast_path = 0
+        SolverStats.lp = 0
+
+    @staticmethod
+    def hit_rate():
+        """Return the ratio of queries answered by the fast path."""
+        total = SolverStats.fast_path + SolverStats.lp
+        if total == 0:
+            return 0.0
+        return SolverStats.fast_path / total
+
+
 def _to_var(idx):
     """Converts a number into a meaningful string."""
     alphabet = 'abcdefghijklmnopqrstuvwxyz'
@@ -42,13 +66,282 @@ def _to_var(idx):
     return alphabet[idx]
 
 
+class _UnionFind:
+    """Minimal union find structure over the numbers 0..n-1."""
+    def __init__(self, n):
+        self._parent = list(range(n))
+
+    def find(self, x):
+        parent = self._parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            # keep the smaller one as representative to be deterministic
+            if b < a:
+                a, b = b, a
+            self._parent[b] = a
+        return a
+
+
+class _Component:
+    """A set of variables that are connected by equations.
+
+    Stores the (lazily built) sparse LP of the component and the result of
+    the bound propagation.
+    """
+    # tolerance for floating point comparisons within the propagation
+    EPS = 1e-9
+
+    def __init__(self):
+        self.variables = []
+        self.equations = []
+        self._lp = None
+        # var -> (lower, upper) after the bound propagation
+        self.prop_bounds = None
+        # True or False, if decided by the propagation, None otherwise
+        self.feasible = None
+        # are prop_bounds the exact solution intervals
+        self.exact = False
+
+    def propagate(self, bounds):
+        """Tighten the bounds of all variables with interval propagation.
+
+        Every equation sum(c_i * x_i) = 0 restricts every of its variables
+        to the negated interval sum of all other variables.
+        The propagation is sound, so an empty interval means that the
+        component is not solvable. If the component is (Berge-)acyclic, i.e.
+        the equations form a tree, bound consistency implies global
+        consistency, so the propagated bounds are the exact solution
+        intervals (as an LP would find them).
+        """
+        eps = _Component.EPS
+        cur = dict([(var, bounds[var]) for var in self.variables])
+        incidences = sum([len(equation) for equation in self.equations])
+        acyclic = incidences == len(self.variables) + len(self.equations) - 1
+        max_rounds = 2 * len(self.equations) + 2 if acyclic else 8
+
+        for _ in range(max_rounds):
+            changed = False
+            for equation in self.equations:
+                for var, coeff in equation.items():
+                    # interval of sum(c_i * x_i) of all other variables
+                    s_lo, s_hi = 0, 0
+                    for o_var, o_coeff in equation.items():
+                        if o_var == var:
+                            continue
+                        lo, hi = cur[o_var]
+                        if o_coeff > 0:
+                            s_lo += o_coeff * lo
+                            s_hi += o_coeff * hi
+                        else:
+                            s_lo += o_coeff * hi
+                            s_hi += o_coeff * lo
+                    # coeff * x = -sum
+                    if coeff > 0:
+                        n_lo, n_hi = -s_hi / coeff, -s_lo / coeff
+                    else:
+                        n_lo, n_hi = -s_lo / coeff, -s_hi / coeff
+                    lo, hi = cur[var]
+                    if n_lo > lo + eps:
+                        lo = n_lo
+                        changed = True
+                    if n_hi < hi - eps:
+                        hi = n_hi
+                        changed = True
+                    if lo > hi + eps:
+                        self.feasible = False
+                        return
+                    cur[var] = (lo, hi)
+            if not changed:
+                self.prop_bounds = cur
+                if acyclic:
+                    self.feasible = True
+                    self.exact = True
+                return
+
+    def get_lp(self, bounds):
+        """Return the index map, the sparse A_eq, b_eq and the bounds."""
+        if self._lp is None:
+            idx = dict([(var, i) for i, var in enumerate(self.variables)])
+            rows, cols, data = [], [], []
+            for row, equation in enumerate(self.equations):
+                for var, coeff in equation.items():
+                    rows.append(row)
+                    cols.append(idx[var])
+                    data.append(coeff)
+            a_eq = csr_matrix((data, (rows, cols)),
+                              shape=(len(self.equations), len(idx)))
+            b_eq = [0] * len(self.equations)
+            lp_bounds = [(None if bounds[var][0] == math.inf else bounds[var][0],
+                          None if bounds[var][1] == math.inf else bounds[var][1])
+                         for var in self.variables]
+            self._lp = (idx, a_eq, b_eq, lp_bounds)
+        return self._lp
+
+
+class _Presolved:
+    """Presolved form of an equation system.
+
+    Equalities between two variables (a = b) are resolved by merging both
+    variables into one class (with the intersection of their bounds),
+    variables that must be zero are removed from all equations.
+    The remaining equations are split into independent components that are
+    solved separately. Variables that are not part of any remaining equation
+    are directly given by their (merged) bounds.
+
+    All results are cached.
+    """
+    def __init__(self, eqs):
+        self.classes = _UnionFind(eqs._highest)
+        self.feasible = True
+        # representative -> component
+        self.component = {}
+        self.components = []
+        # representative -> (up, to)
+        self.bounds = {}
+        # representative -> TimeRange
+        self.results = {}
+
+        zeros = set()
+        remaining = [dict(eq) for eq in eqs._equalities]
+        changed = True
+        while changed:
+            changed = False
+            zero_reps = set([self.classes.find(x) for x in zeros])
+            new_remaining = []
+            for equation in remaining:
+                merged = {}
+                for var, coeff in equation.items():
+                    rep = self.classes.find(var)
+                    if rep in zero_reps:
+                        continue
+                    merged[rep] = merged.get(rep, 0) + coeff
+                merged = dict([(x, c) for x, c in merged.items() if c != 0])
+                if len(merged) == 0:
+                    continue
+                if len(merged) == 1:
+                    zeros.add(next(iter(merged)))
+                    changed = True
+                    continue
+                if len(merged) == 2:
+                    (a, c_a), (b, c_b) = merged.items()
+                    if c_a == -c_b:
+                        self.classes.union(a, b)
+                        changed = True
+                        continue
+                new_remaining.append(merged)
+            remaining = new_remaining
+
+        for var, time in eqs._bounds.items():
+            rep = self.classes.find(var)
+            up, to = self.bounds.get(rep, (0, math.inf))
+            self.bounds[rep] = (max(up, time.up), min(to, time.to))
+        for rep in zero_reps:
+            up, to = self.bounds[rep]
+            self.bounds[rep] = (max(up, 0), min(to, 0))
+        for up, to in self.bounds.values():
+            if up > to:
+                self.feasible = False
+
+        # split the remaining equations into independent components
+        comps = _UnionFind(eqs._highest)
+        for equation in remaining:
+            first = next(iter(equation))
+            for var in equation:
+                comps.union(first, var)
+        by_root = {}
+        for equation in remaining:
+            root = comps.find(next(iter(equation)))
+            if root not in by_root:
+                by_root[root] = _Component()
+                self.components.append(by_root[root])
+            by_root[root].equations.append(equation)
+        for root, comp in by_root.items():
+            comp.variables = sorted(set([var for equation in comp.equations
+                                         for var in equation]))
+            for var in comp.variables:
+                self.component[var] = comp
+            if self.feasible:
+                comp.propagate(self.bounds)
+
+        self._solvable = None
+
+    def _solve(self, comp, rep, minimize):
+        idx, a_eq, b_eq, bounds = comp.get_lp(self.bounds)
+        c = [0] * len(idx)
+        if rep is not None:
+            c[idx[rep]] = 1 if minimize else -1
+        return linprog(c, A_eq=a_eq, b_eq=b_eq, bounds=bounds,
+                       method="highs")
+
+    def is_solvable(self):
+        if self._solvable is not None:
+            SolverStats.fast_path += 1
+            return self._solvable
+        if not self.feasible or any([comp.feasible is False
+                                     for comp in self.components]):
+            self._solvable = False
+        undecided = [comp for comp in self.components if comp.feasible is None]
+        if self._solvable is None and undecided:
+            SolverStats.lp += 1
+            self._solvable = all([self._solve(comp, None, True).success
+                                  for comp in undecided])
+        else:
+            SolverStats.fast_path += 1
+            if self._solvable is None:
+                self._solvable = True
+        return self._solvable
+
+    def get_interval(self, var):
+        rep = self.classes.find(var)
+        if rep in self.results:
+            SolverStats.fast_path += 1
+            return self.results[rep]
+        comp = self.component.get(rep, None)
+        if comp is None:
+            SolverStats.fast_path += 1
+            up, to = self.bounds[rep]
+            assert up <= to, "Equation system is not solvable."
+            ret = TimeRange(up=up, to=to)
+        elif comp.exact:
+            SolverStats.fast_path += 1
+            lo, hi = comp.prop_bounds[rep]
+            # same rounding as for the LP results
+            ret = TimeRange(up=int(lo + 0.5),
+                            to=math.inf if hi == math.inf else int(hi + 0.0001))
+        else:
+            SolverStats.lp += 1
+            min_res = self._solve(comp, rep, True)
+            assert min_res.success or min_res.status == 3
+            max_res = self._solve(comp, rep, False)
+            assert max_res.success or max_res.status == 3
+            # add 0.0001 because of floating point imprecision
+            ret = TimeRange(
+                up=math.inf if min_res.status == 3 else int(min_res.fun + 0.5),
+                to=math.inf if max_res.status == 3 else int(max_res.fun * -1 + 0.0001))
+        self.results[rep] = ret
+        return ret
+
+
 class Equations:
-    """Equation system for calculation of possible pairing partners."""
+    """Equation system for calculation of possible pairing partners.
+
+    The equations are stored sparse (as tuple of (variable, coefficient)
+    pairs) and are immutable, so copies of the system share them. Queries are
+    answered by a presolved form of the system (see _Presolved) that is built
+    once per modification and shared between unmodified copies.
+    """
     def __init__(self):
         self._bounds = {}
         self._equalities = []
         self._v_map = {}
         self._highest = 0
+        self._presolved = None
 
     def __repr__(self):
         return ("Equations("
@@ -65,9 +358,9 @@ class Equations:
 
         for eq in self._equalities:
             left = ' + '.join(
-                [_to_var(idx) for idx, elem in enumerate(eq) if elem == 1])
+                [_to_var(idx) for idx, elem in eq if elem == 1])
             right = ' + '.join(
-                [_to_var(idx) for idx, elem in enumerate(eq) if elem == -1])
+                [_to_var(idx) for idx, elem in eq if elem == -1])
 
             ret += f"\n  {left} = {right}"
         ret += f"\n  Mapping: {[(e_str(e), _to_var(idx)) for e, idx in self._v_map.items()]})"
@@ -81,67 +374,39 @@ class Equations:
                 assert False, f"Edge {edge} does not exist."
             self._v_map[hedge] = self._highest
             self._highest += 1
-            for formula in self._equalities:
-                formula.append(0)
         return self._v_map[hedge]
 
-    def _solve_for_var(self, var, minimize=True):
-        def inf(num):
-            return None if num == math.inf else num
-
-        c = (self._highest) * [0]
-        c[var] = int(minimize) * 2 - 1
-        b_eq = len(self._equalities) * [0]
-        bounds = []
-        for i in range(self._highest):
-            assert i in self._bounds
-            time = self._bounds[i]
-            bounds.append((inf(time.up), inf(time.to)))
-        return linprog(c, A_eq=self._equalities, b_eq=b_eq, bounds=bounds)
+    def _get_presolved(self):
+        if self._presolved is None:
+            self._presolved = _Presolved(self)
+        return self._presolved
 
     def solvable(self):
         """Return, if the equation system has a solution."""
         if self._highest == 0:
             return True
-        res = self._solve_for_var(0)
-        log.debug("The equation system is solvable: %d, %s", res.success, self)
-        return res.success
-
-    def _has_equation(self, var):
-        for equation in self._equalities:
-            if equation[var] != 0:
-                return True
-        return False
-
-    def _get_minimum(self, var):
-        """Return the minimum time for a specific var."""
-        min_res = self._solve_for_var(var)
-        assert min_res.success or min_res.status == 3
-        if min_res.status == 3:
-            return math.inf
-        else:
-            return int(min_res.fun + 0.5)
-
-    def _get_maximum(self, var):
-        """Return the minimum time for a specific var."""
-        max_res = self._solve_for_var(var, minimize=False)
-        assert max_res.success or max_res.status == 3
-        # add 0.000001 because of floating point imprecision
-        if max_res.status == 3:
-            return math.inf
-        else:
-            return int(max_res.fun * -1 + 0.0001)
+        ret = self._get_presolved().is_solvable()
+        log.debug("The equation system is solvable: %d, %s", ret, self)
+        return ret
 
     def get_interval_for(self, edge):
         """Return the solution interval for a specific edge."""
-        var = self._get_variable(edge, must_exist=True)
-        if self._has_equation(var):
-            ret = TimeRange(up=self._get_minimum(var),
-                            to=self._get_maximum(var))
-        else:
-            ret = self._bounds[var]
-        log.debug("Solution of the equation system for %s: %s\n%s",
-                  edge, ret, self)
+        return self.get_intervals_for([edge])[0]
+
+    def get_intervals_for(self, edges):
+        """Return the solution intervals for all given edges.
+
+        This is faster than single calls of get_interval_for, since the LP of
+        every affected component is built only once.
+        """
+        presolved = self._get_presolved()
+        ret = []
+        for edge in edges:
+            var = self._get_variable(edge, must_exist=True)
+            interval = presolved.get_interval(var)
+            log.debug("Solution of the equation system for %s: %s\n%s",
+                      edge, interval, self)
+            ret.append(interval)
         return ret
 
     def add_range(self, edge: graph_tool.Edge, time: TimeRange):
@@ -153,6 +418,7 @@ class Equations:
         assert time.to >= time.up and time.up >= 0
         var = self._get_variable(edge)
         self._bounds[var] = time
+        self._presolved = None
 
     def add_equality(self, left_edges, right_edges):
         """Store that the left_edges sum must be equal to the right_edges sum.
@@ -162,17 +428,20 @@ class Equations:
         le = set(left_edges)
         re = set(right_edges)
         common = le & re
-        formula = (self._highest) * [0]
+        formula = {}
         for left in (le - common):
             formula[self._get_variable(left, must_exist=True)] = 1
         for right in (re - common):
             formula[self._get_variable(right, must_exist=True)] = -1
-        self._equalities.append(formula)
+        self._equalities.append(tuple(sorted(formula.items())))
+        self._presolved = None
 
     def copy(self):
         cp = Equations()
-        cp._bounds = deepcopy(self._bounds)
-        cp._equalities = deepcopy(self._equalities)
-        cp._v_map = dict([(e, idx) for e, idx in self._v_map.items()])
+        # bounds (TimeRange) and equations are immutable
+        cp._bounds = self._bounds.copy()
+        cp._equalities = self._equalities.copy()
+        cp._v_map = self._v_map.copy()
         cp._highest = self._highest
+        cp._presolved = self._presolved
         return cp
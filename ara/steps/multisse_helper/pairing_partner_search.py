@@ -124,7 +124,7 @@ class _PairingPartnerSearch:
 
         # do the actual work
         self._log.debug(f"Evaluating cross state {int(self._cross_state)} "
-                        f"(State {self._mstg.vp.state[self._cross_state].id}) "
+                        f"(State {self._mstg.vp.state_id[self._cross_state]}) "
                         f" with path {[int(x) for x in self._path]}"
                         " from the root SP to the last SP.")
 
@@ -541,8 +541,7 @@ class _PairingPartnerSearch:
 
     def _is_evaluated(self, state):
         """Check, if a state is already evaluated."""
-        st2sy = self._mstg.edge_type(MSTType.st2sy)
-        return st2sy.vertex(state).out_degree() > 0
+        return len(self._mstg.get_out_edges(state, MSTType.st2sy)) > 0
 
     def _get_pred_times(self, sps, state_list: StateList, sp, cross_state):
         """Assign a new follow up time for all nodes in state_list.
@@ -562,12 +561,12 @@ class _PairingPartnerSearch:
         # Assign the last state that belongs to each SP
         for state in state_list.states:
             loose_ends[int(state.root)] = int(state.state)
-        timed_sps = []
-        # find a time for all SPs
-        for other_sp in sps:
-            time = state_list.eqs.get_interval_for(
-                FakeEdge(src=other_sp, tgt=loose_ends[int(other_sp)]))
-            timed_sps.append(TimedVertex(vertex=other_sp, range=time))
+        # find a time for all SPs (in one batch)
+        times = state_list.eqs.get_intervals_for(
+            [FakeEdge(src=other_sp, tgt=loose_ends[int(other_sp)])
+             for other_sp in sps])
+        timed_sps = [TimedVertex(vertex=other_sp, range=time)
+                     for other_sp, time in zip(sps, times)]
         return frozenset(timed_sps)
 
     def _get_edges_to(self, sp):
@@ -83,7 +83,6 @@ class TimingCalculator():
         call chain and allows to break hard.
         """
         mstg = self._mstg
-        st2sy = mstg.edge_type(MSTType.st2sy)
         follow_sync_tmp = mstg.edge_type(MSTType.follow_sync, MSTType.en2ex)
         # graph that consists of follow_sync, en2ex edges and SPs only
         follow_sync = vertex_types(follow_sync_tmp, mstg.vp.type,
@@ -179,7 +178,8 @@ class TimingCalculator():
             # interrupted state. Multiple of them are not supported, if it is
             # exactly one, the follow edge between to common SP and the exit
             # SP specifies the correct time.
-            state_sps = set(st2sy.vertex(interrupted_state).in_neighbors())
+            state_sps = set(mstg.get_in_neighbors(interrupted_state,
+                                                  MSTType.st2sy))
             sp_sps = set(follow_sync.vertex(entry_sp).in_neighbors())
             common_sps = state_sps & sp_sps
 
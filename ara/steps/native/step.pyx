@@ -116,6 +116,18 @@ cdef class SuperStep:
         """Do the actual action of the step."""
         raise NotImplementedError()
 
+    def is_cacheable(self) -> bool:
+        """Determines, if the step supports the artifact cache.
+
+        A cacheable step must be deterministic with respect to the CFG, the
+        callgraph, the OS and its config. Its only effects must be new edges
+        and modified plain properties of the CFG and the callgraph and
+        optionally its step data. See ara.artifact_cache for the details.
+
+        The function is called after the config is applied.
+        """
+        return False
+
     def get_side_data(self):
         """Provide arbitrary side data, that are not belonging to the system
         graph. This can be used to make analysis based on the system graph and
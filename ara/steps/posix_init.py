@@ -88,6 +88,7 @@ class POSIXInit(Step):
             handle_static_soc(instances, v, reset_file_and_line=False)
             assign_id(instances, v)
             va.assign_system_object(static_inst_info["symbol"], instance)
+        instances.invalidate_indexes()
 
         # Generate POSIX Main Thread
         cfg = self._graph.cfg
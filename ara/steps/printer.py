@@ -42,7 +42,10 @@ def _sstg_state_as_dot(sstg, state_vert):
 
     obj = sstg.vp.state[state_vert]
     cfg = obj.cfg
-    label = f"State {obj.id}"
+    if "state_id" in sstg.vp and sstg.vp.state_id[state_vert] >= 0:
+        label = f"State {sstg.vp.state_id[state_vert]}"
+    else:
+        label = f"State {obj.id}"
     cpu = obj.cpus.one()
     if cpu.control_instance:
         instance = obj.instances.vp.label[obj.instances.vertex(cpu.control_instance)]
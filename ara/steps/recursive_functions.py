@@ -8,9 +8,6 @@ from ara.graph import Graph, CFGView
 from .option import Option, Bool
 from .step import Step
 
-from graph_tool.topology import all_paths
-import numpy
-
 from ara.util import LEVEL
 
 class RecursiveFunctions(Step):
@@ -20,6 +17,10 @@ class RecursiveFunctions(Step):
                                 help="Disables this step. True means: this step does nothing.",
                                 ty=Bool())
 
+    def is_cacheable(self):
+        # dumps are a side effect that cannot be restored
+        return not self.dump.get()
+
     def get_single_dependencies(self):
         return ["CallGraph"]
 
@@ -32,24 +33,10 @@ class RecursiveFunctions(Step):
         #####
 
         callgraph = self._graph.callgraph
-        cfg = self._graph.cfg
-
-        to_visit = callgraph.new_vp("bool")
-        to_visit.a = numpy.invert(callgraph.vp.recursive.a)
-        callgraph.set_vertex_filter(to_visit)
-
-        for v in callgraph.vertices():
-            path_nodes = []
-            for path in all_paths(callgraph, v, v):
-                for circuit_node in path:
-                    cn = callgraph.vertex(circuit_node)
-                    callgraph.vp.recursive[cn] = True
-                    path_nodes.append(cn)
-            for n in path_nodes + [v]:
-                to_visit[n] = False
-            callgraph.set_vertex_filter(to_visit)
-
-        callgraph.clear_filters()
+
+        # a function is recursive, if it is part of a cycle in the callgraph
+        recursive = callgraph.get_reachability().get_recursive()
+        callgraph.vp.recursive.a |= recursive
 
         if self.dump.get():
             self._step_manager.chain_step(
@@ -9,23 +9,22 @@
 
 from ara.graph import ABBType, CFGView, SyscallCategory, CallPath, Callgraph, CFType
 from dataclasses import dataclass
-from ara.util import dominates, has_path, is_recursive
 from ara.visualization.trace.tracer_api.tracer import GraphNode, GraphPath, init_fast_trace
 from ara.graph.mix import GraphType, ARA_ENTRY_POINT
 
 from .step import Step
-from .option import Option, String
+from .option import Option, String, Choice, Integer
 
 
 from ara.os.os_base import CPU, ExecState
+from ara.os.os_util import UnknownArgument
+from ara.util import LazyStr
 
 from graph_tool import GraphView
-from graph_tool.topology import all_paths, dominator_tree, label_out_component
+from graph_tool.topology import all_paths
 from graph_tool.util import find_vertex
 from itertools import chain
 
-import functools
-
 
 @dataclass
 class SIAContext:
@@ -49,6 +48,25 @@ class SIAContext:
 
 class FlatAnalysis(Step):
     """Flat Analysis"""
+    call_paths = Option(name="call_paths",
+                        help="How to handle the call paths from the entry "
+                             "point to a system call. 'all' interprets the "
+                             "system call once per call path. 'summarize' "
+                             "interprets it only once per distinct analysis "
+                             "context (branch, loop, usually_taken, recursive "
+                             "and the retrieved argument values). System "
+                             "calls that create instances are never "
+                             "summarized, so every call path still gets its "
+                             "own instance. Summarized call paths still count "
+                             "for the quantity of their interactions.",
+                        ty=Choice("all", "summarize"),
+                        default_value="all")
+    max_call_paths = Option(name="max_call_paths",
+                            help="Maximum number of call paths that are "
+                                 "enumerated per system call and entry point "
+                                 "(0 means unlimited).",
+                            ty=Integer(),
+                            default_value=0)
 
     def get_single_dependencies(self):
         raise NotImplementedError
@@ -58,78 +76,21 @@ class FlatAnalysis(Step):
             return ['SysFuncts']
         return self._graph.os.get_special_steps()
 
-    @functools.lru_cache(maxsize=32)
-    def _get_func_cfg(self, func):
-        """Get LCFG of function"""
-        abb = self._graph.cfg.get_entry_abb(func)
-        comp = label_out_component(self._graph.lcfg,
-                                   self._graph.lcfg.vertex(abb))
-        return CFGView(self._graph.lcfg, vfilt=comp)
-
-    @functools.lru_cache(maxsize=32)
-    def _create_dom_tree(self, func, respect_endless_loops=True):
-        """Create a dominator tree of the local control flow for func.
+    def _is_in_condition(self, abb):
+        """Is abb part of a condition?
 
-        Return the dominator tree and a list of exit blocks for the function.
+        See CFG.get_condition_flags.
         """
-        func_cfg = self._get_func_cfg(func)
-        entry = self._graph.cfg.get_entry_abb(func)
-
-        # prepare LCFG:
-        # If respect_endless_loops is set (the default), endless loops are
-        # considered as possible exit blocks.
-        # This is done by detecting and replacing them with real exit blocks.
-        exit_map = func_cfg.vp.is_exit.copy(full=False)
-        keep_edge_map = func_cfg.new_ep("bool", val=True)
-
-        if respect_endless_loops:
-            # iterate all exit loops (AKA endless loops)
-            loops = CFGView(func_cfg, vfilt=func_cfg.vp.is_exit_loop_head)
-            for loop_head in loops.vertices():
-                loop_head = func_cfg.vertex(loop_head)
-                for e in loop_head.in_edges():
-                    loop_end = e.source()
-                    if loop_head == loop_end or \
-                       has_path(func_cfg, loop_head, loop_end):
-                        # if edge that is a part of the loop
-                        # drop it
-                        keep_edge_map[e] = False
-                        exit_map[loop_end] = True
-
-        patched_func_cfg = CFGView(func_cfg, efilt=keep_edge_map)
-
-        # dom tree creation
-        dom_tree = dominator_tree(patched_func_cfg,
-                                  patched_func_cfg.vertex(entry))
-        return dom_tree, CFGView(func_cfg, vfilt=exit_map)
-
-    def _is_in_condition(self, abb, respect_endless_loops=True):
-        """Is abb part of a condition?"""
-        # Algorithm: abb must not dominate all exits
-        func = self._graph.cfg.get_function(abb)
-        dom_tree, exit_abbs = self._create_dom_tree(
-            func, respect_endless_loops=respect_endless_loops)
-        return not all(
-            [dominates(dom_tree, abb, x) for x in exit_abbs.vertices()])
+        in_condition, _ = self._graph.cfg.get_condition_flags()
+        return in_condition[abb]
 
     def _is_usually_taken(self, abb):
         """Is this abb usually taken?
 
-        Usually taken means that the abb is part of a branch, where all sibling
-        branches end in an endless loop.
-
-        Consider this example:
-         1o
-          |`--.
-          |   v
-         2o  3o <.
-              |  |
-              v  |
-             4o--´
-        The node 2 is usually taken.
+        See CFG.get_condition_flags.
         """
-        return (self._is_in_condition(abb, respect_endless_loops=True) and
-                not self._is_in_condition(abb, respect_endless_loops=False))
+        _, usually_taken = self._graph.cfg.get_condition_flags()
+        return usually_taken[abb]
 
     def _is_chained_analysis(self):
         return self.get_name() in {
@@ -144,6 +105,42 @@ class FlatAnalysis(Step):
                                           (analysis_context.usually_taken
                                            and not self._is_in_condition(abb)))
 
+    def _get_context_key(self, syscall_func, state, cpu_id):
+        """Return a hashable key of the analysis context of cpu_id.
+
+        Two call paths with the same key lead to the same interpretation of
+        the system call apart from the call path itself.
+        """
+        context = state.cpus[cpu_id].analysis_context
+        args = []
+        for value in syscall_func.get_argument_values(self._graph, state,
+                                                      cpu_id):
+            if isinstance(value, UnknownArgument):
+                value = (type(value.exception).__name__, repr(value.value))
+            else:
+                try:
+                    hash(value)
+                except TypeError:
+                    value = repr(value)
+            args.append(value)
+        return (context.branch, context.loop, context.usually_taken,
+                context.recursive, tuple(args))
+
+    def _get_quantity_delta(self, old_quantities):
+        """Return the interactions that changed since old_quantities.
+
+        The result is a tuple of the edge indices and their quantity delta.
+        Edges that are new since then count with their whole quantity.
+        """
+        delta = self._graph.instances.ep.quantity.a.copy()
+        delta[:len(old_quantities)] -= old_quantities
+        changed = delta.nonzero()[0]
+        return changed, delta[changed]
+
+    def _add_quantities(self, edges, delta):
+        """Add delta to the quantity of the interactions edges."""
+        self._graph.instances.ep.quantity.a[edges] += delta
+
     def _dump_names(self):
         raise NotImplementedError
 
@@ -166,6 +163,9 @@ class FlatAnalysis(Step):
         instances = self._graph.instances
 
         entry_points = self._get_entry_points()
+        summarize = self.call_paths.get() == "summarize"
+        max_call_paths = self.max_call_paths.get()
+        merged_paths = 0
 
         if self.trace_algorithm.get():
             init_fast_trace(self)
@@ -181,6 +181,11 @@ class FlatAnalysis(Step):
             cfg_function = cfg.get_function(syscall)
             function = callg.vertex(cfg.vp.call_graph_link[cfg_function])
 
+            # an interpretation of a create syscall results in an instance
+            # with its call path, so it cannot be shared between call paths
+            mergeable = (summarize and SyscallCategory.create not in
+                         os.syscalls[sys_name].categories)
+
             if self.trace_algorithm.get():
                 abb = cfg.vertex(syscall)
                 syscall_node = [
@@ -211,13 +216,25 @@ class FlatAnalysis(Step):
                     loop = False
                     cpu_id = 0
 
-                self._log.debug(f"Handle {sys_name} with entry_point "
-                                f"{callg.vp.function_name[entry_point]}")
+                self._log.debug("Handle %s with entry_point %s", sys_name,
+                                LazyStr(lambda: callg.vp.function_name[
+                                    entry_point]))
 
                 path_to_self = [[]] if entry_point == function else []
-                for path in chain(
-                        all_paths(rev_cg, function, entry_point, edges=True),
-                        path_to_self):
+                paths = chain(all_paths(rev_cg, function, entry_point,
+                                        edges=True),
+                              path_to_self)
+                # key: analysis context, value: its interaction delta
+                seen_contexts = {}
+                for path_count, path in enumerate(paths):
+                    if path_count == max_call_paths > 0:
+                        self._log.warning(
+                            f"{sys_name} in "
+                            f"{callg.vp.function_name[function]} has more "
+                            f"than {max_call_paths} call paths from "
+                            f"{callg.vp.function_name[entry_point]}. "
+                            "Ignoring the remaining ones.")
+                        break
 
                     if self.trace_algorithm.get():
                         self.tracer.entity_is_looking_at(
@@ -246,19 +263,39 @@ class FlatAnalysis(Step):
                         fake_cpu.call_path.add_call_site(callg, edge)
                         self._set_flags(fake_cpu.analysis_context, abb)
                         if not fake_cpu.analysis_context.recursive:
-                            fake_cpu.analysis_context.recursive = is_recursive(callg, edge.target())
+                            fake_cpu.analysis_context.recursive = callg.is_recursive(edge.target())
 
                     self._set_flags(fake_cpu.analysis_context, syscall)
                     if not fake_cpu.analysis_context.recursive:
-                        fake_cpu.analysis_context.recursive = is_recursive(callg, function)
+                        fake_cpu.analysis_context.recursive = callg.is_recursive(function)
+
+                    if mergeable:
+                        # the retrieved argument values are reused by the
+                        # interpretation (see ValueAnalyzerSession)
+                        key = self._get_context_key(os.syscalls[sys_name],
+                                                    state, cpu_id)
+                        if key in seen_contexts:
+                            # the interpretation would connect the same
+                            # instances again
+                            self._add_quantities(*seen_contexts[key])
+                            merged_paths += 1
+                            continue
+                        old_quantities = instances.ep.quantity.a.copy()
 
                     os.interpret(self._graph,
                                  state,
                                  0,
                                  categories=self._search_category())
 
+                    if mergeable:
+                        seen_contexts[key] = self._get_quantity_delta(
+                            old_quantities)
+
+        if summarize:
+            self._log.info(f"Summarized {merged_paths} call paths with an "
+                           "already analyzed context.")
+
         self._trigger_new_steps()
-        self._log.debug(is_recursive.cache_info())
 
         if self.dump.get():
             spec, graph_name = self._dump_names()
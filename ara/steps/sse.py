@@ -9,14 +9,16 @@
 
 """Container for SSE."""
 from .step import Step
-from .option import Option, String, Bool
+from .option import Option, String, Bool, Choice
 from .cfg_traversal import Visitor, run_sse
 
 import graph_tool
 import os
 
 from .printer import sstg_to_dot
+from .state_table import StateTable
 from .util import open_with_dirs
+from .worklist import STRATEGIES
 
 
 class SSE(Step):
@@ -29,6 +31,13 @@ class SSE(Step):
                            ty=Bool(),
                            default_value=False)
 
+    exploration = Option(name="exploration",
+                         help="Exploration strategy of the state space: "
+                              "breadth first, depth first, deepest call path "
+                              "first or lowest ABB first.",
+                         ty=Choice(*STRATEGIES.keys()),
+                         default_value="bfs")
+
     def get_single_dependencies(self):
         return ["SysFuncts"] + self._graph.os.get_special_steps()
 
@@ -49,6 +58,7 @@ class SSE(Step):
         sstg = graph_tool.Graph()
         sstg.graph_properties["start"] = sstg.new_gp("long")
         sstg.vertex_properties["state"] = sstg.new_vp("object")
+        sstg.vertex_properties["state_id"] = sstg.new_vp("int64_t", val=-1)
         sstg.edge_properties["syscall"] = sstg.new_ep("object")
         sstg.edge_properties["bcet"] = sstg.new_ep("int64_t", val=-1)
         sstg.edge_properties["wcet"] = sstg.new_ep("int64_t", val=-1)
@@ -59,7 +69,8 @@ class SSE(Step):
 
         first = sstg.add_vertex()
         sstg.vp.state[first] = os_state
-        state_map = {hash(os_state): first}
+        state_table = StateTable()
+        _, sstg.vp.state_id[first] = state_table.add(os_state, first)
         sstg.gp.start = int(first)
 
         assert len(os_state.cpus) == 1, "SSE does not support more than one CPU."
@@ -67,6 +78,7 @@ class SSE(Step):
         class SSEVisitor(Visitor):
             PREVENT_MULTIPLE_VISITS = False
             CFG_CONTEXT = None
+            EXPLORATION = self.exploration.get()
 
             @staticmethod
             def get_initial_state():
@@ -82,17 +94,17 @@ class SSE(Step):
 
             @staticmethod
             def add_state(new_state):
-                s_hash = hash(new_state)
-                if s_hash not in state_map:
+                is_new, state_id = state_table.add(new_state)
+                if is_new:
                     s = sstg.add_vertex()
                     sstg.vp.state[s] = new_state
-                    state_map[s_hash] = s
-                    return True
-                return False
+                    sstg.vp.state_id[s] = state_id
+                    state_table.set_value(state_id, s)
+                return is_new
 
             @staticmethod
             def add_transition(source, target):
-                sstg.add_edge(state_map[hash(source)], state_map[hash(target)])
+                sstg.add_edge(state_table[source], state_table[target])
 
             @staticmethod
             def next_step(counter):
@@ -106,6 +118,9 @@ class SSE(Step):
             logger=self._log,
         )
 
+        self._log.debug(f"SSE found {len(state_table)} states "
+                        f"({state_table.collisions} hash collisions).")
+
         # store result
         self._graph.sstg = sstg
 
@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Interning of OS states for the state space explorations (SSE, MultiSSE)."""
+
+
+class StateTable:
+    """Exact interning table for OS states.
+
+    Every state that is added gets a compact integer ID (starting at 0).
+    The hash of a state is calculated exactly once, when it enters the table.
+    States with the same hash are compared structurally, so hash collisions
+    do not lead to merged states.
+
+    Additionally, an arbitrary value (typically the graph vertex of the state)
+    can be attached to every state.
+
+    ATTENTION: States must not be modified after they are added to the table.
+    """
+    def __init__(self):
+        # hash -> list of IDs with this hash
+        self._buckets = {}
+        # ID -> state
+        self._states = []
+        # ID -> attached value
+        self._values = []
+        # id(state) -> ID, only for interned objects (they are kept alive by
+        # self._states, so the object id is stable)
+        self._by_obj = {}
+        # the last non interned state that was looked up together with its ID
+        self._last = (None, None)
+
+        # statistics
+        self.collisions = 0
+
+    def _find(self, state, s_hash):
+        for state_id in self._buckets.get(s_hash, ()):
+            if self._states[state_id] == state:
+                return state_id
+        return None
+
+    def lookup(self, state):
+        """Return the ID of state or None, if the state is unknown."""
+        state_id = self._by_obj.get(id(state), None)
+        if state_id is not None:
+            return state_id
+        last_state, last_id = self._last
+        if last_state is state:
+            return last_id
+        state_id = self._find(state, hash(state))
+        if state_id is not None:
+            self._last = (state, state_id)
+        return state_id
+
+    def add(self, state, value=None):
+        """Add state to the table.
+
+        Return a tuple of a boolean that indicates if the state is new and the
+        ID of the state. If the state already exists, the value is not
+        modified.
+        """
+        state_id = self._by_obj.get(id(state), None)
+        if state_id is not None:
+            return False, state_id
+
+        s_hash = hash(state)
+        bucket = self._buckets.setdefault(s_hash, [])
+        state_id = self._find(state, s_hash)
+        if state_id is not None:
+            self._last = (state, state_id)
+            return False, state_id
+
+        if bucket:
+            self.collisions += 1
+        state_id = len(self._states)
+        bucket.append(state_id)
+        self._states.append(state)
+        self._values.append(value)
+        self._by_obj[id(state)] = state_id
+        return True, state_id
+
+    def get_state(self, state_id):
+        """Return the state that belongs to state_id."""
+        return self._states[state_id]
+
+    def get_value(self, state):
+        """Return the attached value of state or None if state is unknown."""
+        state_id = self.lookup(state)
+        if state_id is None:
+            return None
+        return self._values[state_id]
+
+    def set_value(self, state_id, value):
+        """Attach value to the state with state_id."""
+        self._values[state_id] = value
+
+    def __getitem__(self, state):
+        """Return the attached value of state.
+
+        Raise a KeyError if the state is unknown.
+        """
+        state_id = self.lookup(state)
+        if state_id is None:
+            raise KeyError(state)
+        return self._values[state_id]
+
+    def __contains__(self, state):
+        return self.lookup(state) is not None
+
+    def __len__(self):
+        return len(self._states)
@@ -24,6 +24,10 @@ class SystemRelevantFunctions(Step):
                         ty=Bool(),
                         default_value=False)
 
+    def is_cacheable(self):
+        # dumps are a side effect that cannot be restored
+        return not self.dump.get()
+
     def get_single_dependencies(self):
         return ["CallGraph", "SysFuncts"]
 
@@ -25,6 +25,9 @@ class Wrapper:
     def set_wrappee(self, wrappee):
         self.__wrappee = wrappee
 
+    def get_wrappee(self):
+        return getattr(self, "_Wrapper__wrappee", None)
+
     def __getattr__(self, attr):
         return getattr(self.__wrappee, attr)
 current_step = Wrapper()
@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Worklists and exploration strategies for the state space explorations."""
+
+import heapq
+
+from collections import deque
+
+
+class Worklist:
+    """Container for all elements that still need to be processed.
+
+    All operations are in (amortized) constant time, apart from the priority
+    worklist, where they are logarithmic.
+    """
+    def push(self, elem):
+        raise NotImplementedError
+
+    def pop(self):
+        raise NotImplementedError
+
+    def extend(self, elems):
+        for elem in elems:
+            self.push(elem)
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __bool__(self):
+        return len(self) != 0
+
+
+class FIFOWorklist(Worklist):
+    """Breadth first exploration."""
+    def __init__(self):
+        self._elems = deque()
+
+    def push(self, elem):
+        self._elems.append(elem)
+
+    def pop(self):
+        return self._elems.popleft()
+
+    def extend(self, elems):
+        self._elems.extend(elems)
+
+    def __len__(self):
+        return len(self._elems)
+
+
+class LIFOWorklist(FIFOWorklist):
+    """Depth first exploration."""
+    def pop(self):
+        return self._elems.pop()
+
+
+class PriorityWorklist(Worklist):
+    """Explore the element with the lowest key first.
+
+    Elements with the same key are explored in insertion order.
+    """
+    def __init__(self, key):
+        self._key = key
+        self._elems = []
+        self._counter = 0
+
+    def push(self, elem):
+        heapq.heappush(self._elems, (self._key(elem), self._counter, elem))
+        self._counter += 1
+
+    def pop(self):
+        return heapq.heappop(self._elems)[2]
+
+    def __len__(self):
+        return len(self._elems)
+
+
+def _call_depth_key(state):
+    """Prefer states with a deeper call path."""
+    return -max((len(cpu.call_path) for cpu in state.cpus
+                 if cpu.call_path is not None), default=0)
+
+
+def _abb_key(state):
+    """Prefer states with a lower ABB ID."""
+    return min((int(cpu.abb) for cpu in state.cpus if cpu.abb is not None),
+               default=-1)
+
+
+# strategy name -> key function for OSStates (None for non priority based)
+STRATEGIES = {
+    "bfs": None,
+    "dfs": None,
+    "call_depth": _call_depth_key,
+    "abb": _abb_key,
+}
+
+
+def create_worklist(strategy="bfs", get_state=None):
+    """Create a worklist for the given exploration strategy.
+
+    Arguments:
+    strategy  -- One of STRATEGIES:
+                 "bfs":        breadth first search (lowest peak memory for
+                               wide state spaces)
+                 "dfs":        depth first search
+                 "call_depth": states with the deepest call path first
+                 "abb":        states with the lowest ABB ID first
+    get_state -- Function that maps a worklist element to its OSState. Only
+                 needed for the priority based strategies, if the elements
+                 are not OSStates itself.
+    """
+    if strategy == "bfs":
+        return FIFOWorklist()
+    if strategy == "dfs":
+        return LIFOWorklist()
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown exploration strategy {strategy}. "
+                         f"Valid are: {', '.join(STRATEGIES)}")
+    key = STRATEGIES[strategy]
+    if get_state is not None:
+        state_key = key
+        key = lambda elem: state_key(get_state(elem))
+    return PriorityWorklist(key)
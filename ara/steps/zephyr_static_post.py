@@ -91,6 +91,7 @@ class ZephyrStaticPost(Step):
             # them to be unique
             ZEPHYR.id_count[self._graph.instances.vp.id[instance]] = 1
             self._graph.instances.vp.obj[instance] = inst
+        self._graph.instances.invalidate_indexes()
 
         # If there is a main, also add a thread for that.
         # Also, there is no matching abb to give to the vertex
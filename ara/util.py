@@ -13,6 +13,7 @@
 import sys
 import logging
 import re
+import dataclasses
 import functools
 
 from inspect import Parameter, signature
@@ -205,6 +206,33 @@ def init_logging(level=logging.DEBUG, max_stepname=20, root_name='root',
     return logger_manager.get_logger(root_name, level)
 
 
+class LazyStr:
+    """Defer the computation of a log message argument.
+
+    The Python logging framework formats a message only if the log level is
+    enabled, but f-strings and their arguments are always evaluated. Use
+    %-style arguments instead and wrap costly ones into LazyStr:
+
+    self._log.debug("Handle %s in %s", state,
+                    LazyStr(lambda: cfg.vp.name[cfg.get_function(abb)]))
+    """
+    __slots__ = ("_func",)
+
+    def __init__(self, func):
+        self._func = func
+
+    def __str__(self):
+        return str(self._func())
+
+
+def is_debug(logger):
+    """Is logger enabled for debug messages?
+
+    Use this to guard whole blocks that only compute debug output.
+    """
+    return logger.isEnabledFor(logging.DEBUG)
+
+
 def dominates(dom_tree, x, y):
     """Does node x dominate node y?"""
     while y:
@@ -215,9 +243,14 @@ def dominates(dom_tree, x, y):
 
 
 def has_path(graph, source, target):
-    """Is there a path from source to target?"""
+    """Is there a path from source to target?
+
+    For graphs with a reachability index (the Callgraph), the index is used.
+    """
     if source == target:
         return True
+    if hasattr(graph, "get_reachability"):
+        return graph.get_reachability().has_path(source, target)
     _, elist = shortest_path(graph, graph.vertex(source), graph.vertex(target))
     return len(elist) > 0
 
@@ -316,9 +349,62 @@ def debug_log(original_function=None, *,
     return _decorate
 
 
-@lru_cache(maxsize=1024)
+def slotted(original_class=None, *, extra=()):
+    """Decorator that adds __slots__ to a dataclass.
+
+    Instances of the decorated class have no __dict__, which saves a lot of
+    memory for classes with many instances. Apply it on top of @dataclass.
+    This is a backport of dataclass(slots=True) (Python >= 3.10).
+
+    Arguments:
+    extra -- additional attributes that are not dataclass fields
+    """
+
+    def _decorate(cls):
+        inherited = set()
+        for base in cls.__mro__[1:]:
+            inherited.update(getattr(base, "__slots__", ()))
+        names = [f.name for f in dataclasses.fields(cls)] + list(extra)
+        cls_dict = dict(cls.__dict__)
+        cls_dict["__slots__"] = tuple(x for x in names if x not in inherited)
+        # field defaults are part of __init__ and would shadow the slots
+        for name in names:
+            cls_dict.pop(name, None)
+        cls_dict.pop("__dict__", None)
+        cls_dict.pop("__weakref__", None)
+        new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+        new_cls.__qualname__ = cls.__qualname__
+
+        # let the argument-less super() refer to the new class
+        for value in cls_dict.values():
+            value = getattr(value, "__func__", value)
+            for cell in getattr(value, "__closure__", None) or ():
+                try:
+                    if cell.cell_contents is cls:
+                        cell.cell_contents = new_cls
+                except ValueError:
+                    # empty cell
+                    pass
+        return new_cls
+
+    if original_class:
+        return _decorate(original_class)
+
+    return _decorate
+
+
 def is_recursive(callgraph, v):
-    """Checks if given vertex v is in a loop => v is recursive"""
+    """Checks if given vertex v is in a loop => v is recursive
+
+    For graphs with a reachability index (the Callgraph), the index is used.
+    """
+    if hasattr(callgraph, "get_reachability"):
+        return callgraph.get_reachability().is_recursive(v)
+    return _is_recursive(callgraph, v)
+
+
+@lru_cache(maxsize=1024)
+def _is_recursive(callgraph, v):
     v = callgraph.vertex(v)
     for neighbor in v.out_neighbors():
         vert, edge = shortest_path(callgraph, neighbor, v)
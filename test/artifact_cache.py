@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.artifact_cache import (ArtifactCache, get_artifacts,
+                                get_graph_states, restore_artifacts)
+from ara.graph import ABBType, CFType, Graph, NodeLevel
+
+import tempfile
+
+
+class FakeStep:
+    """Stands in for a step class (only get_name and the file are used)."""
+    @classmethod
+    def get_name(cls):
+        return "FakeStep"
+
+
+def build_graph(llvm_offset):
+    """Build a small graph. llvm_offset simulates changing pointers."""
+    graph = Graph()
+    cfg = graph.cfg
+    func = cfg.add_vertex()
+    cfg.vp.name[func] = "main"
+    cfg.vp.level[func] = NodeLevel.function
+    abbs = []
+    for i in range(3):
+        abb = cfg.add_vertex()
+        cfg.vp.name[abb] = f"abb{i}"
+        cfg.vp.level[abb] = NodeLevel.abb
+        cfg.vp.type[abb] = ABBType.call
+        cfg.vp.llvm_link[abb] = llvm_offset + i
+        e = cfg.add_edge(func, abb)
+        cfg.ep.type[e] = CFType.f2a
+        abbs.append(abb)
+    for src, tgt in zip(abbs, abbs[1:]):
+        e = cfg.add_edge(src, tgt)
+        cfg.ep.type[e] = CFType.lcf
+    cg_node = graph.callgraph.add_vertex()
+    graph.callgraph.vp.function_name[cg_node] = "main"
+    return graph
+
+
+def fake_run(graph):
+    """Modify the graph like a pure Python step."""
+    cfg = graph.cfg
+    for src, tgt in ((1, 2), (2, 3)):
+        e = cfg.add_edge(src, tgt)
+        cfg.ep.type[e] = CFType.icf
+    cfg.vp.type[cfg.vertex(3)] = ABBType.computation
+    cfg.vp.loop_head[cfg.vertex(2)] = True
+    cfg.vp.name[cfg.vertex(1)] = "renamed"
+    cfg.ep.back_edge[cfg.edge(2, 3)] = True
+    graph.callgraph.vp.recursive[graph.callgraph.vertex(0)] = True
+    graph.step_data["FakeStep"] = {"links": 2}
+
+
+def main():
+    """Test the graph state key and the replay of the artifact cache."""
+    init_test_logging()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ArtifactCache(cache_dir)
+
+        # first run: execute and store
+        graph = build_graph(llvm_offset=1000)
+        states = get_graph_states(graph)
+        key = cache.get_key(FakeStep, {"entry_point": "main"}, "FreeRTOS",
+                            states)
+        assert cache.load(key) is None
+        fake_run(graph)
+        artifacts = get_artifacts(graph, "FakeStep", states)
+        assert artifacts is not None
+        cache.store(key, artifacts)
+
+        # second run: other pointers, but the same key
+        graph2 = build_graph(llvm_offset=5000)
+        states2 = get_graph_states(graph2)
+        cache2 = ArtifactCache(cache_dir)
+        key2 = cache2.get_key(FakeStep,
+                              {"entry_point": "main", "log_level": "debug"},
+                              "FreeRTOS", states2)
+        assert key2 == key
+        restore_artifacts(graph2, "FakeStep", states2, cache2.load(key2))
+        assert (cache.misses, cache.stores, cache2.hits) == (1, 1, 1)
+
+        # the restored graph equals the executed one
+        for name, state in get_graph_states(graph).items():
+            assert get_graph_states(graph2)[name].get_hash() == \
+                state.get_hash(), name
+        assert graph2.cfg.vp.name[graph2.cfg.vertex(1)] == "renamed"
+        assert graph2.cfg.ep.back_edge[graph2.cfg.edge(2, 3)]
+        assert graph2.cfg.vp.llvm_link[graph2.cfg.vertex(1)] == 5000
+        assert graph2.step_data["FakeStep"] == {"links": 2}
+
+        # the key respects the config, the OS and the graph state
+        assert cache.get_key(FakeStep, {"entry_point": "other"}, "FreeRTOS",
+                             states2) != key
+        assert cache.get_key(FakeStep, {"entry_point": "main"}, "AUTOSAR",
+                             states2) != key
+        graph3 = build_graph(llvm_offset=1000)
+        graph3.cfg.vp.name[graph3.cfg.vertex(2)] = "other"
+        assert cache.get_key(FakeStep, {"entry_point": "main"}, "FreeRTOS",
+                             get_graph_states(graph3)) != key
+
+        # new vertices and changed pointers cannot be replayed
+        states3 = get_graph_states(graph3)
+        graph3.cfg.add_vertex()
+        assert get_artifacts(graph3, "FakeStep", states3) is None
+        graph4 = build_graph(llvm_offset=1000)
+        states4 = get_graph_states(graph4)
+        graph4.cfg.vp.llvm_link[graph4.cfg.vertex(1)] = 42
+        assert get_artifacts(graph4, "FakeStep", states4) is None
+
+
+if __name__ == '__main__':
+    main()
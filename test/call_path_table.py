@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import CFG, Callgraph
+from ara.steps.cfg_traversal import CallPathTable
+
+
+def main():
+    """Test the interning of call paths."""
+    init_test_logging()
+    callgraph = Callgraph(CFG())
+    main_v, a, b = [callgraph.add_vertex() for _ in range(3)]
+    e_ma = callgraph.add_edge(main_v, a)
+    e_ab = callgraph.add_edge(a, b)
+    e_mb = callgraph.add_edge(main_v, b)
+
+    table = CallPathTable(callgraph)
+    assert table.get_id(()) == CallPathTable.ROOT
+    assert table.get_id(None) == CallPathTable.ROOT
+
+    # call paths only need to be sequences of call graph edges
+    mab = table.get_id((e_ma, e_ab))
+    ma = table.get_id((e_ma,))
+    assert table.parent(mab) == ma
+    assert table.parent(ma) == CallPathTable.ROOT
+    assert table.extend(ma, e_ab) == mab
+    assert table.get_id((e_ma, e_ab)) == mab
+    assert len(table) == 3
+
+    mb = table.get_id((e_mb,))
+    assert mb not in (ma, mab)
+    assert table.extend(CallPathTable.ROOT, e_mb) == mb
+    assert len(table) == 4
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import CFG, Callgraph
+from ara.util import has_path, is_recursive
+
+
+def main():
+    """Test the SCC based reachability index of the callgraph."""
+    init_test_logging()
+    callgraph = Callgraph(CFG())
+    # main -> a -> b -> a, main -> c -> c, c -> d
+    main_v, a, b, c, d = [callgraph.add_vertex() for _ in range(5)]
+    for src, tgt in [(main_v, a), (a, b), (b, a), (main_v, c), (c, c),
+                     (c, d)]:
+        callgraph.add_edge(src, tgt)
+
+    recursive = {main_v: False, a: True, b: True, c: True, d: False}
+    for v, rec in recursive.items():
+        assert callgraph.is_recursive(v) == rec
+        assert is_recursive(callgraph, v) == rec
+
+    assert callgraph.has_path(main_v, d)
+    assert callgraph.has_path(b, a)
+    assert has_path(callgraph, a, b)
+    assert not callgraph.has_path(a, c)
+    assert not has_path(callgraph, d, main_v)
+
+    # the index follows modifications
+    callgraph.add_edge(d, main_v)
+    assert callgraph.has_path(a, c)
+    assert callgraph.is_recursive(main_v)
+    assert list(callgraph.get_reachability().get_recursive()) == [True] * 5
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import CFG, ABBType, CFType, NodeLevel
+
+
+def add_vertex(cfg, name, level, ty=ABBType.computation, is_exit=False):
+    v = cfg.add_vertex()
+    cfg.vp.name[v] = name
+    cfg.vp.level[v] = level
+    cfg.vp.type[v] = ty
+    cfg.vp.is_exit[v] = is_exit
+    return v
+
+
+def add_edge(cfg, src, tgt, ty, is_entry=False):
+    e = cfg.add_edge(src, tgt)
+    cfg.ep.type[e] = ty
+    cfg.ep.is_entry[e] = is_entry
+    return e
+
+
+def query_all(cfg, funcs, abbs, bbs):
+    return ([cfg.get_function(x) for x in abbs + bbs],
+            [cfg.get_entry_abb(x) for x in funcs],
+            [cfg.get_exit_abb(x) for x in funcs],
+            [cfg.get_exit_bb(x) for x in abbs],
+            [cfg.get_abb(x) for x in bbs],
+            [cfg.get_syscall_name(x) for x in abbs])
+
+
+def main():
+    """Test, that the CFGTopology snapshot does not change any query."""
+    init_test_logging()
+    cfg = CFG()
+    main_f = add_vertex(cfg, "main", NodeLevel.function)
+    sys_f = add_vertex(cfg, "xTaskCreate", NodeLevel.function)
+    abb0 = add_vertex(cfg, "ABB0", NodeLevel.abb, ty=ABBType.syscall)
+    abb1 = add_vertex(cfg, "ABB1", NodeLevel.abb, is_exit=True)
+    abb2 = add_vertex(cfg, "ABB2", NodeLevel.abb, is_exit=True)
+    bb0 = add_vertex(cfg, "BB0", NodeLevel.bb, is_exit=True)
+    bb1 = add_vertex(cfg, "BB1", NodeLevel.bb, is_exit=True)
+    bb2 = add_vertex(cfg, "BB2", NodeLevel.bb, is_exit=True)
+
+    add_edge(cfg, main_f, abb0, CFType.f2a, is_entry=True)
+    add_edge(cfg, main_f, abb1, CFType.f2a)
+    add_edge(cfg, sys_f, abb2, CFType.f2a, is_entry=True)
+    add_edge(cfg, abb0, abb1, CFType.lcf)
+    add_edge(cfg, abb0, abb2, CFType.icf)
+    add_edge(cfg, abb0, bb0, CFType.a2b, is_entry=True)
+    a2b_1 = add_edge(cfg, abb1, bb1, CFType.a2b, is_entry=True)
+    add_edge(cfg, abb2, bb2, CFType.a2b, is_entry=True)
+
+    funcs = [main_f, sys_f]
+    abbs = [abb1, abb2]
+    bbs = [bb0, bb1, bb2]
+
+    expected = query_all(cfg, funcs, abbs, bbs)
+    topology = cfg.freeze_topology()
+    assert cfg.get_topology() is topology
+    assert query_all(cfg, funcs, abbs, bbs) == expected
+    assert cfg.get_syscall_name(abb0) == "xTaskCreate"
+    assert cfg.get_function(abb0) == main_f
+
+    # a modification drops the snapshot
+    add_vertex(cfg, "BB3", NodeLevel.bb)
+    assert cfg.get_topology() is None
+    cfg.freeze_topology()
+    cfg.invalidate_indexes()
+    assert cfg.get_topology() is None
+
+    # modifications that keep the number of vertices and edges
+    cfg.freeze_topology()
+    cfg.remove_edge(a2b_1)
+    add_edge(cfg, abb2, bb1, CFType.a2b)
+    assert cfg.get_topology() is None
+    cfg.freeze_topology()
+    assert cfg.get_abb(bb1) == abb2
+    cfg.vp.level[bb1] = NodeLevel.abb
+    cfg.bump_version()
+    assert cfg.get_topology() is None
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import CFG, CFType, NodeLevel
+
+
+def main():
+    """Test the precomputed condition flags of the CFG.
+
+    Function with an endless loop:
+     1o
+      |`--.
+      |   v
+     2o  3o <.
+          |  |
+          v  |
+         4o--´
+    """
+    init_test_logging()
+    cfg = CFG()
+    func = cfg.add_vertex()
+    cfg.vp.level[func] = NodeLevel.function
+    abbs = {}
+    for i in range(1, 5):
+        abb = cfg.add_vertex()
+        cfg.vp.level[abb] = NodeLevel.abb
+        e = cfg.add_edge(func, abb)
+        cfg.ep.type[e] = CFType.f2a
+        cfg.ep.is_entry[e] = i == 1
+        abbs[i] = abb
+    cfg.vp.is_exit[abbs[2]] = True
+    cfg.vp.is_exit_loop_head[abbs[3]] = True
+    for src, tgt in [(1, 2), (1, 3), (3, 4), (4, 3)]:
+        e = cfg.add_edge(abbs[src], abbs[tgt])
+        cfg.ep.type[e] = CFType.lcf
+
+    in_condition, usually_taken = cfg.get_condition_flags()
+    assert [bool(in_condition[abbs[i]]) for i in range(1, 5)] == \
+        [False, True, True, True]
+    assert [bool(usually_taken[abbs[i]]) for i in range(1, 5)] == \
+        [False, True, False, False]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.os.os_base import ContextMap
+
+
+class Ctx:
+    """Minimal mutable context."""
+    def __init__(self, value):
+        self.value = value
+
+    def __copy__(self):
+        return Ctx(self.value)
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+def main():
+    """Test for the copy-on-write contexts of OSState."""
+    init_test_logging()
+    parent = ContextMap({"a": Ctx(1), "b": Ctx(2)})
+    p_hash = hash(parent)
+
+    child = parent.copy()
+    # unchanged contexts are shared
+    assert child.peek("a") is parent.peek("a")
+    assert hash(child) == p_hash and child == parent
+
+    # write access clones only the accessed context
+    child["a"].value = 3
+    assert parent.peek("a").value == 1
+    assert child.peek("b") is parent.peek("b")
+    assert hash(parent) == p_hash
+
+    # the incremental hash matches a freshly built map
+    fresh = ContextMap({"a": Ctx(3), "b": Ctx(2)})
+    assert hash(child) == hash(fresh) and child == fresh
+
+    # owned contexts become shared again after a copy
+    grandchild = child.copy()
+    grandchild["a"].value = 4
+    assert child.peek("a").value == 3
+    del grandchild["b"]
+    assert "b" in child and "b" not in grandchild
+    assert hash(grandchild) == hash(ContextMap({"a": Ctx(4)}))
+
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,7 @@
 
 # Note: init_test must be imported first
 from init_test import init_test_logging
-from ara.steps.multisse_helper.equations import Equations
+from ara.steps.multisse_helper.equations import Equations, SolverStats
 from ara.steps.multisse_helper.common import FakeEdge, TimeRange
 
 import math
@@ -62,6 +62,37 @@ def main():
     assert eqs.solvable()
     print(eqs.get_interval_for(l))
     assert eqs.get_interval_for(l) == TimeRange(up=88, to=526)
+    assert eqs.get_intervals_for([l, c]) == [TimeRange(up=88, to=526),
+                                             TimeRange(up=7, to=7)]
+
+    # chain of equalities, solved without LP
+    eqs = Equations()
+    eqs.add_range(a, TimeRange(up=10, to=50))
+    eqs.add_range(b, TimeRange(up=20, to=math.inf))
+    eqs.add_range(c, TimeRange(up=0, to=40))
+    eqs.add_equality({a}, {b})
+    eqs.add_equality({b}, {c})
+    branch = eqs.copy()
+    assert eqs.solvable()
+    assert eqs.get_interval_for(a) == TimeRange(up=20, to=40)
+    branch.add_range(d, TimeRange(up=41, to=41))
+    branch.add_equality({c}, {d})
+    assert not branch.solvable()
+    assert eqs.get_interval_for(c) == TimeRange(up=20, to=40)
+
+    # acyclic system, decided by bound propagation without LP
+    SolverStats.reset()
+    eqs = Equations()
+    eqs.add_range(a, TimeRange(up=60, to=80))
+    eqs.add_range(b, TimeRange(up=10, to=20))
+    eqs.add_range(c, TimeRange(up=0, to=math.inf))
+    eqs.add_range(d, TimeRange(up=5, to=15))
+    eqs.add_range(e, TimeRange(up=0, to=math.inf))
+    eqs.add_equality({a}, {b, c})
+    eqs.add_equality({c}, {d, e})
+    assert eqs.solvable()
+    assert eqs.get_interval_for(e) == TimeRange(up=25, to=65)
+    assert SolverStats.lp == 0 and SolverStats.hit_rate() == 1.0
 
 
 if __name__ == '__main__':
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import Graph, CFType, NodeLevel
+
+
+def add_vertex(cfg, level):
+    v = cfg.add_vertex()
+    cfg.vp.level[v] = level
+    return v
+
+
+def add_edge(cfg, src, tgt, ty):
+    e = cfg.add_edge(src, tgt)
+    cfg.ep.type[e] = ty
+    return e
+
+
+def main():
+    """Test the versioned view cache of Graph."""
+    init_test_logging()
+    graph = Graph()
+    cfg = graph.cfg
+    func = add_vertex(cfg, NodeLevel.function)
+    abb0 = add_vertex(cfg, NodeLevel.abb)
+    abb1 = add_vertex(cfg, NodeLevel.abb)
+    add_vertex(cfg, NodeLevel.bb)
+    add_edge(cfg, func, abb0, CFType.f2a)
+    add_edge(cfg, abb0, abb1, CFType.lcf)
+    add_edge(cfg, abb0, abb1, CFType.icf)
+    add_edge(cfg, abb1, abb0, CFType.icf)
+
+    assert graph.functs.num_vertices() == 1
+    assert graph.abbs.num_vertices() == 2
+    assert graph.bbs.num_vertices() == 1
+    assert graph.icfg.num_vertices() == 2
+    assert graph.icfg.num_edges() == 2
+    assert graph.lcfg.num_edges() == 1
+
+    # views are cached as long as the CFG is unchanged
+    icfg = graph.icfg
+    assert graph.icfg is icfg
+    assert graph.abbs is graph.abbs
+
+    # new edges and vertices are detected
+    add_edge(cfg, abb1, abb1, CFType.icf)
+    assert graph.icfg is not icfg
+    assert graph.icfg.num_edges() == 3
+    add_vertex(cfg, NodeLevel.abb)
+    assert graph.abbs.num_vertices() == 3
+
+    # other modifications need a version bump
+    abbs = graph.abbs
+    cfg.vp.level[abb1] = NodeLevel.bb
+    assert graph.abbs is abbs
+    cfg.bump_version()
+    assert graph.abbs.num_vertices() == 2
+    abbs = graph.abbs
+    graph.invalidate_indexes()
+    assert graph.abbs is not abbs
+
+
+if __name__ == '__main__':
+    main()
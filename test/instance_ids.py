@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import InstanceGraph
+from ara.os.os_util import assign_id
+
+import os
+import random
+
+
+class Inst:
+    def __init__(self, maximal_id):
+        self.maximal_id = maximal_id
+
+    def get_maximal_id(self):
+        return self.maximal_id
+
+
+def reference_assign_id(instances, instance):
+    """The quadratic algorithm that assign_id must match."""
+    other_ids = [(instances.vp.id[x].split('.'), x)
+                 for x in instances.vertices() if x != instance]
+    target_id = instances.vp.obj[instance].get_maximal_id().split('.')
+    longest = 0
+    must_be_longer = None
+    for other_id, inst in other_ids:
+        prefix = os.path.commonprefix([target_id, other_id])
+        assert prefix != target_id
+        longest = max(longest, len(prefix))
+        if len(prefix) == len(other_id):
+            assert must_be_longer is None
+            must_be_longer = inst
+    if must_be_longer is not None:
+        other_id = instances.vp.obj[must_be_longer].get_maximal_id().split('.')
+        longest = len(os.path.commonprefix([target_id, other_id]))
+        instances.vp.id[must_be_longer] = '.'.join(other_id[:longest + 1])
+    instances.vp.id[instance] = '.'.join(target_id[:longest + 1])
+
+
+def random_ids(rand, amount):
+    """Return prefix free maximal IDs."""
+    ids = []
+    while len(ids) < amount:
+        new = [str(rand.randrange(3)) for _ in range(rand.randrange(2, 7))]
+        if any(os.path.commonprefix([new, x]) in (new, x) for x in ids):
+            continue
+        ids.append(new)
+    return ['.'.join(x) for x in ids]
+
+
+def get_ids(instances):
+    return [instances.vp.id[v] for v in instances.vertices()]
+
+
+def add_instance(instances, maximal_id):
+    v = instances.add_vertex()
+    instances.vp.obj[v] = Inst(maximal_id)
+    return v
+
+
+def main():
+    """Test that assign_id with the ID trie matches the original algorithm."""
+    init_test_logging()
+    rand = random.Random(42)
+    for _ in range(20):
+        reference = InstanceGraph()
+        instances = InstanceGraph()
+        for maximal_id in random_ids(rand, 40):
+            reference_assign_id(reference, add_instance(reference, maximal_id))
+            assign_id(instances, add_instance(instances, maximal_id))
+            assert get_ids(reference) == get_ids(instances)
+
+    # all vertices exist before their IDs are assigned
+    maximal_ids = random_ids(rand, 40)
+    reference = InstanceGraph()
+    instances = InstanceGraph()
+    for maximal_id in maximal_ids:
+        add_instance(reference, maximal_id)
+        add_instance(instances, maximal_id)
+    for ref_v, v in zip(reference.vertices(), instances.vertices()):
+        reference_assign_id(reference, ref_v)
+        assign_id(instances, v)
+        assert get_ids(reference) == get_ids(instances)
+
+    # the example of the assign_id documentation
+    instances = InstanceGraph()
+    for maximal_id in ["1.2.3.4", "2.1.1", "1.3.1.2.1", "1.3.1.1.1"]:
+        assign_id(instances, add_instance(instances, maximal_id))
+    assert get_ids(instances) == ["1.2", "2", "1.3.1.2", "1.3.1.1"]
+
+    # reassignments and IDs that are changed outside of assign_id
+    instances.vp.id[instances.vertex(1)] = "2.1"
+    assign_id(instances, instances.vertex(0))
+    assert get_ids(instances) == ["1.2", "2.1", "1.3.1.2", "1.3.1.1"]
+    assign_id(instances, add_instance(instances, "2.1.2"))
+    assert get_ids(instances) == ["1.2", "2.1.1", "1.3.1.2", "1.3.1.1",
+                                  "2.1.2"]
+
+
+if __name__ == '__main__':
+    main()
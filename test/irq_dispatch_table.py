@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import InstanceGraph
+from ara.os.autosar import (AUTOSAR, Alarm, Event, ISR, InstanceEdge, Task,
+                            TaskGroup)
+
+
+def add_instance(instances, obj):
+    v = instances.add_vertex()
+    instances.vp.obj[v] = obj
+    instances.vp.label[v] = obj.name
+    return v
+
+
+def add_edge(instances, src, tgt, ty):
+    e = instances.add_edge(src, tgt)
+    instances.ep.type[e] = ty
+
+
+def task(name):
+    return Task(name=name, cpu_id=0, cfg=None, artificial=False,
+                function=None, priority=1, activation=1, autostart=False,
+                schedule=True, accessing_application=[])
+
+
+def main():
+    """Test the static IRQ dispatch table of AUTOSAR."""
+    init_test_logging()
+    instances = InstanceGraph()
+    group = add_instance(instances, TaskGroup(name="group", cpu_id=0,
+                                              promises={}))
+    t1 = add_instance(instances, task("t1"))
+    t2 = add_instance(instances, task("t2"))
+    event = add_instance(instances, Event(name="event", cpu_id=0, index=0))
+    a1 = add_instance(instances, Alarm(name="a1", cpu_id=0))
+    a2 = add_instance(instances, Alarm(name="a2", cpu_id=0))
+    isr = add_instance(instances, ISR(name="isr", cpu_id=1, cfg=None,
+                                      artificial=False, function=None,
+                                      priority=2, category=2))
+    add_edge(instances, group, t1, InstanceEdge.have)
+    add_edge(instances, group, t2, InstanceEdge.have)
+    add_edge(instances, t2, event, InstanceEdge.have)
+    add_edge(instances, a1, t1, InstanceEdge.activate)
+    add_edge(instances, a2, event, InstanceEdge.activate)
+
+    table = AUTOSAR.get_irq_dispatch_table(instances)
+    assert set(table.irqs) == {int(a1), int(a2), int(isr)}
+    assert table.irqs[int(isr)].cpu_id == 1
+    assert table.alarm_targets[int(a1)] == [(int(t1), instances.vp.obj[t1])]
+    assert table.alarm_targets[int(a2)] == [(int(event),
+                                             instances.vp.obj[event])]
+    assert table.event_tasks[int(event)] == [instances.vp.obj[t2]]
+    assert table.task_groups[int(t1)] == [int(group)]
+    assert table.group_members[int(group)] == {int(t1), int(t2)}
+
+    # the table is cached until the instance graph changes
+    assert AUTOSAR.get_irq_dispatch_table(instances) is table
+    a3 = add_instance(instances, Alarm(name="a3", cpu_id=0))
+    add_edge(instances, a3, t2, InstanceEdge.activate)
+    new_table = AUTOSAR.get_irq_dispatch_table(instances)
+    assert new_table is not table
+    assert new_table.alarm_targets[int(a3)] == [(int(t2),
+                                                 instances.vp.obj[t2])]
+
+
+if __name__ == '__main__':
+    main()
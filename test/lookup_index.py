@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import CFG, Callgraph, InstanceGraph, NodeLevel
+
+
+class Instance:
+    """Instance, that is equal to every other instance with the same name."""
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, other):
+        return self.name == other.name
+
+
+def main():
+    """Test the lookup indexes of CFG, Callgraph and InstanceGraph."""
+    init_test_logging()
+
+    cfg = CFG()
+    funcs = []
+    for name in ["main", "foo", "bar"]:
+        v = cfg.add_vertex()
+        cfg.vp.name[v] = name
+        cfg.vp.level[v] = NodeLevel.function
+        funcs.append(v)
+    assert cfg.get_function_by_name("foo") == funcs[1]
+    assert not cfg.contains_function_by_name("baz")
+    # added vertices are found without invalidation
+    baz = cfg.add_vertex()
+    cfg.vp.name[baz] = "baz"
+    cfg.vp.level[baz] = NodeLevel.function
+    assert cfg.contains_function_by_name("baz")
+    # stale hits are detected without invalidation
+    cfg.vp.name[baz] = "qux"
+    assert not cfg.contains_function_by_name("baz")
+    # renamed vertices are found without invalidation, too
+    assert cfg.contains_function_by_name("qux")
+    # get_function_by_name does not depend on the invalidation
+    cfg.vp.name[baz] = "quux"
+    assert cfg.get_function_by_name("quux") == baz
+
+    callgraph = Callgraph(cfg)
+    cg_main = callgraph.add_vertex()
+    callgraph.vp.function_name[cg_main] = "main"
+    cg_foo = callgraph.add_vertex()
+    callgraph.vp.function_name[cg_foo] = "foo"
+    edge = callgraph.add_edge(cg_main, cg_foo)
+    callgraph.ep.callsite[edge] = 42
+    callgraph.ep.callsite_name[edge] = "ABB42"
+    assert callgraph.get_node_with_name("foo") == cg_foo
+    assert callgraph.get_node_with_name("bar") is None
+    assert callgraph.get_edge_for_callsite(42) == edge
+    assert callgraph.get_edge_for_callsite(7) is None
+    assert callgraph.get_edge_for_callsite_name("ABB42") == edge
+    edge2 = callgraph.add_edge(cg_foo, cg_main)
+    callgraph.ep.callsite[edge2] = 2
+    assert callgraph.get_edge_for_callsite(cfg.vertex(2)) == edge2
+    # a changed callsite of an existing edge is detected after invalidation
+    callgraph.ep.callsite[edge2] = 3
+    assert callgraph.get_edge_for_callsite(2) is None
+    callgraph.invalidate_indexes()
+    assert callgraph.get_edge_for_callsite(3) == edge2
+    callgraph.remove_edge(edge)
+    assert callgraph.get_edge_for_callsite(42) is None
+
+    instances = InstanceGraph()
+    objs = []
+    for name in ["a", "b"]:
+        v = instances.add_vertex()
+        obj = Instance(name)
+        instances.vp.obj[v] = obj
+        objs.append((v, obj))
+    for v, obj in objs:
+        assert instances.get_node_by_obj(obj) == v
+        assert instances.get_node(obj) == v
+    # only equal objects are found with get_node
+    assert instances.get_node_by_obj(Instance("a")) is None
+    assert instances.get_node(Instance("a")) == objs[0][0]
+    # replaced objects
+    new_b = Instance("c")
+    instances.vp.obj[objs[1][0]] = new_b
+    assert instances.get_node_by_obj(new_b) is None
+    assert instances.get_node(new_b) == objs[1][0]
+    instances.invalidate_indexes()
+    assert instances.get_node_by_obj(new_b) == objs[1][0]
+    assert instances.get_node_by_obj(objs[1][1]) is None
+
+
+if __name__ == '__main__':
+    main()
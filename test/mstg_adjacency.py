@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import MSTGraph, MSTType, StateType
+
+import graph_tool
+
+
+def add_vertex(mstg, ty):
+    v = mstg.add_vertex()
+    mstg.vp.type[v] = ty
+    return v
+
+
+def add_edge(mstg, src, tgt, ty, cpu_id=0):
+    e = mstg.add_edge(src, tgt)
+    mstg.ep.type[e] = ty
+    mstg.ep.cpu_id[e] = cpu_id
+    return e
+
+
+def main():
+    """Test the typed adjacency index of the MSTG."""
+    init_test_logging()
+    mstg = MSTGraph()
+    metastate = add_vertex(mstg, StateType.metastate)
+    state0 = add_vertex(mstg, StateType.state)
+    state1 = add_vertex(mstg, StateType.state)
+    entry = add_vertex(mstg, StateType.entry_sync)
+    exit_sp = add_vertex(mstg, StateType.exit_sync)
+
+    add_edge(mstg, metastate, state0, MSTType.m2s)
+    add_edge(mstg, metastate, state1, MSTType.m2s)
+    s2s = add_edge(mstg, state0, state1, MSTType.s2s)
+    add_edge(mstg, state0, entry, MSTType.st2sy, cpu_id=0)
+    add_edge(mstg, entry, exit_sp, MSTType.en2ex)
+    add_edge(mstg, exit_sp, state1, MSTType.st2sy, cpu_id=1)
+
+    assert mstg.get_out_neighbors(metastate, MSTType.m2s) == [state0, state1]
+    assert mstg.get_out_neighbors(state0, MSTType.s2s) == [state1]
+    assert set(mstg.get_out_neighbors(state0, MSTType.s2s, MSTType.st2sy)) \
+        == {state1, entry}
+    assert mstg.get_in_neighbors(state1, MSTType.m2s) == [metastate]
+    assert mstg.get_out_edges(state1, MSTType.s2s) == []
+    assert mstg.get_metastate(state1) == metastate
+    assert mstg.get_entry_sp(exit_sp) == entry
+    assert mstg.get_exit_state(entry, 0) == state0
+    assert mstg.get_entry_state(exit_sp, 1) == state1
+
+    # the index must match the GraphView based queries
+    for v in mstg.vertices():
+        for ty in MSTType:
+            view = mstg.edge_type(ty)
+            assert set(mstg.get_out_neighbors(v, ty)) == \
+                set(view.vertex(v).out_neighbors())
+            assert set(mstg.get_in_neighbors(v, ty)) == \
+                set(view.vertex(v).in_neighbors())
+
+    # types are evaluated with every lookup
+    mstg.ep.type[s2s] = MSTType.follow_sync
+    assert mstg.get_out_neighbors(state0, MSTType.s2s) == []
+    assert mstg.get_out_neighbors(state0, MSTType.follow_sync) == [state1]
+
+    # edges that are added via a GraphView are indexed, too
+    view = graph_tool.GraphView(mstg)
+    e = view.add_edge(state1, state0)
+    mstg.ep.type[e] = MSTType.s2s
+    assert mstg.get_out_neighbors(state1, MSTType.s2s) == [state0]
+    assert mstg.get_in_neighbors(state0, MSTType.s2s) == [state1]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Benchmark for the typed neighbor lookups in the MSTG.
+
+Takes the same arguments as multisse.py and compares the adjacency index of
+the MSTG with the equivalent lookups via GraphViews for all SPs.
+"""
+
+# Note: init_test must be imported first
+from init_test import init_test
+
+import time
+
+from ara.graph import MSTType
+
+
+def _time(func, sps):
+    start = time.perf_counter()
+    for sp in sps:
+        func(sp)
+    return time.perf_counter() - start
+
+
+def _edge_set(edges):
+    return {(int(e.source()), int(e.target())) for e in edges}
+
+
+def _view_lookup(mstg, sp):
+    st2sy = mstg.edge_type(MSTType.st2sy)
+    en2ex = mstg.edge_type(MSTType.en2ex)
+    return (list(st2sy.vertex(sp).in_edges()),
+            list(st2sy.vertex(sp).out_edges()),
+            list(en2ex.vertex(sp).out_neighbors()))
+
+
+def _index_lookup(mstg, sp):
+    return (mstg.get_in_edges(sp, MSTType.st2sy),
+            mstg.get_out_edges(sp, MSTType.st2sy),
+            mstg.get_out_neighbors(sp, MSTType.en2ex))
+
+
+def main():
+    """Report the time of the MSTG neighbor lookups."""
+    data = init_test(extra_config={"steps": ["MultiSSE"]},
+                     extra_input={"oilfile": lambda argv: argv[3]},
+                     os_name="AUTOSAR")
+
+    mstg = data.graph.mstg
+    sps = list(mstg.get_sync_points().vertices())
+    if not sps:
+        data.log.warning("The MSTG contains no SPs.")
+        return
+
+    for sp in sps:
+        view_in, view_out, view_exit = _view_lookup(mstg, sp)
+        index_in, index_out, index_exit = _index_lookup(mstg, sp)
+        assert _edge_set(view_in) == _edge_set(index_in)
+        assert _edge_set(view_out) == _edge_set(index_out)
+        assert set(map(int, view_exit)) == set(map(int, index_exit))
+
+    view_time = _time(lambda sp: _view_lookup(mstg, sp), sps)
+    index_time = _time(lambda sp: _index_lookup(mstg, sp), sps)
+    print(f"{len(sps)} SPs, GraphView lookups: {view_time:.4f}s, "
+          f"index lookups: {index_time:.4f}s")
+
+
+if __name__ == '__main__':
+    main()
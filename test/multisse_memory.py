@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Memory benchmark for the OS states that are stored in the MSTG.
+
+Takes the same arguments as multisse.py and reports the memory that the
+states need (in bytes per state). Objects that are shared between states
+(e.g. unmodified contexts) are counted once only.
+"""
+
+# Note: init_test must be imported first
+from init_test import init_test
+
+import sys
+import types
+
+import graph_tool
+
+from ara.graph import CFG, StateType
+
+# never count the graphs and code objects that states only refer to
+_SKIPPED = (type, types.ModuleType, types.FunctionType, types.MethodType,
+            graph_tool.Graph, graph_tool.GraphView, CFG)
+
+
+def _get_size(obj, seen):
+    """Return the size of obj and all (not yet seen) referenced objects."""
+    if id(obj) in seen or isinstance(obj, _SKIPPED):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _get_size(key, seen) + _get_size(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _get_size(item, seen)
+    else:
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(obj, name):
+                    size += _get_size(getattr(obj, name), seen)
+        if hasattr(obj, "__dict__"):
+            size += _get_size(obj.__dict__, seen)
+    return size
+
+
+def main():
+    """Report the memory usage of the MultiSSE states."""
+    data = init_test(extra_config={"steps": ["MultiSSE"]},
+                     extra_input={"oilfile": lambda argv: argv[3]},
+                     os_name="AUTOSAR")
+
+    mstg = data.graph.mstg
+    states = [mstg.vp.state[v]
+              for v in mstg.vertex_type(StateType.state).vertices()]
+    if not states:
+        data.log.warning("The MSTG contains no states.")
+        return
+
+    seen = set()
+    total = sum(_get_size(state, seen) for state in states)
+    with_dict = sum(1 for state in states if hasattr(state, "__dict__"))
+    print(f"{len(states)} states, {total} bytes, "
+          f"{total / len(states):.1f} bytes per state, "
+          f"{with_dict} states with __dict__")
+
+
+if __name__ == '__main__':
+    main()
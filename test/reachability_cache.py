@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import MSTGraph, MSTType, StateType
+from ara.steps.multisse_helper.common import (CrossExecState,
+                                              ReachabilityCache,
+                                              find_cross_syscalls)
+
+
+def add_vertex(mstg, ty):
+    v = mstg.add_vertex()
+    mstg.vp.type[v] = ty
+    return v
+
+
+def add_edge(mstg, src, tgt, ty):
+    e = mstg.add_edge(src, tgt)
+    mstg.ep.type[e] = ty
+    return e
+
+
+def main():
+    """Test the reachability cache of the MultiSSE."""
+    init_test_logging()
+    mstg = MSTGraph()
+    type_map = mstg.new_vp("int")
+    metastate = add_vertex(mstg, StateType.metastate)
+    states = [add_vertex(mstg, StateType.state) for _ in range(4)]
+    for state in states:
+        add_edge(mstg, metastate, state, MSTType.m2s)
+    add_edge(mstg, states[0], states[1], MSTType.s2s)
+    add_edge(mstg, states[2], states[3], MSTType.s2s)
+    type_map[states[1]] = CrossExecState.cross_syscall
+    type_map[states[3]] = CrossExecState.cross_syscall
+
+    cache = ReachabilityCache()
+    assert find_cross_syscalls(mstg, type_map, metastate, states[0],
+                               cache=cache) == [states[1]]
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # type changes are respected without invalidation
+    type_map[states[0]] = CrossExecState.cross_syscall
+    assert find_cross_syscalls(mstg, type_map, metastate, states[0],
+                               cache=cache) == [states[0], states[1]]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # new edges need an invalidation
+    add_edge(mstg, states[1], states[2], MSTType.s2s)
+    cache.invalidate(metastate)
+    assert find_cross_syscalls(mstg, type_map, metastate, states[0],
+                               cache=cache) == [states[0], states[1],
+                                                states[3]]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # the result equals the one without cache
+    assert find_cross_syscalls(mstg, type_map, metastate, states[2]) == \
+        find_cross_syscalls(mstg, type_map, metastate, states[2], cache=cache)
+
+
+if __name__ == '__main__':
+    main()
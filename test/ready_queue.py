@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.graph import InstanceGraph
+from ara.os.os_base import ContextMap
+from ara.os.os_util import get_ready_queue
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Inst:
+    name: str
+    cpu_id: int
+
+
+class Ctx:
+    """Minimal context with a readiness and priority."""
+    def __init__(self, ready, prio):
+        self.ready = ready
+        self.prio = prio
+
+    def __copy__(self):
+        return Ctx(self.ready, self.prio)
+
+    def __eq__(self, other):
+        return (self.ready, self.prio) == (other.ready, other.prio)
+
+    def __hash__(self):
+        return hash((self.ready, self.prio))
+
+
+class State:
+    """The parts of an OSState that get_ready_queue needs."""
+    def __init__(self, instances, context):
+        self.instances = instances
+        self.context = context
+
+
+def highest(state, cpu_id):
+    queue = get_ready_queue(state, lambda ctx: ctx.ready,
+                            lambda ctx: ctx.prio)
+    v = queue.get_highest(cpu_id)
+    return None if v is None else state.instances.vp.obj[v].name
+
+
+def main():
+    """Test the copy-on-write ready queue of OS states."""
+    init_test_logging()
+    instances = InstanceGraph()
+    insts = {}
+    for name, cpu_id, is_control in [("a", 0, True), ("b", 0, True),
+                                     ("c", 1, True), ("lock", 0, False)]:
+        v = instances.add_vertex()
+        insts[name] = Inst(name=name, cpu_id=cpu_id)
+        instances.vp.obj[v] = insts[name]
+        instances.vp.is_control[v] = is_control
+    a, b, c, lock = (insts[x] for x in ["a", "b", "c", "lock"])
+
+    parent = State(instances, ContextMap({a: Ctx(True, 1), b: Ctx(True, 1),
+                                          c: Ctx(False, 5),
+                                          lock: Ctx(True, 9)}))
+    # equal priorities are resolved by the instance vertex
+    assert highest(parent, 0) == "a"
+    assert highest(parent, 1) is None
+
+    child = State(instances, parent.context.copy())
+    child.context[b].prio = 2
+    child.context[c].ready = True
+    assert highest(child, 0) == "b"
+    assert highest(child, 1) == "c"
+    # the parent queue is unaffected
+    assert highest(parent, 0) == "a"
+    assert highest(parent, 1) is None
+
+    # modifications before a copy are visible in the copy
+    child.context[b].ready = False
+    grandchild = State(instances, child.context.copy())
+    assert highest(grandchild, 0) == "a"
+    assert highest(child, 0) == "a"
+
+    # replaced contexts are respected, too
+    grandchild.context[a] = Ctx(False, 1)
+    assert highest(grandchild, 0) is None
+    assert highest(child, 0) == "a"
+
+    # control instances that are created afterwards are respected
+    v = instances.add_vertex()
+    d = Inst(name="d", cpu_id=0)
+    instances.vp.obj[v] = d
+    instances.vp.is_control[v] = True
+    grandchild.context[d] = Ctx(True, 3)
+    assert highest(grandchild, 0) == "d"
+    assert highest(child, 0) == "a"
+
+
+if __name__ == '__main__':
+    main()
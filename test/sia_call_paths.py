@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import sys
+
+# Note: init_test must be imported first
+from init_test import (fail_if, fail_if_json_not_equal, get_config,
+                       init_test)
+from ara.graph import Graph
+from ara.os import get_os
+from ara.stepmanager import StepManager
+
+
+def dump_instances(instances):
+    """Return a comparable representation of an instance graph."""
+    dump = []
+    for instance in instances.vertices():
+        i_dump = {}
+        for name, prop in instances.vp.items():
+            if name in ('llvm_soc', 'soc'):
+                # pointers
+                continue
+            if prop.value_type() == 'python::object':
+                continue
+            i_dump[name] = prop[instance]
+        dump.append(i_dump)
+    for edge in instances.edges():
+        i_dump = {"source": instances.vp.id[edge.source()],
+                  "target": instances.vp.id[edge.target()]}
+        for name, prop in instances.ep.items():
+            if name == 'syscall':
+                continue
+            i_dump[name] = prop[edge]
+        dump.append(i_dump)
+    return sorted(dump, key=lambda x: (x.get('id', ''), str(x)))
+
+
+def main():
+    """Test that SIA (or the step given as third argument) finds the same
+    instance graph with summarized call paths."""
+    step = sys.argv[3] if len(sys.argv) > 3 else "SIA"
+    data = init_test(extra_config={"steps": [step]})
+    expected = dump_instances(data.graph.instances)
+
+    graph = Graph()
+    graph.os = get_os("FreeRTOS")
+    StepManager(graph).execute(get_config(sys.argv[2]),
+                               {"steps": [step],
+                                step: {"call_paths": "summarize"}},
+                               None)
+
+    if step == "InteractionAnalysis":
+        quantities = graph.instances.ep.quantity.a
+        fail_if(len(quantities) == 0 or quantities.max() < 2,
+                "Expected an interaction with several call paths.")
+
+    fail_if_json_not_equal(expected, dump_instances(graph.instances))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.steps.state_table import StateTable
+
+
+class CollidingState:
+    """Fake state that always has the same hash."""
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __hash__(self):
+        return 42
+
+
+def main():
+    """Test for the exact state interning."""
+    init_test_logging()
+    table = StateTable()
+
+    a = CollidingState(1)
+    b = CollidingState(2)
+    a2 = CollidingState(1)
+
+    assert table.add(a, "a") == (True, 0)
+    assert table.add(b, "b") == (True, 1)
+    assert table.collisions == 1
+    # structural equal state must be merged
+    assert table.add(a2, "a2") == (False, 0)
+    assert table[a2] == "a"
+    assert table[b] == "b"
+    assert len(table) == 2
+    assert CollidingState(3) not in table
+    assert table.get_value(CollidingState(3)) is None
+    assert table.get_state(1) is b
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.step_profiler import StepProfiler
+
+import json
+import os
+import pstats
+import tempfile
+
+
+class FakeGraph:
+    """Graph with a size, that can grow."""
+    def __init__(self):
+        self.vertices = 0
+
+    def num_vertices(self):
+        return self.vertices
+
+    def num_edges(self):
+        return 2 * self.vertices
+
+
+class FakeSystemGraph:
+    def __init__(self):
+        self.cfg = FakeGraph()
+        self.callgraph = FakeGraph()
+        self.instances = FakeGraph()
+
+
+def main():
+    """Test the step profiler."""
+    init_test_logging()
+    graph = FakeSystemGraph()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pstats_file = os.path.join(tmp_dir, "dumps", "Step.pstats")
+        profiler = StepProfiler(graph, cprofile_file=pstats_file)
+        profiler.start()
+        keep = [[i] for i in range(10000)]
+        graph.cfg.vertices = 3
+        data = profiler.stop()
+
+        assert data["cpu_time"] >= 0
+        assert data["max_rss_delta"] >= 0
+        assert data["allocations"] >= len(keep)
+        assert data["graphs_before"]["cfg"] == {"vertices": 0, "edges": 0}
+        assert data["graphs_after"]["cfg"] == {"vertices": 3, "edges": 6}
+        # sstg and mstg do not exist
+        assert set(data["graphs_after"]) == {"cfg", "callgraph", "instances"}
+        assert data["pstats"] == pstats_file
+        pstats.Stats(pstats_file)
+        # must fit into the JSON runtime statistics
+        json.dumps(data)
+
+
+if __name__ == '__main__':
+    main()
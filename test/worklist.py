@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Note: init_test must be imported first
+from init_test import init_test_logging
+from ara.steps.worklist import create_worklist
+
+from types import SimpleNamespace
+
+
+def fake_state(depth, abb):
+    cpu = SimpleNamespace(call_path=[0] * depth, abb=abb)
+    return SimpleNamespace(cpus=[cpu], name=(depth, abb))
+
+
+def drain(worklist):
+    out = []
+    while worklist:
+        out.append(worklist.pop())
+    return out
+
+
+def main():
+    """Test the exploration strategies."""
+    init_test_logging()
+    states = [fake_state(1, 5), fake_state(3, 2), fake_state(2, 7)]
+
+    bfs = create_worklist("bfs")
+    bfs.extend(states)
+    assert drain(bfs) == states
+
+    dfs = create_worklist("dfs")
+    dfs.extend(states)
+    assert drain(dfs) == states[::-1]
+
+    depth = create_worklist("call_depth")
+    depth.extend(states)
+    assert [x.name for x in drain(depth)] == [(3, 2), (2, 7), (1, 5)]
+
+    abb = create_worklist("abb", get_state=lambda x: x[1])
+    abb.extend([(i, s) for i, s in enumerate(states)])
+    assert [i for i, _ in drain(abb)] == [1, 0, 2]
+
+    try:
+        create_worklist("foo")
+        assert False, "Unknown strategy must fail."
+    except ValueError:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2023 Gerion Entrup <entrup@sra.uni-hannover.de>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Micro-benchmark for the packing of syscall arguments.
+
+Compares the former way (build a new dataclass on every interpretation) with
+the precompiled argument records of the syscall decorator for the hot
+FreeRTOS syscall xQueueGenericSend (the target of xQueueSend).
+
+Run it with the same PYTHONPATH as ARA, e.g. within the build directory:
+    PYTHONPATH=... python3 tools/bench_syscall_args.py
+"""
+
+import argparse
+import dataclasses
+import timeit
+
+from ara.os.freertos import FreeRTOS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--number', type=int, default=100000,
+                        help='number of packed argument records')
+    args = parser.parse_args()
+
+    syscall = FreeRTOS.xQueueGenericSend
+    signature = syscall._signature
+    values = [None] * len(signature)
+
+    def before():
+        fields = [(arg.name, arg.ty) for arg in signature]
+        Arguments = dataclasses.make_dataclass('Arguments', fields)
+        return Arguments(*values)
+
+    def after():
+        return syscall.make_arguments(values)
+
+    assert [getattr(before(), x.name) for x in signature] == \
+        [getattr(after(), x.name) for x in signature]
+
+    for name, func in [("make_dataclass", before), ("precompiled", after)]:
+        number = args.number if name == "precompiled" else args.number // 100
+        duration = timeit.timeit(func, number=number)
+        print(f"{name:>15}: {duration / number * 1e6:10.3f} us per call")
+
+
+if __name__ == '__main__':
+    main()
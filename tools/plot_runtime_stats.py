@@ -27,6 +27,14 @@ PlotStep = namedtuple("PlotStep", ["base_color", "invocations", "max_time", "lab
 Invocation = namedtuple("Invocation", ["time"])
 PlotData = namedtuple("PlotData", ["steps", "bar_labels", "y_pos"])
 
+# metric -> axis label
+METRICS = {
+    "runtime": "Execution time",
+    "cpu_time": "CPU time",
+    "max_rss_delta": "Peak RSS increase (KiB)",
+    "allocations": "Allocated Python memory blocks",
+}
+
 
 def p_print(obj):
     import pprint
@@ -113,6 +121,9 @@ def main():
     parser = argparse.ArgumentParser(description=sys.modules[__name__].__doc__)
     parser.add_argument('STAT_FILE', nargs='+',
                         help='statistic files, that are plotted')
+    parser.add_argument('--metric', default='runtime', choices=METRICS,
+                        help='plotted metric. Everything except runtime needs'
+                        ' statistics recorded with --step-profile')
     args = parser.parse_args()
 
     ex_counter = 0
@@ -129,7 +140,11 @@ def main():
 
         with open(stat_file) as f:
             ex_stat = json.load(f)
-            for step_name, s_uuid, runtime in ex_stat:
+            for step_name, s_uuid, runtime, *profile in ex_stat:
+                if args.metric != 'runtime':
+                    if not profile:
+                        parser.error(f'{stat_file} contains no profile data.')
+                    runtime = profile[0][args.metric]
                 steps.append(Step(name=step_name, uuid=s_uuid, runtime=runtime))
         stats.append(Execution(name=ex_name, steps=steps))
 
@@ -156,7 +171,7 @@ def main():
     ax.set_yticks(plot_data.y_pos)
     ax.set_yticklabels(plot_data.bar_labels)
     ax.invert_yaxis()  # labels read top-to-bottom
-    ax.set_xlabel('Execution time')
+    ax.set_xlabel(METRICS[args.metric])
     ax.set_title('Step execution times')
 
     plt.show()